@@ -0,0 +1,104 @@
+"""Rendering benchmark on the in-memory curses screen (no TTY needed).
+
+Drives `ui_renderer.draw` through the game's frame scheduler for a number
+of turns at several terminal sizes and map scales, and reports frames per
+second plus curses calls, bytes written and terminal cells changed per
+frame (see `jedi_fugitive.ui.virtual_screen`).
+
+Run with: PYTHONPATH=src python3 scripts/benchmark_render.py
+          PYTHONPATH=src python3 scripts/benchmark_render.py --sizes 80x24 --scales 1 --json
+Use --min-fps / --max-calls to make the run fail (exit 1) on a regression in CI.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+proj_root = Path(__file__).resolve().parents[1]
+src = proj_root / "src"
+if str(src) not in sys.path:
+    sys.path.insert(0, str(src))
+
+from jedi_fugitive.game.game_manager import GameManager
+from jedi_fugitive.ui.virtual_screen import VirtualScreen
+
+MOVES = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+def bench(h, w, scale, frames, seed):
+    screen = VirtualScreen(h, w)
+    with screen.patch_curses(), contextlib.redirect_stdout(io.StringIO()):
+        gm = GameManager(screen)
+        gm.world_seed = seed
+        gm.initialize()
+        gm.outer_map_scale = scale
+        t0 = time.perf_counter()
+        gm.generate_world()
+        gen_s = time.perf_counter() - t0
+        gm.draw()                      # first frame paints everything; not measured
+        rng = random.Random(seed)
+        stats = screen.stats
+        stats.reset()
+        draw_s = 0.0
+        for _ in range(frames):
+            dx, dy = rng.choice(MOVES)
+            gm._try_move_player(dx, dy)
+            gm.process_enemies()
+            gm.compute_visibility()
+            gm.frame_scheduler.mark('map', 'stats')
+            t0 = time.perf_counter()
+            gm.draw()
+            draw_s += time.perf_counter() - t0
+    n = max(1, frames)
+    return {
+        "size": f"{w}x{h}",
+        "scale": scale,
+        "map": f"{len(gm.game_map[0])}x{len(gm.game_map)}",
+        "gen_s": round(gen_s, 3),
+        "fps": round(n / draw_s, 1) if draw_s else None,
+        "ms_per_frame": round(1000 * draw_s / n, 3),
+        "calls_per_frame": round(stats.total_calls / n, 1),
+        "addstr_per_frame": round(stats.calls["addstr"] / n, 1),
+        "bytes_per_frame": round(stats.bytes_written / n, 1),
+        "cells_per_frame": round(stats.cells_flushed / n, 1),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="80x24,120x40,200x60", help="terminal sizes as WxH, comma separated")
+    ap.add_argument("--scales", default="1,2,4", help="outer map scales, comma separated")
+    ap.add_argument("--frames", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", action="store_true", help="print one JSON object per run")
+    ap.add_argument("--min-fps", type=float, default=None)
+    ap.add_argument("--max-calls", type=float, default=None, help="max curses calls per frame")
+    args = ap.parse_args(argv)
+
+    failed = False
+    if not args.json:
+        print(f"{'size':>8} {'scale':>5} {'map':>9} {'gen s':>6} {'fps':>7} {'ms/frm':>7} "
+              f"{'calls':>7} {'addstr':>7} {'bytes':>8} {'cells':>7}")
+    for size in args.sizes.split(","):
+        w, h = (int(v) for v in size.lower().split("x"))
+        for scale in (int(s) for s in args.scales.split(",")):
+            r = bench(h, w, scale, args.frames, args.seed)
+            if args.json:
+                print(json.dumps(r))
+            else:
+                print(f"{r['size']:>8} {r['scale']:>5} {r['map']:>9} {r['gen_s']:>6} {r['fps']:>7} "
+                      f"{r['ms_per_frame']:>7} {r['calls_per_frame']:>7} {r['addstr_per_frame']:>7} "
+                      f"{r['bytes_per_frame']:>8} {r['cells_per_frame']:>7}")
+            if args.min_fps is not None and (r["fps"] or 0) < args.min_fps:
+                failed = True
+            if args.max_calls is not None and r["calls_per_frame"] > args.max_calls:
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -103,9 +103,9 @@ def run_demo(turns: int = 8):
             traceback.print_exc()
         # print recent messages if any
         try:
-            msgs = getattr(gm.ui.messages, 'messages', [])
+            msgs = gm.ui.messages.recent(3)
             if msgs:
-                print("MSG:", msgs[-3:])
+                print("MSG:", msgs)
         except Exception:
             pass
         # print enemy positions and HP
@@ -120,7 +120,7 @@ def main(turns=200):
             if t % 10 == 0 or t <= 5:
                 msgs = []
                 try:
-                    msgs = getattr(gm.ui, 'messages', None).messages[-6:]
+                    msgs = getattr(gm.ui, 'messages', None).recent(6)
                 except Exception:
                     pass
                 boss = find_boss()
@@ -144,7 +144,7 @@ def main(turns=200):
             print("Boss hp:", getattr(boss, 'hp', None), "force:", getattr(boss, 'force_points', None), "stress:", getattr(boss, 'stress', None))
         print("Player hp:", getattr(gm.player, 'hp', None), "stress:", getattr(gm.player, 'stress', None))
         try:
-            print("Recent messages:", getattr(gm.ui, 'messages', None).messages[-12:])
+            print("Recent messages:", getattr(gm.ui, 'messages', None).recent(12))
         except Exception:
             pass
 
@@ -93,7 +93,7 @@ def run():
             print("HP after:", gm.player.hp)
             print("Inventory now:", gm.player.inventory)
             if getattr(gm.ui, 'messages', None):
-                print("Recent messages:", getattr(gm.ui.messages, 'messages', [])[-3:])
+                print("Recent messages:", gm.ui.messages.recent(3))
         except Exception:
             print("Consumable use failed:")
             traceback.print_exc()
@@ -119,7 +119,7 @@ def run():
             gm.player.gain_xp(1000)
             print('Level after:', gm.player.level, 'HP/Max:', gm.player.hp, '/', gm.player.max_hp)
             try:
-                print('Recent msg:', getattr(gm.ui.messages, 'messages', [])[-3:])
+                print('Recent msg:', gm.ui.messages.recent(3))
             except Exception:
                 pass
         except Exception:
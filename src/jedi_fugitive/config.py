@@ -18,4 +18,24 @@ DEPTH_DIFFICULTY_RATE = 0.20  # 20% depth-ish influence per depth step (tweak as
 
 # Map scaling: how much bigger maps should be compared to the generator's base.
 # Setting to 10 will produce maps ~10x larger (both width and height scaled).
-MAP_SCALE = 4
\ No newline at end of file
+MAP_SCALE = 4
+
+# Frame-rate cap for screen redraws (None = redraw as soon as something changes)
+MAX_FPS = None
+
+# World generation seed: None picks a random seed per run (overridable with
+# the JEDI_FUGITIVE_SEED environment variable).
+WORLD_SEED = None
+
+# Directory for cached generated worlds keyed by seed and parameters; None
+# disables the cache (overridable with JEDI_FUGITIVE_WORLD_CACHE).
+WORLD_CACHE_DIR = None
+
+# How far (in steps) from the player the enemy pathfinding distance map reaches;
+# enemies farther away fall back to a straight-line step.
+FLOW_FIELD_RADIUS = 24
+
+# Enemy AI level of detail (distances in tiles from the player): full AI within
+# AI_FULL_RANGE, cheap patrol/chase steps out to AI_PATROL_RANGE, asleep beyond.
+AI_FULL_RANGE = 24
+AI_PATROL_RANGE = 64
@@ -1,4 +1,5 @@
 from jedi_fugitive.game.force_abilities import ForcePushPull
+from jedi_fugitive.game.occupancy import occupants
 
 def choose_ability(game):
     abilities = game.player.get_available_abilities() or []
@@ -87,9 +88,9 @@ def use_force_ability(game, ability, tx, ty):
             try:
                 # find a living enemy at target tile
                 target = None
-                for e in getattr(game, "enemies", []):
+                for e in occupants(game, tx, ty):
                     try:
-                        if getattr(e, "is_alive", lambda: False)() and getattr(e, "x", -1) == tx and getattr(e, "y", -1) == ty:
+                        if getattr(e, "is_alive", lambda: False)():
                             target = e; break
                     except Exception:
                         continue
@@ -118,8 +119,8 @@ def use_force_ability(game, ability, tx, ty):
                         ch = game.game_map[y][x]
                         if ch in (wall_char, tree_char): return True
                         if (x, y) == (getattr(game.player, "x", -999), getattr(game.player, "y", -999)): return True
-                        for o in getattr(game, "enemies", []):
-                            if o is not target and getattr(o, "is_alive", lambda: False)() and getattr(o, "x", -999) == x and getattr(o, "y", -999) == y:
+                        for o in occupants(game, x, y):
+                            if o is not target and getattr(o, "is_alive", lambda: False)():
                                 return True
                         return False
 
@@ -0,0 +1,79 @@
+"""Per-turn summary of where enemies stand, shared by every enemy's AI.
+
+Coordinated charges and flanking ask "how many enemies are near the
+player?" and "how many allies are near me?" on every enemy's turn, and
+each question used to scan the whole enemy list: O(n^2) per turn. An
+`AIBlackboard` is built once at the start of `enemy.process_enemies` from
+the awake enemies and answers those questions from precomputed data:
+
+- enemies bucketed by Manhattan distance ring from the player, with a
+  sorted list of distances so "how many within r" is a bisect;
+- enemies bucketed by map cell, so ally counts only look at nearby cells
+  (and are cached per enemy and radius for the rest of the turn).
+
+Positions are as of the start of the turn, like the player's.
+"""
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Tuple
+
+CELL = 8
+
+
+class AIBlackboard:
+    """Enemy positions around the player, frozen at the start of a turn."""
+
+    def __init__(self, player, actors: Iterable):
+        self.px = getattr(player, 'x', 0)
+        self.py = getattr(player, 'y', 0)
+        self.rings: Dict[int, List[Any]] = {}
+        self._pos: Dict[int, Tuple[int, int]] = {}
+        self._cells: Dict[Tuple[int, int], List[Tuple[Any, int, int]]] = {}
+        self._allies: Dict[Tuple[int, int], int] = {}
+        dists = []
+        for e in actors:
+            if e is None:
+                continue
+            x, y = getattr(e, 'x', 0), getattr(e, 'y', 0)
+            d = abs(x - self.px) + abs(y - self.py)
+            self.rings.setdefault(d, []).append(e)
+            dists.append(d)
+            self._pos[id(e)] = (x, y)
+            self._cells.setdefault((x // CELL, y // CELL), []).append((e, x, y))
+        dists.sort()
+        self._dists = dists
+
+    def distance(self, enemy) -> int:
+        """Manhattan distance from `enemy` to the player at the start of the turn."""
+        x, y = self._pos.get(id(enemy)) or (getattr(enemy, 'x', 0), getattr(enemy, 'y', 0))
+        return abs(x - self.px) + abs(y - self.py)
+
+    def count_near_player(self, radius: int) -> int:
+        """Enemies within Manhattan `radius` of the player."""
+        return bisect_right(self._dists, radius)
+
+    def in_ring(self, d: int) -> List[Any]:
+        return list(self.rings.get(d, ()))
+
+    def allies_near(self, enemy, radius: int) -> int:
+        """Other enemies within Manhattan `radius` of `enemy`."""
+        key = (id(enemy), radius)
+        count = self._allies.get(key)
+        if count is not None:
+            return count
+        ex, ey = self._pos.get(id(enemy)) or (getattr(enemy, 'x', 0), getattr(enemy, 'y', 0))
+        count = 0
+        for cy in range((ey - radius) // CELL, (ey + radius) // CELL + 1):
+            for cx in range((ex - radius) // CELL, (ex + radius) // CELL + 1):
+                for other, x, y in self._cells.get((cx, cy), ()):
+                    if other is not enemy and abs(x - ex) + abs(y - ey) <= radius:
+                        count += 1
+        self._allies[key] = count
+        return count
+
+
+def ai_blackboard(game):
+    """The blackboard of the enemy turn in progress, or None outside one."""
+    return getattr(game, 'ai_blackboard', None)
+
+
+__all__ = ["AIBlackboard", "ai_blackboard", "CELL"]
@@ -0,0 +1,135 @@
+"""Distance-tiered level of detail for enemy AI.
+
+Running the full decision tree (taunts, stress, behaviour, flanking, ranged
+checks) for every enemy on a surface map costs time proportional to all
+enemies ever spawned, although only the ones near the player matter. Each
+turn `AILevelOfDetail.tiers` sorts enemies into three tiers by Chebyshev
+distance from the player:
+
+- FULL (within `full_range`): the complete AI in `enemy.process_enemies`;
+- PATROL (within `patrol_range`): a cheap step — walk the patrol route, or
+  keep closing in if the enemy has already spotted the player;
+- DORMANT (farther): not visited at all.
+
+Only enemies in the map regions around the player are looked at (see
+`OccupancyIndex.in_rect`), so dormant enemies cost nothing per turn. When
+a dormant patroller comes back into range it is fast-forwarded along its
+route by the turns it slept, in one go.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jedi_fugitive.game.occupancy import ActorList
+
+FULL, PATROL, DORMANT = 0, 1, 2
+
+
+def _chebyshev(a, bx: int, by: int) -> int:
+    return max(abs(getattr(a, 'x', 0) - bx), abs(getattr(a, 'y', 0) - by))
+
+
+def fast_forward_patrol(enemy, turns: int, can_stand: Optional[Callable[[int, int], bool]] = None) -> bool:
+    """Advance `enemy` along its patrol route as if it had walked for `turns` turns.
+
+    Patrols move one tile per turn (diagonals included), so each leg takes
+    its Chebyshev length. The enemy is placed on the last waypoint it would
+    have reached; it stays put when that tile is not free. Returns True if
+    it moved.
+    """
+    patrol = getattr(enemy, 'patrol_points', None)
+    if not patrol or turns <= 0 or getattr(enemy, '_has_spotted', False):
+        return False
+    try:
+        idx = int(getattr(enemy, '_patrol_index', 0) or 0) % len(patrol)
+        x, y = getattr(enemy, 'x', 0), getattr(enemy, 'y', 0)
+        lap = sum(max(abs(patrol[i][0] - patrol[i - 1][0]), abs(patrol[i][1] - patrol[i - 1][1]))
+                  for i in range(len(patrol)))
+        remaining = turns
+        reached = None
+        while remaining > 0:
+            tx, ty = patrol[idx]
+            leg = max(abs(tx - x), abs(ty - y))
+            if leg > remaining or (leg == 0 and not lap):
+                break
+            remaining -= leg
+            x, y = tx, ty
+            idx = (idx + 1) % len(patrol)
+            reached = (x, y)
+            if lap and remaining > lap:
+                remaining %= lap          # whole laps end where they started
+        if reached is None or (can_stand is not None and not can_stand(*reached)):
+            return False
+        enemy.x, enemy.y = reached
+        enemy._patrol_index = idx
+        return True
+    except Exception:
+        return False
+
+
+class AILevelOfDetail:
+    """Assigns enemies to AI tiers by distance from the player each turn."""
+
+    def __init__(self, full_range: int = 24, patrol_range: int = 64):
+        self.full_range = max(0, int(full_range))
+        self.patrol_range = max(self.full_range, int(patrol_range))
+        self.turn = 0
+        self._awake: Dict[int, Any] = {}       # id -> enemy in the FULL or PATROL tier last turn
+
+    def _nearby(self, game, px: int, py: int) -> List[Any]:
+        enemies = getattr(game, 'enemies', None) or []
+        r = self.patrol_range
+        if isinstance(enemies, ActorList):
+            return enemies.index.in_rect(px - r, py - r, px + r + 1, py + r + 1)
+        return [e for e in enemies if e is not None and _chebyshev(e, px, py) <= r]
+
+    def tiers(self, game, can_stand: Optional[Callable[[int, int], bool]] = None) -> Tuple[List[Any], List[Any]]:
+        """Advance one turn and return (full, patrol) tier enemies; the rest sleep.
+
+        Enemies waking up from the dormant tier are fast-forwarded first
+        (`can_stand(x, y)` vets the tile they would land on).
+        """
+        self.turn += 1
+        player = getattr(game, 'player', None)
+        px, py = getattr(player, 'x', 0), getattr(player, 'y', 0)
+        full, patrol = [], []
+        awake = {}
+        for e in self._nearby(game, px, py):
+            since = getattr(e, '_lod_dormant_since', None)
+            if since is not None:
+                e._lod_dormant_since = None
+                fast_forward_patrol(e, self.turn - since, can_stand)
+            awake[id(e)] = e
+            (full if _chebyshev(e, px, py) <= self.full_range else patrol).append(e)
+        for key, e in self._awake.items():
+            if key not in awake:
+                try:
+                    e._lod_dormant_since = self.turn
+                except Exception:
+                    pass
+        self._awake = awake
+        return full, patrol
+
+    def tier_of(self, enemy, game) -> int:
+        player = getattr(game, 'player', None)
+        d = _chebyshev(enemy, getattr(player, 'x', 0), getattr(player, 'y', 0))
+        if d <= self.full_range:
+            return FULL
+        return PATROL if d <= self.patrol_range else DORMANT
+
+
+def ai_lod(game) -> AILevelOfDetail:
+    """Return the AI level-of-detail scheduler kept on `game` (created on first use)."""
+    lod = getattr(game, 'ai_lod', None)
+    if lod is None:
+        try:
+            from jedi_fugitive.config import AI_FULL_RANGE, AI_PATROL_RANGE
+        except Exception:
+            AI_FULL_RANGE, AI_PATROL_RANGE = 24, 64
+        lod = AILevelOfDetail(AI_FULL_RANGE, AI_PATROL_RANGE)
+        try:
+            game.ai_lod = lod
+        except Exception:
+            pass
+    return lod
+
+
+__all__ = ["FULL", "PATROL", "DORMANT", "AILevelOfDetail", "ai_lod", "fast_forward_patrol"]
@@ -2,6 +2,11 @@ from enum import Enum
 import random
 import math
 from jedi_fugitive.game.personality import ENEMY_TAUNTS
+from jedi_fugitive.game.occupancy import occupants
+from jedi_fugitive.game.flow_field import flow_field
+from jedi_fugitive.game.ai_lod import ai_lod
+from jedi_fugitive.game.ai_blackboard import AIBlackboard, ai_blackboard
+from jedi_fugitive.game.turn_scheduler import turn_scheduler
 try:
     from jedi_fugitive.game.combat import calculate_hit
 except Exception:
@@ -38,6 +43,12 @@ def ai_find_retreat_direction(enemy, game):
     """Find direction away from player for retreating."""
     try:
         ex, ey = getattr(enemy, 'x', 0), getattr(enemy, 'y', 0)
+        # follow the player's flow field uphill when the enemy is on it
+        field = flow_field(game)
+        if field is not None:
+            step = field.step_away(ex, ey, lambda x, y: ai_can_move_to(game, x, y, exclude_enemy=enemy))
+            if step is not None:
+                return step
         px, py = getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)
         # Move away from player
         dx = -1 if px > ex else (1 if px < ex else 0)
@@ -53,6 +64,9 @@ def ai_find_retreat_direction(enemy, game):
 def ai_count_nearby_allies(enemy, game, radius=3):
     """Count nearby allied enemies within radius."""
     try:
+        board = ai_blackboard(game)
+        if board is not None:
+            return board.allies_near(enemy, radius)
         ex, ey = getattr(enemy, 'x', 0), getattr(enemy, 'y', 0)
         count = 0
         for other in getattr(game, 'enemies', []):
@@ -86,7 +100,16 @@ def ai_find_flanking_position(enemy, game):
         
         # If no perpendicular options, use direct approach
         if not perp_options:
-            return (direct_dx, direct_dy)
+            return ai_step_toward_player(enemy, game)
+        
+        # On the flow field, only flank along steps that don't lose ground
+        field = flow_field(game)
+        here = field.distance(ex, ey) if field is not None else None
+        if here is not None:
+            perp_options = [(dx, dy) for dx, dy in perp_options
+                            if (field.distance(ex + dx, ey + dy) or here + 1) <= here]
+            if not perp_options:
+                return ai_step_toward_player(enemy, game)
         
         # Pick random perpendicular direction for variation
         return random.choice(perp_options)
@@ -138,10 +161,8 @@ def ai_can_move_to(game, x, y, exclude_enemy=None):
             return False
         
         # Check other enemies
-        for other in getattr(game, 'enemies', []):
-            if other is exclude_enemy:
-                continue
-            if getattr(other, 'x', -1) == x and getattr(other, 'y', -1) == y:
+        for other in occupants(game, x, y):
+            if other is not exclude_enemy:
                 return False
         
         return True
@@ -149,9 +170,34 @@ def ai_can_move_to(game, x, y, exclude_enemy=None):
         return False
 
 
+def ai_step_toward_player(enemy, game, diagonal=False):
+    """Next step toward the player along the flow field, or a greedy step off it.
+
+    The greedy step moves on the x axis first (both axes with `diagonal`).
+    """
+    try:
+        ex, ey = getattr(enemy, 'x', 0), getattr(enemy, 'y', 0)
+        field = flow_field(game)
+        if field is not None:
+            step = field.step_toward(ex, ey, lambda x, y: ai_can_move_to(game, x, y, exclude_enemy=enemy))
+            if step is not None:
+                return step
+        px, py = getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)
+        dx = 1 if px > ex else (-1 if px < ex else 0)
+        dy = 1 if py > ey else (-1 if py < ey else 0)
+        if dx and not diagonal:
+            dy = 0
+        return (dx, dy)
+    except Exception:
+        return (0, 0)
+
+
 def ai_count_nearby_enemies(game, radius=8):
     """Count total enemies near player within radius."""
     try:
+        board = ai_blackboard(game)
+        if board is not None:
+            return board.count_near_player(radius)
         px, py = getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)
         count = 0
         for enemy in getattr(game, 'enemies', []):
@@ -210,6 +256,19 @@ class EnemyType(Enum):
 
 
 class Enemy:
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == 'x' or name == 'y':
+            # keep the game's occupancy index (see game.occupancy) in step with moves
+            index = self.__dict__.get('_occupancy')
+            if index is not None:
+                index.moved(self)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_occupancy', None)
+        return state
+
     def __init__(self, *args, **kwargs):
         """Flexible constructor: supports typed and legacy signatures."""
         # typed signature if first arg is an EnemyType
@@ -367,6 +426,11 @@ class Enemy:
     def is_alive(self) -> bool:
         return getattr(self, "hp", 0) > 0
 
+    def add_debuff(self, name: str, duration: int, magnitude: int = 1) -> None:
+        """Apply a timed debuff ('stun' skips actions, 'fear' makes the enemy flee)."""
+        debuffs = self.__dict__.setdefault('debuffs', {})
+        debuffs[name] = max(int(debuffs.get(name, 0)), int(duration))
+
     def take_damage(self, amount: int) -> int:
         actual = max(1, int(amount) - int(getattr(self, "defense", 0)))
         try:
@@ -711,11 +775,151 @@ class EnemyPersonality:
         return f"<EnemyPersonality {self.name} aggr={self.aggressiveness} caut={self.cautiousness}>"
 
 
+def ai_patrol_step(enemy, game):
+    """Walk one tile along the enemy's patrol route; True if it is patrolling.
+
+    Enemies stop patrolling once they have spotted the player.
+    """
+    e = enemy
+    try:
+        patrol = getattr(e, 'patrol_points', None)
+        if not patrol or getattr(e, '_has_spotted', False):
+            return False
+        # ensure an index exists
+        try:
+            idx = int(getattr(e, '_patrol_index', 0) or 0)
+        except Exception:
+            idx = 0
+        tgt = patrol[idx % len(patrol)] if patrol else None
+        if not tgt:
+            return False
+        tx, ty = tgt
+        # compute a single-step move toward patrol target
+        move_dx = 1 if tx > getattr(e, 'x', 0) else (-1 if tx < getattr(e, 'x', 0) else 0)
+        move_dy = 1 if ty > getattr(e, 'y', 0) else (-1 if ty < getattr(e, 'y', 0) else 0)
+        # attempt move (only onto floor)
+        try:
+            new_x = getattr(e, 'x', 0) + move_dx
+            new_y = getattr(e, 'y', 0) + move_dy
+            if 0 <= new_y < len(game.game_map) and 0 <= new_x < len(game.game_map[0]):
+                target_cell = game.game_map[new_y][new_x]
+                floor_char = getattr(Display, 'FLOOR', '.')
+                if target_cell == floor_char and not occupants(game, new_x, new_y) and not (new_x == getattr(game.player, 'x', -1) and new_y == getattr(game.player, 'y', -1)):
+                    e.x = new_x
+                    e.y = new_y
+        except Exception:
+            pass
+        # if reached target, advance index
+        try:
+            if getattr(e, 'x', None) == tx and getattr(e, 'y', None) == ty:
+                try:
+                    e._patrol_index = (idx + 1) % len(patrol)
+                except Exception:
+                    e._patrol_index = 0
+        except Exception:
+            pass
+        return True
+    except Exception:
+        return False
+
+
+def ai_background_step(enemy, game):
+    """Cheap turn for an enemy in the PATROL tier of the AI level of detail.
+
+    Patrollers walk their route, enemies that have spotted the player keep
+    closing in with a plain step, and everyone else idles. Returns False for
+    an idle enemy (it has nothing to do until the player comes closer).
+    """
+    try:
+        if getattr(enemy, '_is_hallucination', False):
+            return False
+        if not getattr(enemy, "is_alive", lambda: False)():
+            try:
+                game.enemies.remove(enemy)
+            except Exception:
+                pass
+            return True
+        if ai_patrol_step(enemy, game):
+            return True
+        if getattr(enemy, '_has_spotted', False):
+            dx, dy = ai_step_toward_player(enemy, game)
+            nx, ny = getattr(enemy, 'x', 0) + dx, getattr(enemy, 'y', 0) + dy
+            if (dx or dy) and ai_can_move_to(game, nx, ny, exclude_enemy=enemy):
+                enemy.x, enemy.y = nx, ny
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def _flee_step(enemy, game) -> None:
+    """Take one step away from the player (a frightened enemy's whole turn)."""
+    dx, dy = ai_find_retreat_direction(enemy, game)
+    nx, ny = getattr(enemy, 'x', 0) + dx, getattr(enemy, 'y', 0) + dy
+    if (dx or dy) and ai_can_move_to(game, nx, ny, exclude_enemy=enemy):
+        enemy.x, enemy.y = nx, ny
+
+
+def _sits_out_turn(enemy, game, scheduler):
+    """Spend one of the enemy's debuff turns; True if a debuff replaces its normal action.
+
+    A stun pushes the enemy's next action back in the turn scheduler, so a
+    stunned enemy is not visited again until it recovers. Fear cannot be
+    skipped that way, since ForceFear makes its targets flee, but a
+    frightened enemy only takes a flee step instead of running the full AI.
+    """
+    debuffs = getattr(enemy, 'debuffs', None)
+    if not debuffs:
+        return False
+    try:
+        afraid = bool(debuffs.get('fear'))
+        if afraid:
+            debuffs['fear'] -= 1
+            if debuffs['fear'] <= 0:
+                del debuffs['fear']
+        stun = debuffs.pop('stun', 0)
+        if stun > 0:
+            scheduler.delay(enemy, stun - 1)
+            return True
+        if afraid:
+            _flee_step(enemy, game)
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def _can_stand(game):
+    """Predicate for tiles an enemy may be placed on (fast-forwarded patrols)."""
+    return lambda x, y: ai_can_move_to(game, x, y)
+
+
 def process_enemies(game):
     """Process enemy turns: movement, taunts and attacks. Defensive and respects depth/difficulty."""
     from jedi_fugitive.config import DIFFICULTY_MULTIPLIER, DEPTH_DIFFICULTY_RATE
     try:
-        for e in list(getattr(game, "enemies", [])):
+        # only enemies near the player get the full AI; see game.ai_lod
+        full_tier, patrol_tier = ai_lod(game).tiers(game, _can_stand(game))
+        # aggregates the behaviours ask for are computed once per turn (game.ai_blackboard)
+        game.ai_blackboard = AIBlackboard(getattr(game, 'player', None), full_tier + patrol_tier)
+        # ... and act when the turn scheduler says they are due (game.turn_scheduler)
+        scheduler = turn_scheduler(game)
+        full_ids, patrol_ids = set(), set()
+        for e in full_tier:
+            scheduler.ensure(e, wake=True)
+            full_ids.add(id(e))
+        for e in patrol_tier:
+            scheduler.ensure(e)
+            patrol_ids.add(id(e))
+        for e in scheduler.advance():
+            if id(e) not in full_ids:
+                if id(e) not in patrol_ids:
+                    scheduler.discard(e)          # went dormant or left the level
+                elif not ai_background_step(e, game):
+                    scheduler.park(e)
+                continue
+            if _sits_out_turn(e, game, scheduler):
+                continue
             try:
                 # hallucinations are not real enemies: vanish when approached
                 try:
@@ -879,45 +1083,9 @@ def process_enemies(game):
 
                 # If this enemy has a patrol route and hasn't spotted the player yet,
                 # follow the patrol instead of moving directly toward the player.
-                try:
-                    patrol = getattr(e, 'patrol_points', None)
-                    if patrol and not getattr(e, '_has_spotted', False):
-                        # ensure an index exists
-                        try:
-                            idx = int(getattr(e, '_patrol_index', 0) or 0)
-                        except Exception:
-                            idx = 0
-                        tgt = patrol[idx % len(patrol)] if patrol else None
-                        if tgt:
-                            tx, ty = tgt
-                            # compute a single-step move toward patrol target
-                            move_dx = 1 if tx > getattr(e, 'x', 0) else (-1 if tx < getattr(e, 'x', 0) else 0)
-                            move_dy = 1 if ty > getattr(e, 'y', 0) else (-1 if ty < getattr(e, 'y', 0) else 0)
-                            # attempt move (only onto floor)
-                            try:
-                                new_x = getattr(e, 'x', 0) + move_dx
-                                new_y = getattr(e, 'y', 0) + move_dy
-                                if 0 <= new_y < len(game.game_map) and 0 <= new_x < len(game.game_map[0]):
-                                    target_cell = game.game_map[new_x and new_y or new_y][new_x] if False else game.game_map[new_y][new_x]
-                                    floor_char = getattr(Display, 'FLOOR', '.')
-                                    if target_cell == floor_char and not any((getattr(o, 'x', -1) == new_x and getattr(o, 'y', -1) == new_y) for o in game.enemies) and not (new_x == getattr(game.player, 'x', -1) and new_y == getattr(game.player, 'y', -1)):
-                                        e.x = new_x
-                                        e.y = new_y
-                            except Exception:
-                                pass
-                            # if reached target, advance index
-                            try:
-                                if getattr(e, 'x', None) == tx and getattr(e, 'y', None) == ty:
-                                    try:
-                                        e._patrol_index = (idx + 1) % len(patrol)
-                                    except Exception:
-                                        e._patrol_index = 0
-                            except Exception:
-                                pass
-                            # patrol movement consumes the enemy's action
-                            continue
-                except Exception:
-                    pass
+                if ai_patrol_step(e, game):
+                    # patrol movement consumes the enemy's action
+                    continue
 
                 # depth influenced scaling
                 depth = max(1, getattr(game, "current_depth", 1))
@@ -1060,6 +1228,7 @@ def process_enemies(game):
                 else:
                     # Enhanced AI: coordinated charging, behavior-based tactics, retreat, flanking
                     dx, dy = 0, 0
+                    chasing = False
                     
                     try:
                         # Get enemy's behavioral style
@@ -1068,14 +1237,8 @@ def process_enemies(game):
                         # COORDINATED CHARGE: if 3+ enemies nearby, all charge together!
                         if ai_should_charge(e, game):
                             # Direct aggressive movement toward player
-                            if getattr(game.player, "x", 0) > getattr(e, "x", 0):
-                                dx = 1
-                            elif getattr(game.player, "x", 0) < getattr(e, "x", 0):
-                                dx = -1
-                            if getattr(game.player, "y", 0) > getattr(e, "y", 0):
-                                dy = 1
-                            elif getattr(game.player, "y", 0) < getattr(e, "y", 0):
-                                dy = -1
+                            dx, dy = ai_step_toward_player(e, game, diagonal=True)
+                            chasing = True
                             # Message on first charge
                             try:
                                 if not getattr(e, '_charge_announced', False) and random.random() < 0.3:
@@ -1106,15 +1269,8 @@ def process_enemies(game):
                         
                         # AGGRESSIVE/BRAWLER: always charge directly, ignore tactics
                         elif behavior == 'aggressive':
-                            if getattr(game.player, "x", 0) > getattr(e, "x", 0):
-                                dx = 1
-                            elif getattr(game.player, "x", 0) < getattr(e, "x", 0):
-                                dx = -1
-                            if dx == 0:
-                                if getattr(game.player, "y", 0) > getattr(e, "y", 0):
-                                    dy = 1
-                                elif getattr(game.player, "y", 0) < getattr(e, "y", 0):
-                                    dy = -1
+                            dx, dy = ai_step_toward_player(e, game)
+                            chasing = True
                         
                         # FLANKER: always try to attack from sides
                         elif behavior == 'flanker':
@@ -1122,15 +1278,8 @@ def process_enemies(game):
                                 dx, dy = ai_find_flanking_position(e, game)
                             else:
                                 # Close enough, move in
-                                if getattr(game.player, "x", 0) > getattr(e, "x", 0):
-                                    dx = 1
-                                elif getattr(game.player, "x", 0) < getattr(e, "x", 0):
-                                    dx = -1
-                                if dx == 0:
-                                    if getattr(game.player, "y", 0) > getattr(e, "y", 0):
-                                        dy = 1
-                                    elif getattr(game.player, "y", 0) < getattr(e, "y", 0):
-                                        dy = -1
+                                dx, dy = ai_step_toward_player(e, game)
+                                chasing = True
                         
                         # RANGED: maintain preferred distance
                         elif behavior == 'ranged' or hasattr(e, 'attempt_ranged_shot') or getattr(e, 'preferred_range', 0) > 0:
@@ -1144,29 +1293,11 @@ def process_enemies(game):
                         
                         # Default: direct pursuit toward player
                         else:
-                            if getattr(game.player, "x", 0) > getattr(e, "x", 0):
-                                dx = 1
-                            elif getattr(game.player, "x", 0) < getattr(e, "x", 0):
-                                dx = -1
-                            if dx == 0:
-                                if getattr(game.player, "y", 0) > getattr(e, "y", 0):
-                                    dy = 1
-                                elif getattr(game.player, "y", 0) < getattr(e, "y", 0):
-                                    dy = -1
+                            dx, dy = ai_step_toward_player(e, game)
+                            chasing = True
                     except Exception:
                         # Fallback to simple pursuit
-                        try:
-                            if getattr(game.player, "x", 0) > getattr(e, "x", 0):
-                                dx = 1
-                            elif getattr(game.player, "x", 0) < getattr(e, "x", 0):
-                                dx = -1
-                            if dx == 0:
-                                if getattr(game.player, "y", 0) > getattr(e, "y", 0):
-                                    dy = 1
-                                elif getattr(game.player, "y", 0) < getattr(e, "y", 0):
-                                    dy = -1
-                        except Exception:
-                            dx, dy = 0, 0
+                        dx, dy = ai_step_toward_player(e, game)
 
                     # Deeper levels grant occasional extra movement step
                     steps = 1
@@ -1178,8 +1309,11 @@ def process_enemies(game):
                         steps = 1
 
                     # Execute movement steps
-                    for _ in range(steps):
+                    for step in range(steps):
                         try:
+                            if step and chasing:
+                                # a second chase step re-reads the flow field from the new tile
+                                dx, dy = ai_step_toward_player(e, game)
                             new_x = getattr(e, "x", 0) + dx
                             new_y = getattr(e, "y", 0) + dy
                             # Use enhanced pathfinding helper
@@ -1218,3 +1352,9 @@ def process_enemies(game):
             game.ui.messages.add("Enemy processing error.")
         except Exception:
             pass
+    finally:
+        # the blackboard only describes this turn; later lookups scan live positions
+        try:
+            game.ai_blackboard = None
+        except Exception:
+            pass
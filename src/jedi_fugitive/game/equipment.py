@@ -1,5 +1,6 @@
 import curses
 from jedi_fugitive.game.level import Display
+from jedi_fugitive.game.world_chunks import items_at
 
 
 def _unlock_dark_ability(game):
@@ -350,7 +351,7 @@ def pick_up(game):
         
         # Prefer explicit item entries placed on the map (game.items_on_map)
         try:
-            items_here = [it for it in getattr(game, 'items_on_map', []) or [] if it.get('x') == px and it.get('y') == py]
+            items_here = [it for it in items_at(game, px, py) if it.get('x') == px and it.get('y') == py]
         except Exception:
             items_here = []
         # inventory capacity (default 9)
@@ -1370,6 +1371,9 @@ def craft_item(game, recipe_name):
             weapon_name = getattr(weapon, 'name', 'Weapon')
             if upgrade_name not in weapon_name:
                 weapon.name = f"{weapon_name} ({upgrade_name})"
+            # the weapon was edited in place: refresh the cached stats panel
+            try: game.player.touch()
+            except Exception: pass
             
             try: 
                 game.ui.messages.add(f"Upgraded {weapon_name} with {recipe.name}!")
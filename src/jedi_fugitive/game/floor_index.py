@@ -0,0 +1,288 @@
+"""Index of walkable floor tiles bucketed by biome and coarse region.
+
+Spawning and placement code needs "a random floor tile in biome B, farther
+than D from the player". Rejection sampling over the whole map gets slower
+as maps grow and floor gets sparser, and scanning every tile scales with map
+area. `FloorIndex` keeps each floor tile in a bucket keyed by
+(biome, region), where regions are `region_size` squares, with O(1)
+add/remove (swap-pop) and a per-tile slot table.
+
+Bucket sizes are kept as running counts in a binary indexed (Fenwick) tree
+per biome and one for the whole map, updated on every add/remove, so a
+uniform pick is a single O(log regions) descent. A distance query leaves
+out the few regions lying entirely within `min_dist` of the origin (found
+from the origin's neighbourhood, not by visiting every region) and only
+rejects tiles from the regions straddling that boundary. Attached to a
+TileGrid or ChunkedTileGrid through `on_write`, the index follows tile
+changes (trees cleared, items dropped or picked up, POIs placed)
+automatically.
+"""
+from __future__ import annotations
+
+import random
+from typing import Container, Dict, List, Optional, Tuple
+
+from jedi_fugitive.game.world_chunks import tile_positions
+
+Point = Tuple[int, int]
+RegionKey = Tuple[int, int]
+
+
+class _Counts:
+    """Running prefix sums over a growable list of counts (a Fenwick tree)."""
+
+    def __init__(self):
+        self._tree = [0]            # 1-based; node i covers counts (i - lowbit(i), i]
+        self.total = 0
+
+    def append(self, value: int = 0) -> int:
+        i = len(self._tree)
+        self._tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+        self.total += value
+        return i - 1
+
+    def add(self, slot: int, delta: int) -> None:
+        tree = self._tree
+        i, n = slot + 1, len(tree)
+        while i < n:
+            tree[i] += delta
+            i += i & -i
+        self.total += delta
+
+    def prefix(self, slot: int) -> int:
+        """Sum of the counts of slots [0, slot)."""
+        tree = self._tree
+        s, i = 0, slot
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+    def find(self, target: int) -> int:
+        """Slot holding unit number `target` (0-based) of the running total."""
+        tree = self._tree
+        n = len(tree)
+        pos, step = 0, 1 << (n - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+class _Buckets:
+    """Tile buckets of one biome (or of the whole map) with their running counts."""
+
+    def __init__(self):
+        self.lists: List[List[Point]] = []
+        self.regions: List[RegionKey] = []
+        self.slots: Dict[RegionKey, List[int]] = {}       # region -> slots (one per biome)
+        self.counts = _Counts()
+
+    def register(self, region: RegionKey, bucket: List[Point]) -> int:
+        slot = self.counts.append(len(bucket))
+        self.lists.append(bucket)
+        self.regions.append(region)
+        self.slots.setdefault(region, []).append(slot)
+        return slot
+
+    def pick(self, rng, skip: List[int] = ()) -> Optional[Point]:
+        """Uniform tile outside the `skip` slots (ascending); None when none is left."""
+        counts, lists = self.counts, self.lists
+        total = counts.total - sum(len(lists[s]) for s in skip)
+        if total <= 0:
+            return None
+        t = int(rng.random() * total)
+        for s in skip:
+            # map the t-th kept tile to its position in the full order
+            if counts.prefix(s) > t:
+                break
+            t += len(lists[s])
+        slot = counts.find(t)
+        return lists[slot][t - counts.prefix(slot)]
+
+
+class FloorIndex:
+    """Floor tiles of one map, bucketed by biome and region."""
+
+    def __init__(self, game_map, biomes=None, floor: str = ".", region_size: int = 32):
+        self.game_map = game_map
+        self.biomes = biomes
+        self.floor = floor
+        self.region_size = max(1, int(region_size))
+        self._all = _Buckets()
+        self._by_biome: Dict[object, _Buckets] = {}
+        self._where: Dict[Tuple[object, RegionKey], Tuple[List[Point], int, int]] = {}
+        self._slot: Dict[Point, int] = {}
+        self._biome_of: Dict[Point, object] = {}
+
+    @classmethod
+    def build(cls, game_map, biomes=None, floor: str = ".", region_size: int = 32,
+              attach: bool = True) -> "FloorIndex":
+        """Index every `floor` tile of `game_map`, optionally following later writes."""
+        index = cls(game_map, biomes, floor, region_size)
+        for (x, y) in tile_positions(game_map, floor):
+            index.add(x, y)
+        if attach:
+            index.attach()
+        return index
+
+    def attach(self) -> bool:
+        """Keep the index in sync with the map's writes; False if the map can't notify."""
+        try:
+            self.game_map.on_write = self.on_write
+            return True
+        except AttributeError:
+            return False
+
+    def detach(self) -> None:
+        if getattr(self.game_map, 'on_write', None) == self.on_write:
+            self.game_map.on_write = None
+
+    def on_write(self, x: int, y: int, old, new) -> None:
+        if new == self.floor:
+            self.add(x, y)
+        elif old == self.floor:
+            self.discard(x, y)
+
+    def biome_at(self, x: int, y: int):
+        biomes = self.biomes
+        if not biomes:
+            return None
+        try:
+            get = getattr(biomes, 'get', None)
+            return get(x, y) if get is not None else biomes[y][x]
+        except Exception:
+            return None
+
+    def _bucket(self, biome, region: RegionKey) -> Tuple[List[Point], int, int]:
+        """(bucket, slot in the whole-map counts, slot in the biome's counts), created on first use."""
+        key = (biome, region)
+        entry = self._where.get(key)
+        if entry is None:
+            bucket: List[Point] = []
+            group = self._by_biome.get(biome)
+            if group is None:
+                group = self._by_biome[biome] = _Buckets()
+            entry = self._where[key] = (bucket, self._all.register(region, bucket),
+                                        group.register(region, bucket))
+        return entry
+
+    def add(self, x: int, y: int) -> None:
+        p = (x, y)
+        if p in self._slot:
+            return
+        biome = self.biome_at(x, y)
+        rs = self.region_size
+        bucket, all_slot, biome_slot = self._bucket(biome, (x // rs, y // rs))
+        self._slot[p] = len(bucket)
+        self._biome_of[p] = biome
+        bucket.append(p)
+        self._all.counts.add(all_slot, 1)
+        self._by_biome[biome].counts.add(biome_slot, 1)
+
+    def discard(self, x: int, y: int) -> None:
+        p = (x, y)
+        i = self._slot.pop(p, None)
+        if i is None:
+            return
+        biome = self._biome_of.pop(p)
+        rs = self.region_size
+        bucket, all_slot, biome_slot = self._where[(biome, (x // rs, y // rs))]
+        last = bucket.pop()
+        if last != p:
+            bucket[i] = last
+            self._slot[last] = i
+        self._all.counts.add(all_slot, -1)
+        self._by_biome[biome].counts.add(biome_slot, -1)
+
+    def __contains__(self, p) -> bool:
+        return p in self._slot
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def count(self, biome=None) -> int:
+        """Number of floor tiles in `biome` (all biomes when None)."""
+        if biome is None:
+            return len(self._slot)
+        group = self._by_biome.get(biome)
+        return group.counts.total if group is not None else 0
+
+    def biomes_present(self) -> List[object]:
+        return [b for b, group in self._by_biome.items() if group.counts.total]
+
+    def _split(self, group: _Buckets, origin: Point, min_dist: int) -> Tuple[List[int], List[int]]:
+        """Slots of `group` wholly within `min_dist` of `origin`, and slots straddling it."""
+        ox, oy = origin
+        rs = self.region_size
+        rx0, rx1 = (ox - min_dist) // rs, (ox + min_dist) // rs
+        ry0, ry1 = (oy - min_dist) // rs, (oy + min_dist) // rs
+        if (rx1 - rx0 + 1) * (ry1 - ry0 + 1) <= len(group.slots):
+            regions = ((rx, ry) for ry in range(ry0, ry1 + 1) for rx in range(rx0, rx1 + 1))
+        else:
+            regions = iter(list(group.slots))   # fewer regions than the neighbourhood spans
+        near: List[int] = []
+        mixed: List[int] = []
+        for region in regions:
+            slots = group.slots.get(region)
+            if not slots:
+                continue
+            x0, y0 = region[0] * rs, region[1] * rs
+            x1, y1 = x0 + rs - 1, y0 + rs - 1
+            if max(0, x0 - ox, ox - x1) + max(0, y0 - oy, oy - y1) > min_dist:
+                continue
+            far_corner = max(abs(x0 - ox), abs(x1 - ox)) + max(abs(y0 - oy), abs(y1 - oy))
+            (near if far_corner <= min_dist else mixed).extend(slots)
+        near.sort()
+        mixed.sort()
+        return near, mixed
+
+    def random_tile(self, rng=random, biome=None, origin: Optional[Point] = None, min_dist: int = 0,
+                    exclude: Container = (), tries: int = 32) -> Optional[Point]:
+        """Random floor tile in `biome` (any when None) farther than `min_dist` from `origin`.
+
+        Distances are Manhattan, like the spawn rules that use this. Returns
+        None when no tile qualifies. Tiles in `exclude` are never returned.
+        """
+        group = self._all if biome is None else self._by_biome.get(biome)
+        if group is None or group.counts.total <= 0:
+            return None
+        if origin is None or min_dist <= 0:
+            origin, near, mixed = None, [], []
+        else:
+            near, mixed = self._split(group, origin, int(min_dist))
+
+        def ok(p):
+            if p in exclude:
+                return False
+            return origin is None or abs(p[0] - origin[0]) + abs(p[1] - origin[1]) > min_dist
+
+        for _ in range(max(1, tries)):
+            p = group.pick(rng, near)
+            if p is None:
+                return None
+            if ok(p):
+                return p
+        # unlucky or heavily constrained: list the boundary regions exactly and
+        # keep sampling the regions beyond them, where only `exclude` can reject
+        candidates = [p for s in mixed for p in group.lists[s] if ok(p)]
+        beyond = sorted(near + mixed)
+        n_beyond = group.counts.total - sum(len(group.lists[s]) for s in beyond)
+        for _ in range(max(1, tries)):
+            r = int(rng.random() * (len(candidates) + n_beyond))
+            if r < len(candidates):
+                return candidates[r]
+            p = group.pick(rng, beyond)
+            if p is not None and ok(p):
+                return p
+        if n_beyond:
+            skip = set(beyond)
+            candidates.extend(p for s, bucket in enumerate(group.lists) if s not in skip
+                              for p in bucket if ok(p))
+        return rng.choice(candidates) if candidates else None
+
+
+__all__ = ["FloorIndex"]
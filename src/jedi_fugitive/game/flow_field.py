@@ -0,0 +1,132 @@
+"""Distance map from the player shared by every chasing or fleeing enemy.
+
+Enemies used to step greedily along the sign of (player - enemy), which
+stalls against trees, rocks and walls. A `FlowField` is a breadth-first
+distance map (8-way moves, one step per tile) from the player over
+walkable tiles, bounded to `radius` steps. It is computed once and reused
+until the player moves or the map changes, so each enemy reads its next
+step with a few dict lookups:
+
+- `step_toward` picks the free neighbour closest to the player;
+- `step_away` picks the free neighbour farthest from the player (retreat).
+
+Tiles outside the field (too far or unreachable) return None, and callers
+fall back to the old greedy step.
+"""
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+Point = Tuple[int, int]
+
+# orthogonal moves first so ties prefer straight steps
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class FlowField:
+    """Steps-to-player for every walkable tile within `radius` of the player."""
+
+    def __init__(self, game_map, origin: Point, radius: int = 24, walkable: str = '.'):
+        self.origin = origin
+        self.radius = max(0, int(radius))
+        self.dist: Dict[Point, int] = {}
+        self._build(game_map, walkable)
+
+    def _build(self, game_map, walkable: str) -> None:
+        try:
+            mh = len(game_map)
+            mw = len(game_map[0]) if mh else 0
+        except Exception:
+            return
+        ox, oy = self.origin
+        r = self.radius
+        dist = self.dist
+        dist[(ox, oy)] = 0
+        frontier = deque(((ox, oy),))
+        while frontier:
+            x, y = frontier.popleft()
+            d = dist[(x, y)] + 1
+            if d > r:
+                continue
+            for dx, dy in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if (nx, ny) in dist or not (0 <= nx < mw and 0 <= ny < mh):
+                    continue
+                try:
+                    if game_map[ny][nx] != walkable:
+                        continue
+                except Exception:
+                    continue
+                dist[(nx, ny)] = d
+                frontier.append((nx, ny))
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        return self.dist.get((x, y))
+
+    def step_toward(self, x: int, y: int, can_move: Optional[Callable[[int, int], bool]] = None) -> Optional[Point]:
+        """Best step from (x, y) toward the player; (0, 0) when boxed in, None off the field."""
+        here = self.dist.get((x, y))
+        if here is None:
+            return None
+        best, best_d = (0, 0), here
+        for dx, dy in NEIGHBOURS:
+            d = self.dist.get((x + dx, y + dy))
+            if d is None or d >= best_d:
+                continue
+            if can_move is not None and not can_move(x + dx, y + dy):
+                continue
+            best, best_d = (dx, dy), d
+        return best
+
+    def step_away(self, x: int, y: int, can_move: Optional[Callable[[int, int], bool]] = None) -> Optional[Point]:
+        """Best step from (x, y) away from the player; (0, 0) when cornered, None off the field."""
+        here = self.dist.get((x, y))
+        if here is None:
+            return None
+        ox, oy = self.origin
+        best, best_d = (0, 0), here
+        for dx, dy in NEIGHBOURS:
+            nx, ny = x + dx, y + dy
+            d = self.dist.get((nx, ny))
+            if d is None:
+                # past the edge of the field counts as farther than anything on it
+                if max(abs(nx - ox), abs(ny - oy)) <= self.radius:
+                    continue
+                d = self.radius + 1
+            if d <= best_d:
+                continue
+            if can_move is not None and not can_move(nx, ny):
+                continue
+            best, best_d = (dx, dy), d
+        return best
+
+
+def flow_field(game, radius: Optional[int] = None) -> Optional[FlowField]:
+    """The game's flow field toward the player, rebuilt when the player or map changes."""
+    game_map = getattr(game, 'game_map', None)
+    player = getattr(game, 'player', None)
+    if not game_map or player is None:
+        return None
+    if radius is None:
+        try:
+            from jedi_fugitive.config import FLOW_FIELD_RADIUS as radius
+        except Exception:
+            radius = 24
+    try:
+        from jedi_fugitive.game.level import Display
+        walkable = getattr(Display, 'FLOOR', '.')
+    except Exception:
+        walkable = '.'
+    origin = (getattr(player, 'x', 0), getattr(player, 'y', 0))
+    key = (id(game_map), getattr(game_map, 'revision', None), origin, radius)
+    field = getattr(game, 'flow_field', None)
+    if field is None or getattr(field, 'key', None) != key:
+        field = FlowField(game_map, origin, radius, walkable)
+        field.key = key
+        try:
+            game.flow_field = field
+        except Exception:
+            pass
+    return field
+
+
+__all__ = ["FlowField", "flow_field", "NEIGHBOURS"]
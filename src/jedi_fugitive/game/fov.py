@@ -0,0 +1,191 @@
+"""Field-of-view algorithms.
+
+`compute_fov` returns the set of (x, y) tiles visible from an origin within a
+circular radius. The default algorithm is symmetric recursive shadowcasting,
+which visits each tile in range once per octant pair; the older per-tile
+Bresenham ray test is kept as the "bresenham" algorithm for comparison.
+
+Both follow the game's LOS rules: a blocking tile is itself visible, but
+nothing behind it is, and tiles outside the map block sight.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+from jedi_fugitive.game.level import Display
+from jedi_fugitive.game.tile_grid import TileGrid
+from jedi_fugitive.game.world_chunks import ChunkedTileGrid
+
+# Glyphs that do not block line of sight; every other glyph is opaque.
+TRANSPARENT_GLYPHS = frozenset((
+    getattr(Display, "FLOOR", "."), getattr(Display, "WRECKAGE", "x"),
+    'O', 'L', '?', '!', '@', '$', '%', '&', '*', 'C', 'S', 'M', 'r',
+))
+
+Point = Tuple[int, int]
+
+
+def make_opacity_test(game_map, transparent: Iterable[str] = TRANSPARENT_GLYPHS) -> Callable[[int, int], bool]:
+    """Return an `is_opaque(x, y)` predicate for `game_map`.
+
+    TileGrid maps get a byte-level lookup table built once from the palette,
+    ChunkedTileGrid maps the same table over their chunk buffers (fetched
+    once per chunk); list-of-lists maps fall back to glyph membership tests.
+    Out-of-bounds coordinates are opaque.
+    """
+    transparent = frozenset(transparent)
+    mh = len(game_map)
+    mw = len(game_map[0]) if mh else 0
+    if isinstance(game_map, TileGrid):
+        table = bytes(0 if g in transparent else 1 for g in game_map.palette).ljust(256, b"\x01")
+        data = game_map.data
+
+        def is_opaque(x: int, y: int) -> bool:
+            if x < 0 or y < 0 or x >= mw or y >= mh:
+                return True
+            return table[data[y * mw + x]] == 1
+        return is_opaque
+    if isinstance(game_map, ChunkedTileGrid):
+        return _chunked_opacity_test(game_map, transparent)
+
+    def is_opaque(x: int, y: int) -> bool:
+        if x < 0 or y < 0 or x >= mw or y >= mh:
+            return True
+        try:
+            return game_map[y][x] not in transparent
+        except Exception:
+            return True
+    return is_opaque
+
+
+def _chunked_opacity_test(grid: ChunkedTileGrid, transparent: frozenset) -> Callable[[int, int], bool]:
+    mw, mh, cs = grid.width, grid.height, grid.chunk_size
+    palette = grid.palette
+    table = bytearray(b"\x01" * 256)
+    known = [0]
+
+    def learn() -> None:
+        # the palette only grows; generating a chunk may add glyphs to it
+        for code in range(known[0], len(palette)):
+            table[code] = 0 if palette[code] in transparent else 1
+        known[0] = len(palette)
+
+    learn()
+    fill = grid.fill_code
+    chunks: Dict[Tuple[int, int], object] = {}
+
+    def is_opaque(x: int, y: int) -> bool:
+        if x < 0 or y < 0 or x >= mw or y >= mh:
+            return True
+        cx, rx = divmod(x, cs)
+        cy, ry = divmod(y, cs)
+        key = (cx, cy)
+        try:
+            chunk = chunks[key]
+        except KeyError:
+            chunk = chunks[key] = grid.chunk_codes(cx, cy)
+            learn()
+        return table[fill if chunk is None else chunk[ry * cs + rx]] == 1
+    return is_opaque
+
+
+def shadowcast_fov(is_opaque: Callable[[int, int], bool], ox: int, oy: int, radius: int,
+                   width: int, height: int) -> Set[Point]:
+    """Symmetric recursive shadowcasting.
+
+    Slopes are kept as integer (numerator, denominator) pairs so the
+    symmetry test is exact. Floor tiles are revealed only when they lie
+    inside the visible sector symmetrically; opaque tiles are revealed
+    whenever any part of them is in the sector.
+    """
+    vis: Set[Point] = {(ox, oy)}
+    r2 = radius * radius
+
+    for quadrant in range(4):
+        if quadrant == 0:      # north
+            def transform(depth, col): return ox + col, oy - depth
+        elif quadrant == 1:    # south
+            def transform(depth, col): return ox + col, oy + depth
+        elif quadrant == 2:    # east
+            def transform(depth, col): return ox + depth, oy + col
+        else:                  # west
+            def transform(depth, col): return ox - depth, oy + col
+
+        def scan(depth, sn, sd, en, ed):
+            # sn/sd is the start slope, en/ed the end slope (denominators > 0)
+            if depth > radius:
+                return
+            min_col = (2 * depth * sn + sd) // (2 * sd)          # round half up
+            max_col = -((ed - 2 * depth * en) // (2 * ed))       # round half down
+            prev_opaque = None
+            for col in range(min_col, max_col + 1):
+                x, y = transform(depth, col)
+                opaque = is_opaque(x, y)
+                in_bounds = 0 <= x < width and 0 <= y < height
+                if in_bounds and col * col + depth * depth <= r2:
+                    if opaque or (col * sd >= depth * sn and col * ed <= depth * en):
+                        vis.add((x, y))
+                if prev_opaque and not opaque:
+                    # entering a gap: narrow the start slope to this tile's left edge
+                    sn, sd = 2 * col - 1, 2 * depth
+                if prev_opaque is False and opaque:
+                    scan(depth + 1, sn, sd, 2 * col - 1, 2 * depth)
+                prev_opaque = opaque
+            if prev_opaque is False:
+                scan(depth + 1, sn, sd, en, ed)
+
+        scan(1, -1, 1, 1, 1)
+    return vis
+
+
+def bresenham_fov(is_opaque: Callable[[int, int], bool], ox: int, oy: int, radius: int,
+                  width: int, height: int) -> Set[Point]:
+    """Reference implementation: trace a Bresenham ray to every tile in range."""
+    vis: Set[Point] = set()
+    r2 = radius * radius
+    for ty in range(max(0, oy - radius), min(height, oy + radius + 1)):
+        for tx in range(max(0, ox - radius), min(width, ox + radius + 1)):
+            dx = tx - ox; dy = ty - oy
+            if dx * dx + dy * dy > r2:
+                continue
+            x, y = ox, oy
+            adx = abs(dx); sx = 1 if ox < tx else -1
+            ady = -abs(dy); sy = 1 if oy < ty else -1
+            err = adx + ady
+            blocked = False
+            while not (x == tx and y == ty):
+                e2 = 2 * err
+                if e2 >= ady:
+                    err += ady
+                    x += sx
+                if e2 <= adx:
+                    err += adx
+                    y += sy
+                if is_opaque(x, y):
+                    # a blocking target is itself visible
+                    blocked = not (x == tx and y == ty)
+                    break
+            if not blocked:
+                vis.add((tx, ty))
+    return vis
+
+
+FOV_ALGORITHMS: Dict[str, Callable[..., Set[Point]]] = {
+    "shadowcast": shadowcast_fov,
+    "bresenham": bresenham_fov,
+}
+
+
+def compute_fov(game_map, ox: int, oy: int, radius: int, algorithm: str = "shadowcast",
+                transparent: Iterable[str] = TRANSPARENT_GLYPHS) -> Set[Point]:
+    """Return the tiles of `game_map` visible from (ox, oy) within `radius`."""
+    mh = len(game_map)
+    mw = len(game_map[0]) if mh else 0
+    if not (0 <= ox < mw and 0 <= oy < mh):
+        return set()
+    fn = FOV_ALGORITHMS.get(algorithm, shadowcast_fov)
+    return fn(make_opacity_test(game_map, transparent), ox, oy, max(0, int(radius)), mw, mh)
+
+
+__all__ = ["TRANSPARENT_GLYPHS", "FOV_ALGORITHMS", "compute_fov", "make_opacity_test",
+           "shadowcast_fov", "bresenham_fov"]
@@ -9,12 +9,22 @@ import random
 
 from jedi_fugitive.ui.silq_ui import SILQUI
 from jedi_fugitive.game.player import Player
-from jedi_fugitive.game import projectiles, force_abilities, map_features, input_handler, ui_renderer, equipment
+from jedi_fugitive.game import projectiles, force_abilities, map_features, input_handler, ui_renderer, equipment, fov
 from jedi_fugitive.game.enemy import Enemy, EnemyType, process_enemies as enemy_process_enemies
 from jedi_fugitive.game.personality import EnemyPersonality, ENEMY_TAUNTS
 from jedi_fugitive.game.level import generate_crash_site, generate_dungeon_level, Display
+from jedi_fugitive.game.flow_field import flow_field
+from jedi_fugitive.game.minimap import minimap_summary
+from jedi_fugitive.game.occupancy import OccupancyIndex, bind_actors, occupants
+from jedi_fugitive.game.tile_grid import TileMask
+from jedi_fugitive.game.tomb_prefetch import TombPrefetcher
+from jedi_fugitive.game.turn_scheduler import TICKS_PER_TURN, TurnScheduler, actor_speed
+from jedi_fugitive.game.world_chunks import ChunkIndex, items_at
+from jedi_fugitive.game.world_seed import resolve_world_seed, stage_rng
 from jedi_fugitive.ui.dialog import DialogueSystem, UIMessageBuffer
-from jedi_fugitive.config import MAP_RATIO_W, MAP_RATIO_H, STATS_RATIO_W, DIFFICULTY_MULTIPLIER, MAP_SCALE, DEPTH_DIFFICULTY_RATE
+from jedi_fugitive.ui.animation_queue import AnimationQueue
+from jedi_fugitive.ui.frame_scheduler import FrameScheduler
+from jedi_fugitive.config import MAP_RATIO_W, MAP_RATIO_H, STATS_RATIO_W, DIFFICULTY_MULTIPLIER, MAP_SCALE, DEPTH_DIFFICULTY_RATE, MAX_FPS
 from jedi_fugitive.game.combat import player_attack, calculate_hit
 from jedi_fugitive.game import abilities, map_features as mf
 from jedi_fugitive.game.sith_codex import SithCodex, populate_canon, populate_artifacts
@@ -22,6 +32,30 @@ from jedi_fugitive.game.sith_codex import SithCodex, populate_canon, populate_ar
 class GameManager:
     """Clean, defensive GameManager suitable to drive the curses UI and other subsystems."""
 
+    @property
+    def enemies(self):
+        return self.__dict__.get('_enemies')
+
+    @enemies.setter
+    def enemies(self, value):
+        # every enemy list the game switches to is kept in the occupancy index
+        index = self.__dict__.get('occupancy')
+        if index is None:
+            index = self.__dict__['occupancy'] = OccupancyIndex()
+        self.__dict__['_enemies'] = bind_actors(value, index)
+
+    @property
+    def items_on_map(self):
+        return self.__dict__.get('_items_on_map')
+
+    @items_on_map.setter
+    def items_on_map(self, value):
+        # item lists are kept in a per-chunk index, like enemies in the occupancy index
+        index = self.__dict__.get('item_index')
+        if index is None:
+            index = self.__dict__['item_index'] = ChunkIndex()
+        self.__dict__['_items_on_map'] = bind_actors(value, index)
+
     def __init__(self, stdscr):
         print("⟳ Initializing Jedi Fugitive...")
         self.stdscr = stdscr
@@ -31,7 +65,10 @@ class GameManager:
         self.ui.init_colors()
         self.dialog = DialogueSystem()
         self.player = Player(0, 0)
+        self.occupancy = OccupancyIndex()
         self.enemies = []
+        self.item_index = ChunkIndex()
+        self.items_on_map = []
         self.game_map = []
         self.tomb_entrances = set()
         self.panels_ready = False
@@ -59,6 +96,21 @@ class GameManager:
         self.explored = set()
         # Fog of war toggle (on by default)
         self.fog_of_war = True
+        # FOV algorithm name (see fov.FOV_ALGORITHMS)
+        self.fov_algorithm = "shadowcast"
+        # (map, (x, y, radius, map revision, algorithm)) of the last FOV computation
+        self._visibility_cache = None
+        # World seed (None = pick one at generation) and optional world cache directory
+        self.world_seed = None
+        self.world_cache_dir = None
+        # builds tombs near the player in the background so entering one doesn't stall
+        self.tomb_prefetch = TombPrefetcher()
+        # per-panel dirty flags; abilities and messages redraw when their contents change
+        self.frame_scheduler = FrameScheduler(max_fps=MAX_FPS)
+        self.frame_scheduler.watch('abilities', lambda: tuple(id(a) for a in self.player.get_available_abilities() or ()))
+        self.frame_scheduler.watch('messages', lambda: (id(self.ui.messages), self.ui.messages.version))
+        # projectile animations in flight; advanced by the main loop between input polls
+        self.animations = AnimationQueue()
         print("✓ Game engine initialized")
 
         # defaults
@@ -83,6 +135,7 @@ class GameManager:
         self.last_size = (0, 0)
         self.layout = {}
         self.show_codex = False  # Toggle for Sith Codex display
+        self.show_minimap = False  # Toggle for the minimap overlay ('M')
         # default splash/instruction lines exposed to the command/help panel
         self.splash_instructions = [
             "═══════════════════ CONTROLS ═══════════════════",
@@ -261,6 +314,10 @@ class GameManager:
 
     def generate_world(self):
         print("⟳ Generating galaxy...")
+        try:
+            self.tomb_prefetch.clear()
+        except Exception:
+            pass
         try:
             map_features.generate_world(self)
             print("✓ World generated successfully")
@@ -292,6 +349,7 @@ class GameManager:
         # load item definitions and place them on the map (best-effort)
         try:
             self.items_on_map = getattr(self, "items_on_map", [])
+            rng = stage_rng(resolve_world_seed(self), 'item_defs')
             # scan package jedi_fugitive.items for item definitions
             try:
                 for finder, name, ispkg in pkgutil.iter_modules(importlib.import_module("jedi_fugitive.items").__path__):
@@ -303,6 +361,11 @@ class GameManager:
                             continue
                         # place one instance of each item on a random floor tile
                         for it in (defs if isinstance(defs, (list,tuple)) else [defs]):
+                            spot = self._random_floor_tile(rng, exclude=((getattr(self.player, "x", None), getattr(self.player, "y", None)),))
+                            if spot is not None:
+                                self.items_on_map.append({"x": spot[0], "y": spot[1], "item": it})
+                                continue
+                            # no floor index for this map: fall back to sampling
                             placed = False
                             attempts = 0
                             while not placed and attempts < 200:
@@ -312,8 +375,8 @@ class GameManager:
                                 mh = len(self.game_map); mw = len(self.game_map[0]) if mh else 0
                                 if mh == 0 or mw == 0:
                                     break
-                                rx = random.randrange(0, mw)
-                                ry = random.randrange(0, mh)
+                                rx = rng.randrange(0, mw)
+                                ry = rng.randrange(0, mh)
                                 floor_ch = getattr(Display, "FLOOR", ".")
                                 try:
                                     if self.game_map[ry][rx] == floor_ch and (rx,ry) != (getattr(self.player,"x",None), getattr(self.player,"y",None)):
@@ -338,20 +401,40 @@ class GameManager:
         self.initialize()
         self.generate_world()
         # main loop
+        scheduler = self.frame_scheduler
         while self.running:
-            # redraw
+            # step animations in flight; the map is redrawn when a bolt moved
+            if self.animations.advance():
+                scheduler.mark('map')
+            # redraw the panels that changed (at most max_fps frames per second)
+            if scheduler.frame_due():
+                try:
+                    self.draw()
+                except Exception:
+                    try: self.dump_debug_state()
+                    except Exception: pass
+            # input: block for a key, or only until a deferred frame or animation step is due
+            wait = scheduler.wait_ms()
+            anim_wait = self.animations.wait_ms()
+            if anim_wait is not None:
+                wait = anim_wait if wait is None else min(wait, anim_wait)
             try:
-                self.draw()
+                self.stdscr.timeout(-1 if wait is None else wait)
             except Exception:
-                try: self.dump_debug_state()
-                except Exception: pass
-            # input
+                pass
             try:
                 key = self.stdscr.getch()
+                if wait is not None:
+                    if key == -1:
+                        continue
+                    # menus and prompts opened by the handler read keys blocking
+                    self.stdscr.timeout(-1)
                 input_handler.handle_input(self, key)
             except Exception:
                 try: self.ui.messages.add("Input handler error.")
                 except Exception: pass
+            # a turn (or at least an input) happened: the map and stats may have changed
+            scheduler.mark('map', 'stats')
 
             # process game tick
             try:
@@ -439,11 +522,23 @@ class GameManager:
             except Exception:
                 pass
 
+            # age map popups by one turn
+            try:
+                self.ui.tick_popups()
+            except Exception:
+                pass
+
             try:
                 self.compute_visibility()
             except Exception:
                 pass
 
+            # start building tombs the player is approaching
+            try:
+                self.tomb_prefetch.update(self)
+            except Exception:
+                pass
+
             # handle resize
             try:
                 current_size = self.stdscr.getmaxyx()
@@ -456,12 +551,17 @@ class GameManager:
                         self.ui.create_layout(mw,mh,sw,aw,mhmsg,cmdh)
                     except Exception:
                         pass
+                    scheduler.mark_all()
                     try:
                         self.stdscr.clear(); self.stdscr.refresh()
                     except Exception:
                         pass
             except Exception:
                 pass
+        try:
+            self.tomb_prefetch.shutdown()
+        except Exception:
+            pass
 
     def register_command(self, key, handler, desc):
         try:
@@ -891,10 +991,18 @@ class GameManager:
         except Exception:
             pass
 
+    def animate_projectile(self, sx, sy, ex, ey, symbol='*', delay=0.03, color_pair=9):
+        """Queue a bolt animation from (sx,sy) to (ex,ey); never blocks the turn."""
+        try:
+            ui_renderer.animate_projectile(self, sx, sy, ex, ey, symbol=symbol, delay=delay, color_pair=color_pair)
+        except Exception:
+            pass
+
     def draw(self):
-        # prefer centralized renderer
+        # prefer centralized renderer; only panels flagged by the frame scheduler are redrawn
         try:
-            ui_renderer.draw(self)
+            scheduler = getattr(self, 'frame_scheduler', None)
+            ui_renderer.draw(self, scheduler.begin_frame() if scheduler is not None else None)
             return
         except Exception:
             pass
@@ -913,7 +1021,7 @@ class GameManager:
                     msgs = self.ui.messages
                     lines = []
                     if hasattr(msgs, "messages"):
-                        lines = msgs.messages[-6:]
+                        lines = list(msgs.messages)[-6:]
                     elif hasattr(msgs, "get_lines"):
                         lines = msgs.get_lines()[-6:]
                     for i, m in enumerate(lines):
@@ -1453,7 +1561,7 @@ class GameManager:
 
             # After moving: check for items to pick up automatically
             try:
-                for it in list(getattr(self, 'items_on_map', []) or []):
+                for it in items_at(self, nx, ny):
                     try:
                         if it.get('x') == nx and it.get('y') == ny:
                             # attempt to add to inventory
@@ -1964,6 +2072,8 @@ class GameManager:
                     if hasattr(self, 'surface_map') and self.surface_map is not None:
                         # restore surface state
                         self.game_map = self.surface_map
+                        self.explored = getattr(self, 'surface_explored', None)
+                        self.invalidate_visibility()
                         self.enemies = list(getattr(self, 'surface_enemies', []) or [])
                         self.items_on_map = list(getattr(self, 'surface_items_on_map', []) or [])
                         try:
@@ -1986,7 +2096,7 @@ class GameManager:
                             delattr = setattr
                         except Exception:
                             delattr = None
-                        for attr in ('tomb_levels', 'tomb_rooms', 'tomb_enemies', 'tomb_items', 'tomb_stairs', 'tomb_floor', 'tomb_stairs'):
+                        for attr in ('tomb_levels', 'tomb_rooms', 'tomb_enemies', 'tomb_items', 'tomb_stairs', 'tomb_floor', 'tomb_explored'):
                             try:
                                 if hasattr(self, attr):
                                     try: delattr(self, attr, None)
@@ -2020,6 +2130,11 @@ class GameManager:
                 next_stairs = getattr(self, 'tomb_stairs', [])[new] if getattr(self, 'tomb_stairs', None) else {}
                 # set new map
                 self.game_map = self.tomb_levels[new]
+                try:
+                    self.explored = self.tomb_explored[new]
+                except Exception:
+                    self.explored = None
+                self.invalidate_visibility()
                 self.tomb_floor = new
                 self.current_depth = new + 1
                 # place player at corresponding stair entrance on new floor
@@ -2104,6 +2219,10 @@ class GameManager:
     def go_up(self):
         return self.change_floor(-1)
 
+    def _fallback_enemy_speed(self, actor) -> float:
+        """Fallback-loop speed of `actor`: its speed scaled by the current enemy_update_fraction."""
+        return float(getattr(self, 'enemy_update_fraction', 0.33) or 0.33) * actor_speed(actor)
+
     def process_enemies(self):
         # Prefer dedicated enemy processing if available, else simple movement + projectiles step
         try:
@@ -2131,17 +2250,26 @@ class GameManager:
             mh = len(self.game_map); mw = len(self.game_map[0]) if mh else 0
             px = int(getattr(self.player, "x", 0)); py = int(getattr(self.player, "y", 0))
             new_positions = {}
+            field = flow_field(self)
             enemies = list(getattr(self, "enemies", []) or [])
             n = len(enemies)
             if n == 0:
                 return
-            # throttle enemy processing: only update a fraction each turn (round-robin)
+            # throttle enemy processing: each enemy acts at enemy_update_fraction of its speed,
+            # newcomers staggered over the turns in between so the work is spread out
             frac = float(getattr(self, 'enemy_update_fraction', 0.33) or 0.33)
-            per_tick = max(1, int(n * frac))
-            start_idx = int(getattr(self, '_enemy_update_index', 0) or 0)
-            for i in range(per_tick):
-                idx = (start_idx + i) % n
-                e = enemies[idx]
+            scheduler = getattr(self, '_fallback_scheduler', None)
+            if scheduler is None:
+                scheduler = self._fallback_scheduler = TurnScheduler(self._fallback_enemy_speed)
+            period = max(1, int(round(1.0 / frac)))
+            for i, e in enumerate(enemies):
+                if e not in scheduler:
+                    scheduler.schedule(e, scheduler.now + (i % period) * TICKS_PER_TURN)
+            live = {id(e) for e in enemies}
+            for e in scheduler.advance():
+                if id(e) not in live:
+                    scheduler.discard(e)
+                    continue
                 try:
                     if not getattr(e, "is_alive", lambda: True)():
                         continue
@@ -2163,8 +2291,14 @@ class GameManager:
                             dx = _sign(px - ex)
                             dy = _sign(py - ey)
 
+                            step = None
+                            if field is not None:
+                                step = field.step_toward(ex, ey, lambda x, y: (x, y) != (px, py) and not any(oe is not e for oe in occupants(self, x, y)))
+                            if step is not None:
+                                # walk the shared flow field around obstacles
+                                nx, ny = ex + step[0], ey + step[1]
                             # prefer the dominant axis for movement (simple greedy chase)
-                            if abs(px - ex) > abs(py - ey):
+                            elif abs(px - ex) > abs(py - ey):
                                 nx = ex + _sign(px - ex)
                                 ny = ey
                             elif abs(py - ey) > abs(px - ex):
@@ -2177,7 +2311,7 @@ class GameManager:
                             # validate destination and move if it's a floor tile and not occupied
                             try:
                                 if 0 <= ny < mh and 0 <= nx < mw and self.game_map[ny][nx] == floor_ch and (nx, ny) != (px, py):
-                                    occupied = any(getattr(oe, 'x', None) == nx and getattr(oe, 'y', None) == ny for oe in self.enemies if oe is not e)
+                                    occupied = any(oe is not e for oe in occupants(self, nx, ny))
                                     if not occupied:
                                         e.x = nx; e.y = ny
                                         moved = True
@@ -2191,11 +2325,6 @@ class GameManager:
                         new_positions[e] = (getattr(e,"x",ex), getattr(e,"y",ey))
                 except Exception:
                     continue
-            # advance start index for next tick
-            try:
-                self._enemy_update_index = (start_idx + per_tick) % n
-            except Exception:
-                self._enemy_update_index = 0
             # small chance to taunt / show message
             try:
                 if random.random() < 0.02 and getattr(self.ui, "messages", None):
@@ -2612,6 +2741,20 @@ class GameManager:
             except Exception:
                 pass
 
+    def _random_floor_tile(self, rng=random, biome=None, origin=None, min_dist=0, exclude=()):
+        """Random floor tile from the floor index of the current map, or None.
+
+        Returns None when the current map has no index (e.g. inside a tomb);
+        callers then fall back to sampling the map directly.
+        """
+        index = getattr(self, 'floor_index', None)
+        if index is None or index.game_map is not getattr(self, 'game_map', None):
+            return None
+        try:
+            return index.random_tile(rng, biome=biome, origin=origin, min_dist=min_dist, exclude=exclude)
+        except Exception:
+            return None
+
     def _respawn_enemies(self, count: int) -> int:
         """Spawn enemies at distant locations on the map. Returns number of enemies spawned."""
         spawned = 0
@@ -2628,11 +2771,15 @@ class GameManager:
             min_distance = 60  # Manhattan distance
             
             for _ in range(count):
-                # Try to find a valid spawn location
+                # Try to find a valid spawn location (one indexed pick, else rejection sampling)
+                spot = self._random_floor_tile(random, origin=(self.player.x, self.player.y), min_dist=min_distance)
                 attempts = 0
                 while attempts < 100:
-                    rx = random.randint(1, mw - 2)
-                    ry = random.randint(1, mh - 2)
+                    if spot is not None:
+                        rx, ry = spot
+                    else:
+                        rx = random.randint(1, mw - 2)
+                        ry = random.randint(1, mh - 2)
                     
                     # Check distance from player
                     dist_to_player = abs(rx - self.player.x) + abs(ry - self.player.y)
@@ -2677,6 +2824,7 @@ class GameManager:
                         spawned += 1
                         break
                     
+                    spot = None
                     attempts += 1
         except Exception:
             pass
@@ -2902,30 +3050,17 @@ class GameManager:
         except Exception:
             pass
 
+    def invalidate_visibility(self):
+        """Force the next compute_visibility() call to recompute the visible set.
+
+        Needed when `explored` is swapped for another level's bitmap: a cache
+        hit would return early without marking the visible tiles in it.
+        """
+        self._visibility_cache = None
+
     def compute_visibility(self):
         """Compute line-of-sight from player and update self.visible and self.explored."""
         try:
-            # local Bresenham implementation to avoid import cycles
-            def _bresenham_line(x0, y0, x1, y1):
-                x0 = int(x0); y0 = int(y0); x1 = int(x1); y1 = int(y1)
-                dx = abs(x1 - x0); sx = 1 if x0 < x1 else -1
-                dy = -abs(y1 - y0); sy = 1 if y0 < y1 else -1
-                err = dx + dy
-                x, y = x0, y0
-                while True:
-                    yield (x, y)
-                    if x == x1 and y == y1:
-                        break
-                    e2 = 2 * err
-                    if e2 >= dy:
-                        err += dy
-                        x += sx
-                    if e2 <= dx:
-                        err += dx
-                        y += sy
-
-            vis = set()
-            mh = len(self.game_map); mw = len(self.game_map[0]) if mh else 0
             px = int(getattr(self.player, "x", 0)); py = int(getattr(self.player, "y", 0))
             # Base LOS radius plus any temporary bonus from Force: Reveal
             radius = int(getattr(self.player, "los_radius", 6) or 6)
@@ -2944,45 +3079,45 @@ class GameManager:
             else:
                 max_ray = radius
 
-            # blocking tile set (tile itself can be visible). All non-floor, non-wreckage tiles block line-of-sight
-            floor_ch = getattr(Display, "FLOOR", ".")
-            wreckage_ch = getattr(Display, "WRECKAGE", "x")
-            for ty in range(max(0, py - max_ray), min(mh, py + max_ray + 1)):
-                for tx in range(max(0, px - max_ray), min(mw, px + max_ray + 1)):
-                    dx = tx - px; dy = ty - py
-                    # limit candidate tiles to the configured effective ray distance
-                    if dx*dx + dy*dy > max_ray*max_ray:
-                        continue
-                    blocked = False
+            # Reuse the last result when neither the viewpoint nor the map changed.
+            # TileGrid maps bump `revision` on every tile write (pickups, drops,
+            # tree clearing...); plain list maps have no revision and are never cached.
+            algorithm = getattr(self, 'fov_algorithm', 'shadowcast')
+            revision = getattr(self.game_map, 'revision', None)
+            key = (px, py, max_ray, revision, algorithm)
+            cached = getattr(self, '_visibility_cache', None)
+            if revision is not None and cached is not None and cached[0] is self.game_map and cached[1] == key:
+                return self.visible
+
+            # shadowcasting by default; see fov.FOV_ALGORITHMS for alternatives
+            vis = fov.compute_fov(self.game_map, px, py, max_ray, algorithm=algorithm)
+            self._visibility_cache = (self.game_map, key)
+            # chunked surface layers: keep only the chunks around the player decompressed
+            for layer in (self.game_map, getattr(self, 'map_biomes', None)):
+                stream = getattr(layer, 'stream_around', None)
+                if stream is not None:
                     try:
-                        for lx, ly in _bresenham_line(px, py, tx, ty):
-                            if lx == px and ly == py:
-                                continue
-                            if not (0 <= ly < mh and 0 <= lx < mw):
-                                blocked = True
-                                break
-                            ch = self.game_map[ly][lx]
-                            # if blocking tile is the target tile, show it; otherwise block further tiles
-                            # All non-floor, non-wreckage, non-special tiles block line-of-sight
-                            if ch not in (floor_ch, wreckage_ch, 'O', 'L', '?', '!', '@', '$', '%', '&', '*', 'C', 'S', 'M', 'r'):
-                                if (lx, ly) == (tx, ty):
-                                    # target is blocking but visible
-                                    blocked = False
-                                else:
-                                    blocked = True
-                                break
+                        stream(px, py)
                     except Exception:
-                        blocked = True
-                    if not blocked:
-                        vis.add((tx, ty))
+                        pass
             # update manager visibility and exploration
             self.visible = vis
-            if not getattr(self, "explored", None):
-                self.explored = set()
-            try:
-                self.explored |= vis
+            # exploration is a per-level bitmap sized to the current map; a legacy
+            # set (or a mask left over from another map) is folded into a fresh one
+            explored = getattr(self, "explored", None)
+            if not isinstance(explored, TileMask) or not explored.matches(self.game_map):
+                explored = TileMask.for_map(self.game_map, explored if isinstance(explored, set) else ())
+                self.explored = explored
+            added = explored.update(vis)
+            # keep the minimap's low-resolution summary in step with exploration
+            try:
+                summary = getattr(self, 'minimap', None)
+                if summary is not None and summary.mask is explored and summary.matches(self.game_map):
+                    summary.note_explored(self.game_map, added)
+                else:
+                    minimap_summary(self)
             except Exception:
-                self.explored = set(self.explored) | vis
+                pass
             # Update current biome
             try:
                 if hasattr(self, 'map_biomes') and self.map_biomes:
@@ -390,6 +390,16 @@ def handle_input(game, key):
             except Exception: pass
             return
 
+        if key == ord('M'):
+            game.show_minimap = not getattr(game, "show_minimap", False)
+            try:
+                if game.show_minimap:
+                    game.ui.messages.add("Minimap opened. Press 'M' again to close.")
+                else:
+                    game.ui.messages.add("Minimap closed.")
+            except Exception: pass
+            return
+
         # Help screen
         if key == ord('?'):
             try:
@@ -426,6 +436,7 @@ def handle_input(game, key):
                     "  i = Inventory (view/manage items)",
                     "  @ = Character sheet (stats & abilities)",
                     "  v = Sith Codex (lore & discoveries)",
+                    "  M = Minimap (explored terrain, tombs, ship)",
                     "",
                     "CRAFTING & EQUIPMENT:",
                     "  C = Crafting Bench (upgrade weapons, craft items)",
@@ -1,5 +1,6 @@
 from typing import List, Tuple
 from jedi_fugitive.game.enemy import Enemy, EnemyType
+from jedi_fugitive.game.tile_grid import TileGrid
 import random
 
 class Display:
@@ -62,7 +63,7 @@ def place_items(game_map: List[List[str]], rooms: List[Tuple[int,int,int,int]],
                     game_map[y][x] = random.choices(list(item_chances.keys()), weights=list(item_chances.values()))[0]
 
 def generate_dungeon_level(depth: int, width: int = 80, height: int = 24):
-    game_map = [[Display.WALL for _ in range(width)] for _ in range(height)]
+    game_map = TileGrid(width, height, Display.WALL)
     rooms = []
     for _ in range(random.randint(5,8)):
         rw = random.randint(6,12); rh = random.randint(4,8)
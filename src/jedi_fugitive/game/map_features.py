@@ -1,4 +1,8 @@
 from jedi_fugitive.game.level import Display, generate_crash_site, generate_dungeon_level, place_items
+from jedi_fugitive.game.floor_index import FloorIndex
+from jedi_fugitive.game.tile_grid import TileGrid, TileMask
+from jedi_fugitive.game.world_chunks import ChunkedTileGrid, tile_positions
+from jedi_fugitive.game.world_seed import WorldCache, reseed_stage, resolve_world_seed, seeded_global_random
 import random
 import traceback
 import sys
@@ -6,9 +10,207 @@ from jedi_fugitive.game.enemy import Enemy, EnemyPersonality, EnemyType
 from jedi_fugitive.game.sith_codex import SITH_LORE
 from jedi_fugitive.game import enemies_sith as sith
 
+BIOME_TYPES = ['forest', 'desert', 'rocky', 'plains', 'river', 'mountain_pass']
+
+# candidate tiles sampled per tomb; the one farthest from earlier tombs wins
+TOMB_CANDIDATES = 24
+
+
+def _prefix_limit(a, b, c, strict):
+    """Largest x with c + |x-a| - |x-b| < 0 (or <= 0 when not strict), for a < b.
+
+    The left side is non-decreasing in x, so the solutions form a prefix.
+    Returns None when no x qualifies and a huge value when every x does.
+    """
+    span = b - a
+    v = -c
+    if strict:
+        if v <= -span:
+            return None
+        if v > span:
+            return 1 << 60
+        return (a + b + v - 1) // 2
+    if v < -span:
+        return None
+    if v >= span:
+        return 1 << 60
+    return (a + b + v) // 2
+
+
+def assign_biomes(width, height, centers, default='plains', x0=0, y0=0):
+    """Assign each tile the biome of its nearest center (Manhattan distance).
+
+    The result covers the window starting at world coordinates (x0, y0), so
+    the same centers can be evaluated one chunk at a time.
+
+    Ties go to the earlier center, matching a brute-force scan. Rather than
+    comparing every tile against every center, each row is split into at
+    most one interval per center: along a row, center i beats center j on a
+    prefix or suffix of x, so i's cells are the intersection of those
+    half-lines. Rows are then filled with slice writes into a TileGrid whose
+    palette holds the biome names (one byte per tile).
+    """
+    grid = TileGrid(width, height, default)
+    for b in BIOME_TYPES:
+        grid.code_for(b)
+    if not centers or width <= 0 or height <= 0:
+        return grid
+    data = grid.data
+    codes = [grid.code_for(b or default) for (_cx, _cy, b) in centers]
+    centers = [(cx - x0, cy - y0, b) for (cx, cy, b) in centers]
+    n = len(centers)
+    for y in range(height):
+        ky = [abs(cy - y) for (_cx, cy, _b) in centers]
+        base = y * width
+        for i in range(n):
+            ai = centers[i][0]
+            lo, hi = 0, width - 1
+            for j in range(n):
+                if j == i:
+                    continue
+                aj = centers[j][0]
+                c = ky[i] - ky[j]
+                strict = j < i
+                if ai == aj:
+                    if c < 0 or (c == 0 and not strict):
+                        continue
+                    lo, hi = 1, 0
+                    break
+                if ai < aj:
+                    lim = _prefix_limit(ai, aj, c, strict)
+                    if lim is None:
+                        lo, hi = 1, 0
+                        break
+                    hi = min(hi, lim)
+                else:
+                    # mirror x -> -x so the winning set becomes a prefix again
+                    lim = _prefix_limit(-ai, -aj, c, strict)
+                    if lim is None:
+                        lo, hi = 1, 0
+                        break
+                    lo = max(lo, -lim)
+                if lo > hi:
+                    break
+            if lo <= hi:
+                data[base + lo:base + hi + 1] = bytes((codes[i],)) * (hi - lo + 1)
+    grid.revision += 1
+    return grid
+
+
+class BiomeChunkGenerator:
+    """Picklable `ChunkedTileGrid` generator that fills chunks with `assign_biomes`."""
+
+    def __init__(self, centers, default='plains'):
+        self.centers = list(centers)
+        self.default = default
+
+    def __call__(self, x0, y0, w, h):
+        return assign_biomes(w, h, self.centers, default=self.default, x0=x0, y0=y0)
+
+
+def expand_walkable(game_map, bbox, expansion, base_chance=1.0, exclude=None, floor_ch='.', wall_ch='#', rng=random):
+    """Grow the floor area around existing floor tiles inside `bbox`.
+
+    A multi-source BFS computes the Manhattan distance from every tile within
+    `expansion` of a floor tile (floor tiles within 1 of `exclude` are not
+    sources). Each wall tile is then visited once, in row-major order, and
+    becomes floor with probability base_chance * (1 - d / (expansion + 1)).
+    The result only depends on `rng`, so it is reproducible under a seed.
+    """
+    mh = len(game_map)
+    mw = len(game_map[0]) if mh else 0
+    bx, by, bw, bh = bbox
+    x0 = max(0, bx - expansion); y0 = max(0, by - expansion)
+    x1 = min(mw, bx + bw + expansion); y1 = min(mh, by + bh + expansion)
+    fw = x1 - x0; fh = y1 - y0
+    if fw <= 0 or fh <= 0:
+        return 0
+    unreached = expansion + 1
+    dist = [unreached] * (fw * fh)
+    frontier = []
+    for y in range(max(0, by), min(mh, by + bh)):
+        row = game_map[y]
+        for x in range(max(0, bx), min(mw, bx + bw)):
+            if row[x] != floor_ch:
+                continue
+            if exclude is not None and abs(x - exclude[0]) + abs(y - exclude[1]) <= 1:
+                continue
+            i = (y - y0) * fw + (x - x0)
+            dist[i] = 0
+            frontier.append(i)
+    # BFS on an obstacle-free 4-connected grid yields exact Manhattan distance
+    d = 0
+    while frontier and d < expansion:
+        d += 1
+        nxt = []
+        for i in frontier:
+            fx = i % fw
+            for j, ok in ((i - 1, fx > 0), (i + 1, fx < fw - 1), (i - fw, i >= fw), (i + fw, i + fw < fw * fh)):
+                if ok and dist[j] == unreached:
+                    dist[j] = d
+                    nxt.append(j)
+        frontier = nxt
+    scale = float(max(1, expansion + 1))
+    converted = 0
+    for y in range(y0, y1):
+        row = game_map[y]
+        base = (y - y0) * fw
+        for x in range(x0, x1):
+            d = dist[base + x - x0]
+            if d == 0 or d == unreached or row[x] != wall_ch:
+                continue
+            if rng.random() < base_chance * max(0.0, 1.0 - d / scale):
+                row[x] = floor_ch
+                converted += 1
+    return converted
+
+
+def index_floor(game):
+    """(Re)build `game.floor_index` for the surface map and attach it to map writes."""
+    try:
+        old = getattr(game, 'floor_index', None)
+        if old is not None:
+            old.detach()
+    except Exception:
+        pass
+    game.floor_index = FloorIndex.build(game.game_map, getattr(game, 'map_biomes', None),
+                                        getattr(Display, 'FLOOR', '.'))
+    return game.floor_index
+
+
 def generate_world(game):
-    """Generate crash site map, scale it, place fewer trees, spawn enemies and place items/tomb entrances."""
+    """Generate crash site map, scale it, place fewer trees, spawn enemies and place items/tomb entrances.
+
+    Generation is deterministic for a given `game.world_seed` (chosen at
+    random when unset). When a world cache is configured the result is
+    stored there and later generations with the same seed and parameters
+    load it instead of regenerating.
+    """
+    seed = resolve_world_seed(game)
+    cache = WorldCache.for_game(game)
+    if cache is not None and cache.load_into(game, seed):
+        try:
+            index_floor(game)
+        except Exception:
+            game.floor_index = None
+        try:
+            game.compute_visibility()
+        except Exception:
+            pass
+        return
+    state = random.getstate()
+    try:
+        _generate_world_stages(game, seed)
+    finally:
+        random.setstate(state)
+    if cache is not None and getattr(game, 'game_map', None):
+        cache.store(game, seed)
+
+
+def _generate_world_stages(game, seed):
+    """Run every generation stage; each stage reseeds the global RNG from `seed`."""
     try:
+        reseed_stage(seed, 'crash_site')
         from jedi_fugitive.game.sith_codex import get_random_loading_message
         print(get_random_loading_message())
         # allow a configurable inflation of the base crash-site size (adds N to width/height)
@@ -25,6 +227,7 @@ def generate_world(game):
         return
 
     # create a larger surface map but keep the crash_site clearing unchanged
+    reseed_stage(seed, 'surface')
     try:
         outer_scale = int(getattr(game, 'outer_map_scale', 25) or 25)
         try:
@@ -39,8 +242,9 @@ def generate_world(game):
         new_h = max(h, h * outer_scale)
         new_w = max(w, w * outer_scale)
 
-        # initialize a big canvas filled with walls
-        big = [[getattr(Display, 'WALL', '#') for _ in range(new_w)] for _ in range(new_h)]
+        # initialize a big canvas of walls; chunks are only stored once written,
+        # so memory follows the carved-out area rather than the map size
+        big = ChunkedTileGrid(new_w, new_h, getattr(Display, 'WALL', '#'))
 
         # compute offsets to center the crash site on the big map
         off_y = (new_h - h) // 2
@@ -48,11 +252,10 @@ def generate_world(game):
 
         # paste crash site into the center of big canvas
         for yy in range(h):
-            for xx in range(w):
-                try:
-                    big[off_y + yy][off_x + xx] = cm[yy][xx]
-                except Exception:
-                    continue
+            try:
+                big.paste_row(off_x, off_y + yy, cm[yy])
+            except Exception:
+                continue
 
         game.game_map = big
         # Expand the pasted crash clearing outward so the walkable area scales
@@ -67,34 +270,10 @@ def generate_world(game):
             mw_big = len(game.game_map[0]) if mh_big else 0
             if walkable_expansion > 0 and mh_big and mw_big:
                 base_chance = float(getattr(game, 'walkable_expansion_base_chance', 1.0))
-                floor_positions = [(x, y) for y in range(mh_big) for x in range(mw_big) if game.game_map[y][x] == floor_ch]
-                random.shuffle(floor_positions)
-                for (fx, fy) in floor_positions:
-                    try:
-                        if abs(fx - getattr(game.player, 'x', 0)) + abs(fy - getattr(game.player, 'y', 0)) <= 1:
-                            continue
-                    except Exception:
-                        pass
-                    for ddx in range(-walkable_expansion, walkable_expansion + 1):
-                        for ddy in range(-walkable_expansion, walkable_expansion + 1):
-                            tx = fx + ddx
-                            ty = fy + ddy
-                            if tx < 0 or ty < 0 or ty >= mh_big or tx >= mw_big:
-                                continue
-                            try:
-                                if game.game_map[ty][tx] != wall_ch:
-                                    continue
-                            except Exception:
-                                continue
-                            dist = abs(ddx) + abs(ddy)
-                            if dist == 0:
-                                continue
-                            prob = base_chance * max(0.0, 1.0 - (dist / float(max(1, walkable_expansion + 1))))
-                            if random.random() < prob:
-                                try:
-                                    game.game_map[ty][tx] = floor_ch
-                                except Exception:
-                                    pass
+                # floor only exists inside the pasted crash site at this point
+                expand_walkable(game.game_map, (off_x, off_y, w, h), walkable_expansion, base_chance,
+                                exclude=(getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)),
+                                floor_ch=floor_ch, wall_ch=wall_ch)
         except Exception:
             pass
 
@@ -110,6 +289,7 @@ def generate_world(game):
         scaled_rooms = rooms or []
 
     # Center player on wreckage
+    reseed_stage(seed, 'player_start')
     try:
         start = scaled_rooms[0] if scaled_rooms else (0, 0, len(game.game_map[0]), len(game.game_map))
         cx = start[0] + start[2] // 2
@@ -155,32 +335,27 @@ def generate_world(game):
         game.player.y = 1
 
     # generate simple biome regions across the larger map: assign each tile a biome
+    reseed_stage(seed, 'biomes')
     try:
         mh = len(game.game_map)
         mw = len(game.game_map[0]) if mh else 0
-        biome_types = ['forest', 'desert', 'rocky', 'plains', 'river', 'mountain_pass']
+        biome_types = BIOME_TYPES
         centers = []
         for _b in range(min(12, max(6, mw * mh // 4000) + 6)):
             cx = random.randint(0, max(0, mw - 1))
             cy = random.randint(0, max(0, mh - 1))
             b = random.choice(biome_types)
             centers.append((cx, cy, b))
-        biome_map = [[None for _ in range(mw)] for _ in range(mh)]
-        for y in range(mh):
-            for x in range(mw):
-                best = None
-                bdist = None
-                for (cx, cy, b) in centers:
-                    d = abs(cx - x) + abs(cy - y)
-                    if bdist is None or d < bdist:
-                        bdist = d
-                        best = b
-                biome_map[y][x] = best or 'plains'
-        game.map_biomes = biome_map
+        # compact biome grid (one byte per tile, biome names in the palette),
+        # generated chunk by chunk the first time each chunk is looked at
+        game.map_biomes = ChunkedTileGrid(
+            mw, mh, 'plains',
+            generator=BiomeChunkGenerator(centers))
     except Exception:
         game.map_biomes = None
 
     # Place terrain features (trees, rocks) with biome-specific densities
+    reseed_stage(seed, 'terrain')
     try:
         tree_char = getattr(Display, "TREE", "T")
         rock_char = getattr(Display, "ROCK", 'r')
@@ -197,22 +372,16 @@ def generate_world(game):
         desert_rock_density = float(getattr(game, 'desert_rock_density', 0.08) or 0.08)
 
         candidates_by_biome = {'forest': [], 'plains': [], 'rocky': [], 'desert': [], 'river': [], 'mountain_pass': []}
-        for y in range(mh):
-            for x in range(mw):
-                try:
-                    if game.game_map[y][x] != floor:
-                        continue
-                except Exception:
-                    continue
+        for (x, y) in tile_positions(game.game_map, floor):
+            b = None
+            try:
+                if getattr(game, 'map_biomes', None):
+                    b = game.map_biomes[y][x]
+            except Exception:
                 b = None
-                try:
-                    if getattr(game, 'map_biomes', None):
-                        b = game.map_biomes[y][x]
-                except Exception:
-                    b = None
-                if b not in candidates_by_biome:
-                    b = 'plains'
-                candidates_by_biome[b].append((x, y))
+            if b not in candidates_by_biome:
+                b = 'plains'
+            candidates_by_biome[b].append((x, y))
 
         player_clear_radius = int(getattr(game, 'player_clear_radius', 12))
 
@@ -381,6 +550,7 @@ def generate_world(game):
         pass
 
     # Place richer landmarks and POIs across the larger surface map (increased count)
+    reseed_stage(seed, 'landmarks')
     try:
         if not hasattr(game, 'map_landmarks') or not isinstance(getattr(game, 'map_landmarks', None), dict):
             game.map_landmarks = {}
@@ -533,6 +703,7 @@ def generate_world(game):
         pass
 
     # Decorative POIs
+    reseed_stage(seed, 'decor')
     try:
         mh = len(game.game_map)
         mw = len(game.game_map[0]) if mh else 0
@@ -558,6 +729,7 @@ def generate_world(game):
         pass
 
     # Spawn enemies
+    reseed_stage(seed, 'enemies')
     try:
         game.enemies = list(getattr(game, 'enemies', []) or [])
         mh = len(game.game_map)
@@ -580,7 +752,7 @@ def generate_world(game):
             
             for i in range(crash_guard_count):
                 try:
-                    g = sith.create_sith_warrior(level=max(1, getattr(game.player, 'level', 1)), x=0, y=0)
+                    g = sith.create_sith_warrior(level=player_level, x=0, y=0)
                     
                     # Try to place away from player
                     attempts = 0
@@ -693,7 +865,14 @@ def generate_world(game):
     except Exception:
         pass
 
+    # Index floor tiles by biome and region for the placement stages below
+    try:
+        index_floor(game)
+    except Exception:
+        game.floor_index = None
+
     # Place items
+    reseed_stage(seed, 'items')
     try:
         mh = len(game.game_map)
         mw = len(game.game_map[0]) if mh else 0
@@ -713,12 +892,24 @@ def generate_world(game):
         game.items_on_map = getattr(game, "items_on_map", []) or []
         placed = 0
         max_items = max(1, min(12, (mw * mh) // 400))
-        while placed < max_items and attempts < max_items * 200:
-            attempts += 1
-            rx = random.randrange(0, mw)
-            ry = random.randrange(0, mh)
+        player_pos = (game.player.x, game.player.y)
+        index = getattr(game, 'floor_index', None)
+        attempts = 0
+        while placed < max_items:
+            if index is not None:
+                spot = index.random_tile(random, exclude=(player_pos,))
+                if spot is None:
+                    break
+                rx, ry = spot
+            else:
+                # no index: rejection-sample the map like before
+                if attempts >= max_items * 200:
+                    break
+                attempts += 1
+                rx = random.randrange(0, mw)
+                ry = random.randrange(0, mh)
             try:
-                if game.game_map[ry][rx] == floor and (rx, ry) != (game.player.x, game.player.y):
+                if game.game_map[ry][rx] == floor and (rx, ry) != player_pos:
                     token = random.choice(tokens)
                     game.game_map[ry][rx] = token
                     try:
@@ -735,65 +926,33 @@ def generate_world(game):
         pass
 
     # Place one tomb per biome type
+    reseed_stage(seed, 'tombs')
     try:
         game.tomb_entrances = set()
         mh = len(game.game_map)
         mw = len(game.game_map[0]) if mh else 0
         floor = getattr(Display, 'FLOOR', '.')
 
-        # Get available biomes from the biome map
-        available_biomes = set()
-        if hasattr(game, 'map_biomes') and game.map_biomes:
-            for y in range(mh):
-                for x in range(mw):
-                    biome = game.map_biomes[y][x]
-                    if biome:
-                        available_biomes.add(biome)
-
         # Place one tomb per biome
         biome_types = ['forest', 'desert', 'rocky', 'plains', 'river', 'mountain_pass']
         placed_tombs = []
+        player_clear_radius = int(getattr(game, 'player_clear_radius', 15))
+        px, py = game.player.x, game.player.y
 
         for biome in biome_types:
-            if biome not in available_biomes:
-                continue
-
-            # Find all floor tiles in this biome
-            biome_floor_tiles = []
-            for y in range(mh):
-                for x in range(mw):
-                    if (game.game_map[y][x] == floor and
-                        hasattr(game, 'map_biomes') and game.map_biomes and
-                        game.map_biomes[y][x] == biome):
-                        biome_floor_tiles.append((x, y))
-
-            if not biome_floor_tiles:
-                continue
-
-            # Remove tiles too close to player start
-            player_clear_radius = int(getattr(game, 'player_clear_radius', 15))
-            px, py = game.player.x, game.player.y
-            biome_floor_tiles = [(x, y) for x, y in biome_floor_tiles
-                               if abs(x - px) + abs(y - py) > player_clear_radius]
-
-            if not biome_floor_tiles:
-                continue
-
-            # Choose a random tile in this biome, preferring ones far from other tombs
-            random.shuffle(biome_floor_tiles)
+            # Sample candidate floor tiles in this biome away from the player start
+            # and keep the one farthest from the tombs placed so far
             best_tile = None
-            best_min_dist = 0
-
-            for tile_x, tile_y in biome_floor_tiles:
-                min_dist = float('inf')
-                for placed_x, placed_y in placed_tombs:
-                    dist = abs(tile_x - placed_x) + abs(tile_y - placed_y)
-                    min_dist = min(min_dist, dist)
-
-                # If no tombs placed yet, or this is farther than current best
-                if not placed_tombs or min_dist > best_min_dist:
+            best_min_dist = -1
+            for _c in range(TOMB_CANDIDATES if placed_tombs else 1):
+                tile = game.floor_index.random_tile(random, biome=biome, origin=(px, py),
+                                                    min_dist=player_clear_radius)
+                if tile is None:
+                    break
+                min_dist = min((abs(tile[0] - tx) + abs(tile[1] - ty) for tx, ty in placed_tombs), default=0)
+                if min_dist > best_min_dist:
                     best_min_dist = min_dist
-                    best_tile = (tile_x, tile_y)
+                    best_tile = tile
 
             if best_tile:
                 placed_tombs.append(best_tile)
@@ -823,6 +982,7 @@ def generate_world(game):
             pass
 
     # Place random Sith lore POIs
+    reseed_stage(seed, 'lore')
     try:
         if not hasattr(game, 'map_landmarks') or not isinstance(getattr(game, 'map_landmarks', None), dict):
             game.map_landmarks = {}
@@ -854,22 +1014,19 @@ def generate_world(game):
         existing_positions = set(game.map_landmarks.keys()) if game.map_landmarks else set()
         existing_positions.update(game.tomb_entrances)
 
-        floor_tiles = [(x, y) for y in range(mh) for x in range(mw)
-                      if game.game_map[y][x] == floor and (x, y) not in existing_positions]
-
-        # Remove tiles too close to player start
+        # Keep lore away from the player start
         player_clear_radius = int(getattr(game, 'player_clear_radius', 40))
         px, py = game.player.x, game.player.y
-        floor_tiles = [(x, y) for x, y in floor_tiles if abs(x - px) + abs(y - py) > player_clear_radius]
-
-        random.shuffle(floor_tiles)
 
         placed_lore = 0
         lore_index = 0
 
-        for tile_x, tile_y in floor_tiles:
-            if placed_lore >= lore_poi_count or lore_index >= len(all_lore_entries):
+        while placed_lore < lore_poi_count and lore_index < len(all_lore_entries):
+            spot = game.floor_index.random_tile(random, origin=(px, py), min_dist=player_clear_radius,
+                                                exclude=existing_positions)
+            if spot is None:
                 break
+            tile_x, tile_y = spot
 
             # Get lore entry
             category, entry_id, entry_data = all_lore_entries[lore_index]
@@ -907,6 +1064,7 @@ def generate_world(game):
         pass
 
     # Place ship and comms
+    reseed_stage(seed, 'ship_comms')
     try:
         ship_ch = getattr(Display, 'SHIP', 'S')
         comms_ch = getattr(Display, 'COMMS', 'C')
@@ -964,6 +1122,7 @@ def generate_world(game):
         pass
 
     # Add directional hints
+    reseed_stage(seed, 'hints')
     try:
         if getattr(game, 'map_landmarks', None) and getattr(game, 'tomb_entrances', None):
             def _dir_from_dxdy(dx, dy):
@@ -1014,34 +1173,35 @@ def generate_world(game):
     except Exception:
         pass
 
-def enter_tomb(game):
-    """Enter a tomb: save surface state, generate dungeon levels, and descend."""
-    try:
-        # Check if player is on a tomb entrance
-        px, py = getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)
-        if (px, py) not in getattr(game, 'tomb_entrances', set()):
-            return False
+def build_tomb(game, tx, ty):
+    """Generate the dungeon levels for the tomb entrance at (tx, ty) of `game`'s world."""
+    level = max(1, int(getattr(game.player, 'level', 1) or 1))
+    return build_tomb_levels(resolve_world_seed(game), tx, ty, level)
 
-        # Save surface state
-        game.surface_map = game.game_map
-        game.surface_enemies = list(getattr(game, 'enemies', []))
-        game.surface_items_on_map = list(getattr(game, 'items_on_map', []))
-        game.surface_player_pos = (px, py)
-        game.surface_los_radius = getattr(game.player, 'los_radius', 6)
 
+def build_tomb_levels(seed, tx, ty, player_level=1):
+    """Generate the dungeon levels for the tomb entrance at (tx, ty).
+
+    Returns a dict with per-level 'levels', 'rooms', 'enemies', 'items' and
+    'stairs' lists. The tomb is drawn from its own stream of the world seed,
+    so the same entrance always yields the same tomb; the global random
+    state is left as it was. Only plain arguments are needed, so this can
+    run in a worker process (see tomb_prefetch).
+    """
+    with seeded_global_random(seed, 'tomb', tx, ty):
         # Generate dungeon levels (3-5 levels)
         num_levels = random.randint(3, 5)
-        game.tomb_levels = []
-        game.tomb_rooms = []
-        game.tomb_enemies = []
-        game.tomb_items = []
-        game.tomb_stairs = []
+        tomb_levels = []
+        tomb_rooms = []
+        tomb_enemies = []
+        tomb_items = []
+        tomb_stairs = []
 
         for depth in range(1, num_levels + 1):
             # Generate level
             level_map, rooms = generate_dungeon_level(depth)
-            game.tomb_levels.append(level_map)
-            game.tomb_rooms.append(rooms)
+            tomb_levels.append(level_map)
+            tomb_rooms.append(rooms)
 
             # Find stairs positions
             stairs = {}
@@ -1051,7 +1211,7 @@ def enter_tomb(game):
                         stairs['up'] = (x, y)
                     elif level_map[y][x] == Display.STAIRS_DOWN:
                         stairs['down'] = (x, y)
-            game.tomb_stairs.append(stairs)
+            tomb_stairs.append(stairs)
 
             # Generate enemies for this level
             level_enemies = []
@@ -1064,19 +1224,19 @@ def enter_tomb(game):
                     if level_map[ey][ex] == Display.FLOOR:
                         # Create appropriate enemy for depth
                         if depth == 1:
-                            enemy = sith.create_sith_trooper(level=max(1, getattr(game.player, 'level', 1)))
+                            enemy = sith.create_sith_trooper(level=player_level)
                         elif depth == 2:
-                            enemy = sith.create_sith_acolyte(level=max(1, getattr(game.player, 'level', 1) + 1))
+                            enemy = sith.create_sith_acolyte(level=player_level + 1)
                         else:
-                            enemy = sith.create_sith_warrior(level=max(1, getattr(game.player, 'level', 1) + depth - 1))
+                            enemy = sith.create_sith_warrior(level=player_level + depth - 1)
                         enemy.x, enemy.y = ex, ey
                         level_enemies.append(enemy)
-            game.tomb_enemies.append(level_enemies)
+            tomb_enemies.append(level_enemies)
 
             # Generate items for this level
             level_items = []
             place_items(level_map, rooms, depth)
-            
+        
             # Place corrupted Jedi Artifact on the final level
             if depth == num_levels and rooms:
                 from jedi_fugitive.items.tokens import TOKEN_MAP
@@ -1095,7 +1255,7 @@ def enter_tomb(game):
                     'quest': True
                 }
                 level_items.append(artifact_entry)
-            
+        
             # Convert map items to item objects
             for y in range(len(level_map)):
                 for x in range(len(level_map[0])):
@@ -1111,7 +1271,39 @@ def enter_tomb(game):
                             'effect': token_info.get('effect', '')
                         }
                         level_items.append(item_entry)
-            game.tomb_items.append(level_items)
+            tomb_items.append(level_items)
+    return {'levels': tomb_levels, 'rooms': tomb_rooms, 'enemies': tomb_enemies, 'items': tomb_items,
+            'stairs': tomb_stairs}
+
+
+def enter_tomb(game):
+    """Enter a tomb: save surface state, generate dungeon levels, and descend."""
+    try:
+        # Check if player is on a tomb entrance
+        px, py = getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)
+        if (px, py) not in getattr(game, 'tomb_entrances', set()):
+            return False
+
+        # Save surface state
+        game.surface_map = game.game_map
+        game.surface_explored = getattr(game, 'explored', None)
+        game.surface_enemies = list(getattr(game, 'enemies', []))
+        game.surface_items_on_map = list(getattr(game, 'items_on_map', []))
+        game.surface_player_pos = (px, py)
+        game.surface_los_radius = getattr(game.player, 'los_radius', 6)
+
+        # Generate dungeon levels (3-5 levels), unless they were built in the background
+        tomb = None
+        prefetch = getattr(game, 'tomb_prefetch', None)
+        if prefetch is not None:
+            tomb = prefetch.take(game, px, py)
+        if tomb is None:
+            tomb = build_tomb(game, px, py)
+        game.tomb_levels = tomb['levels']
+        game.tomb_rooms = tomb['rooms']
+        game.tomb_enemies = tomb['enemies']
+        game.tomb_items = tomb['items']
+        game.tomb_stairs = tomb['stairs']
 
         # Set initial tomb state
         game.tomb_floor = 0
@@ -1127,10 +1319,18 @@ def enter_tomb(game):
             game.player.x = first_room[0] + first_room[2] // 2
             game.player.y = first_room[1] + first_room[3] // 2
 
-        # Load first level
+        # Load first level (each tomb level keeps its own exploration bitmap)
+        game.tomb_explored = [TileMask.for_map(level) for level in game.tomb_levels]
         game.game_map = game.tomb_levels[0]
+        game.explored = game.tomb_explored[0]
+        try:
+            game.invalidate_visibility()
+        except Exception:
+            pass
         game.enemies = game.tomb_enemies[0]
+        game.tomb_enemies[0] = game.enemies   # keep the floor list shared with the live one
         game.items_on_map = game.tomb_items[0]
+        game.tomb_items[0] = game.items_on_map
 
         # Reduce LOS in dungeon
         game.player.los_radius = max(3, getattr(game.player, 'los_radius', 6) - 2)
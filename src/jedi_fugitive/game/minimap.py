@@ -0,0 +1,154 @@
+"""Low-resolution summary of explored terrain for the minimap overlay.
+
+Surface maps can be thousands of tiles across, so the minimap is never
+built by scanning the map. A `MinimapSummary` divides the map into blocks
+small enough that the whole map fits in about `MAX_COLS` x `MAX_ROWS`
+cells and counts, per block, how many explored tiles are open ground and
+how many are obstacles. `compute_visibility` feeds it the tiles that
+become explored each turn, so opening the minimap only reads the summary
+plus the handful of known points of interest (tombs, ship, comms,
+landmarks).
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_COLS = 96
+MAX_ROWS = 32
+
+# tiles counted as obstacles on the minimap (the rest is open ground)
+BLOCKING = frozenset(('#', '~', 'r', 'T'))
+
+# minimap cell kinds
+UNKNOWN, OPEN, BLOCKED = 0, 1, 2
+
+
+class MinimapSummary:
+    """Per-block counts of explored open and blocked tiles of one map."""
+
+    def __init__(self, width: int, height: int, max_cols: int = MAX_COLS, max_rows: int = MAX_ROWS):
+        self.width = max(0, int(width))
+        self.height = max(0, int(height))
+        self.block_w = max(1, -(-self.width // max(1, max_cols)))
+        self.block_h = max(1, -(-self.height // max(1, max_rows)))
+        self.cols = max(1, -(-self.width // self.block_w))
+        self.rows = max(1, -(-self.height // self.block_h))
+        self._open = array('I', bytes(4 * self.cols * self.rows))
+        self._blocked = array('I', bytes(4 * self.cols * self.rows))
+        self.version = 0
+        self.mask = None          # the explored mask this summary was built from
+
+    @classmethod
+    def for_map(cls, game_map, explored: Iterable = (), **kw) -> "MinimapSummary":
+        """Summary sized to `game_map`, seeded with already explored tiles.
+
+        Seeding walks the explored tiles only, not the whole map.
+        """
+        mh = len(game_map) if game_map else 0
+        mw = len(game_map[0]) if mh else 0
+        summary = cls(mw, mh, **kw)
+        summary.note_explored(game_map, explored)
+        return summary
+
+    def matches(self, game_map) -> bool:
+        try:
+            mh = len(game_map)
+            mw = len(game_map[0]) if mh else 0
+        except Exception:
+            return False
+        return mw == self.width and mh == self.height
+
+    def cell_of(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.block_w, y // self.block_h)
+
+    def note_explored(self, game_map, points: Iterable) -> int:
+        """Count newly explored `points` (each should be passed once); return how many."""
+        bw, bh, cols = self.block_w, self.block_h, self.cols
+        opened, blocked = self._open, self._blocked
+        n = 0
+        for x, y in points:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                continue
+            try:
+                ch = game_map[y][x]
+            except Exception:
+                continue
+            i = (y // bh) * cols + x // bw
+            if ch in BLOCKING:
+                blocked[i] += 1
+            else:
+                opened[i] += 1
+            n += 1
+        if n:
+            self.version += 1
+        return n
+
+    def kind(self, cx: int, cy: int) -> int:
+        i = cy * self.cols + cx
+        if self._open[i]:
+            return OPEN
+        if self._blocked[i]:
+            return BLOCKED
+        return UNKNOWN
+
+    def kinds(self) -> List[List[int]]:
+        """Cell kinds row by row (UNKNOWN, OPEN or BLOCKED)."""
+        return [[self.kind(cx, cy) for cx in range(self.cols)] for cy in range(self.rows)]
+
+
+def minimap_summary(game) -> Optional[MinimapSummary]:
+    """The game's summary for its current map and explored mask, rebuilt after a level change."""
+    game_map = getattr(game, 'game_map', None)
+    explored = getattr(game, 'explored', None)
+    if not game_map:
+        return None
+    summary = getattr(game, 'minimap', None)
+    if summary is None or summary.mask is not explored or not summary.matches(game_map):
+        summary = MinimapSummary.for_map(game_map, explored if explored is not None else ())
+        summary.mask = explored
+        try:
+            game.minimap = summary
+        except Exception:
+            pass
+    return summary
+
+
+def minimap_markers(game, summary: MinimapSummary) -> Dict[Tuple[int, int], str]:
+    """Summary cell -> marker kind for the known points of interest.
+
+    Tombs and landmarks show once their tile has been explored; the ship
+    and comms are always known. The player is added last so it wins.
+    """
+    explored = getattr(game, 'explored', None)
+    if explored is None:
+        explored = ()
+    markers: Dict[Tuple[int, int], str] = {}
+
+    def put(pos, kind, needs_explored=True):
+        try:
+            x, y = int(pos[0]), int(pos[1])
+        except Exception:
+            return
+        if needs_explored and (x, y) not in explored:
+            return
+        if 0 <= x < summary.width and 0 <= y < summary.height:
+            markers[summary.cell_of(x, y)] = kind
+
+    if not getattr(game, 'in_tomb', False):
+        for pos in getattr(game, 'map_landmarks', None) or ():
+            put(pos, 'landmark')
+        for pos in getattr(game, 'tomb_entrances', None) or ():
+            put(pos, 'tomb')
+        for name in ('comms_pos', 'ship_pos'):
+            pos = getattr(game, name, None)
+            if pos:
+                put(pos, 'ship' if name == 'ship_pos' else 'comms', needs_explored=False)
+    player = getattr(game, 'player', None)
+    if player is not None:
+        put((getattr(player, 'x', 0), getattr(player, 'y', 0)), 'player', needs_explored=False)
+    return markers
+
+
+__all__ = ["MAX_COLS", "MAX_ROWS", "BLOCKING", "UNKNOWN", "OPEN", "BLOCKED",
+           "MinimapSummary", "minimap_summary", "minimap_markers"]
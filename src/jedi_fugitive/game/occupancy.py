@@ -0,0 +1,219 @@
+"""Spatial hash of the actors on the current map.
+
+"Is an enemy standing on (x, y)?" used to be answered by scanning the whole
+enemy list, and it is asked many times per turn: by every AI step, every
+projectile step and every push/pull. An `OccupancyIndex` files each actor
+under its tile so the question is a dict lookup.
+
+The index stays in sync without the call sites having to remember it:
+
+- `game.enemies` is an `ActorList`, which adds and removes actors from the
+  index as the list is modified (spawns, deaths, level switches that assign
+  a new list);
+- an indexed actor reports its own moves: `Enemy.__setattr__` calls
+  `moved()` whenever `x` or `y` is assigned.
+
+`occupants(game, x, y)` falls back to a scan for game objects without an
+index (tests, tools), so callers use it unconditionally. Actors are also
+bucketed by coarse map region so `in_rect` can list the actors near the
+player without visiting the rest of the map.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+Point = Tuple[int, int]
+
+
+class OccupancyIndex:
+    """Actors keyed by the tile they stand on."""
+
+    def __init__(self, region_size: int = 16):
+        self.region_size = max(1, int(region_size))
+        self._cells: Dict[Point, List[Any]] = {}
+        self._where: Dict[int, Point] = {}        # id(actor) -> tile it is filed under
+        self._regions: Dict[Point, Dict[int, Any]] = {}   # region -> {id(actor): actor}
+
+    @staticmethod
+    def _pos(actor) -> Point:
+        return (getattr(actor, 'x', None), getattr(actor, 'y', None))
+
+    def _region(self, pos: Point):
+        try:
+            return (int(pos[0]) // self.region_size, int(pos[1]) // self.region_size)
+        except (TypeError, ValueError):
+            return None
+
+    def _file(self, actor, pos: Point) -> None:
+        self._where[id(actor)] = pos
+        self._cells.setdefault(pos, []).append(actor)
+        region = self._region(pos)
+        if region is not None:
+            self._regions.setdefault(region, {})[id(actor)] = actor
+
+    def add(self, actor) -> None:
+        if id(actor) in self._where:
+            return
+        self._file(actor, self._pos(actor))
+        try:
+            actor._occupancy = self
+        except Exception:
+            pass
+
+    def _unfile(self, actor, pos: Point) -> None:
+        region = self._region(pos)
+        members = self._regions.get(region)
+        if members is not None:
+            members.pop(id(actor), None)
+            if not members:
+                del self._regions[region]
+        bucket = self._cells.get(pos)
+        if bucket is None:
+            return
+        for i, other in enumerate(bucket):
+            if other is actor:
+                del bucket[i]
+                break
+        if not bucket:
+            del self._cells[pos]
+
+    def discard(self, actor) -> None:
+        pos = self._where.pop(id(actor), None)
+        if pos is None:
+            return
+        self._unfile(actor, pos)
+        if getattr(actor, '_occupancy', None) is self:
+            try:
+                del actor._occupancy
+            except Exception:
+                pass
+
+    def moved(self, actor) -> None:
+        """Re-file `actor` under its current tile (called after x or y changes)."""
+        old = self._where.get(id(actor))
+        if old is None:
+            return
+        new = self._pos(actor)
+        if new == old:
+            return
+        self._unfile(actor, old)
+        self._file(actor, new)
+
+    def rebuild(self, actors: Iterable) -> None:
+        for bucket in list(self._cells.values()):
+            for actor in list(bucket):
+                self.discard(actor)
+        self._cells.clear()
+        self._where.clear()
+        self._regions.clear()
+        for actor in actors:
+            if actor is not None:
+                self.add(actor)
+
+    def at(self, x: int, y: int) -> List[Any]:
+        """Actors standing on (x, y), in the order they arrived there."""
+        return list(self._cells.get((x, y), ()))
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[Any]:
+        """Actors in columns x0..x1-1 and rows y0..y1-1, visiting only the regions that overlap."""
+        if x1 <= x0 or y1 <= y0:
+            return []
+        rs = self.region_size
+        found = []
+        for ry in range(y0 // rs, (y1 - 1) // rs + 1):
+            for rx in range(x0 // rs, (x1 - 1) // rs + 1):
+                for actor in self._regions.get((rx, ry), {}).values():
+                    x, y = self._where[id(actor)]
+                    if x0 <= x < x1 and y0 <= y < y1:
+                        found.append(actor)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+
+class ActorList(list):
+    """List of actors that keeps an `OccupancyIndex` in step with its contents.
+
+    Any index with the same add/discard/rebuild interface works; the game
+    also binds its item list to a `world_chunks.ChunkIndex` this way.
+    """
+
+    def __init__(self, items=(), index=None):
+        super().__init__(items)
+        self.index = index if index is not None else OccupancyIndex()
+        self.index.rebuild(self)
+
+    def __reduce__(self):
+        # pickle as a plain list; the index is rebuilt when the list is bound again
+        return (list, (list(self),))
+
+    def append(self, actor):
+        super().append(actor)
+        if actor is not None:
+            self.index.add(actor)
+
+    def remove(self, actor):
+        # list.remove drops the first *equal* element, which for item dicts
+        # need not be `actor` itself; prefer the identical one and unindex
+        # whichever element actually went
+        for i, a in enumerate(self):
+            if a is actor:
+                break
+        else:
+            i = list.index(self, actor)
+        removed = self[i]
+        super().__delitem__(i)
+        if not any(a is removed for a in self):
+            self.index.discard(removed)
+
+    def pop(self, *args):
+        actor = super().pop(*args)
+        if not any(a is actor for a in self):
+            self.index.discard(actor)
+        return actor
+
+    def _resync(self):
+        self.index.rebuild(self)
+
+
+def _resyncing(name):
+    base = getattr(list, name)
+
+    def method(self, *args):
+        result = base(self, *args)
+        self._resync()
+        return result
+    method.__name__ = name
+    return method
+
+
+for _name in ('extend', 'insert', 'clear', '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(ActorList, _name, _resyncing(_name))
+del _name
+
+
+def bind_actors(actors, index: OccupancyIndex):
+    """Return `actors` as an ActorList kept in `index` (None stays None)."""
+    if actors is None:
+        index.rebuild(())
+        return None
+    if isinstance(actors, ActorList) and actors.index is index:
+        return actors
+    return ActorList(actors, index)
+
+
+def occupants(game, x: int, y: int) -> List[Any]:
+    """Enemies standing on (x, y): an index lookup, or a scan of `game.enemies`."""
+    enemies = getattr(game, 'enemies', None)
+    if isinstance(enemies, ActorList):
+        return enemies.index.at(x, y)
+    found = []
+    for e in enemies or ():
+        try:
+            if getattr(e, 'x', None) == x and getattr(e, 'y', None) == y:
+                found.append(e)
+        except Exception:
+            continue
+    return found
+
+
+__all__ = ["OccupancyIndex", "ActorList", "bind_actors", "occupants"]
@@ -11,7 +11,65 @@ class LevelUpOption:
     EVASION = 4
     CRITICAL_CHANCE = 5
 
+# Player attributes shown in the stats panel; assigning one bumps Player.state_version
+STATS_ATTRS = frozenset((
+    'hp', 'max_hp', 'attack', 'defense', 'evasion', 'accuracy', 'stress', 'max_stress',
+    'dark_corruption', 'gold_collected', 'inventory', 'equipped_weapon', 'equipped_offhand',
+    'equipped_armor', 'force_abilities', 'force_energy', 'max_force_energy', 'force_points',
+    'level', 'xp', 'xp_to_next', 'light_xp', 'dark_xp', 'light_level', 'dark_level',
+    'xp_to_next_light', 'xp_to_next_dark', '_base_stats',
+))
+
+
+class StatsList(list):
+    """List that bumps its owner's state_version whenever it is modified (the inventory)."""
+
+    def __init__(self, items=(), owner=None):
+        super().__init__(items)
+        self.owner = owner
+
+    def _changed(self):
+        touch = getattr(getattr(self, 'owner', None), 'touch', None)
+        if touch is not None:
+            touch()
+
+
+def _tracked(name):
+    base = getattr(list, name)
+
+    def method(self, *args):
+        result = base(self, *args)
+        self._changed()
+        return result
+    method.__name__ = name
+    return method
+
+
+for _name in ('append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse',
+              '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(StatsList, _name, _tracked(_name))
+del _name
+
+
 class Player:
+    def __setattr__(self, name, value):
+        if name in STATS_ATTRS:
+            if name == 'inventory' and isinstance(value, list) and getattr(value, 'owner', None) is not self:
+                value = StatsList(value, self)
+            object.__setattr__(self, name, value)
+            self.touch()
+        else:
+            object.__setattr__(self, name, value)
+
+    @property
+    def state_version(self) -> int:
+        """Counter bumped whenever a stat shown in the stats panel changes."""
+        return self.__dict__.get('_state_version', 0)
+
+    def touch(self):
+        """Mark the displayed stats as changed (for in-place edits, e.g. force_abilities)."""
+        self.__dict__['_state_version'] = self.__dict__.get('_state_version', 0) + 1
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -304,6 +362,7 @@ class Player:
                             if choose is not None and 0 <= choose < len(avail):
                                 a = avail[choose]
                                 self.force_abilities[getattr(a, 'name', str(type(a)))] = a
+                                self.touch()
                                 ui.messages.add(f"Learned ability: {getattr(a,'name','ability')}")
                 except Exception:
                     try: ui.messages.add(f"Leveled up to {self.level}!")
@@ -11,6 +11,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional, List
 
+from jedi_fugitive.game.occupancy import occupants
+
 
 def _sign(n: int) -> int:
     return 0 if n == 0 else (1 if n > 0 else -1)
@@ -130,7 +132,6 @@ def advance_projectiles(game):
     gmap = getattr(game, 'game_map', None)
     max_h = len(gmap) if gmap else 0
     max_w = len(gmap[0]) if max_h else 0
-    enemies = getattr(game, 'enemies', []) or []
 
     for p in list(proj_list):
         if not getattr(p, 'alive', True):
@@ -173,9 +174,9 @@ def advance_projectiles(game):
         p.range_remaining = max(0, p.range_remaining - 1)
 
         hit = None
-        for e in enemies:
+        for e in occupants(game, p.x, p.y):
             try:
-                if getattr(e, 'x', None) == p.x and getattr(e, 'y', None) == p.y and getattr(e, 'is_alive', None) is not False:
+                if getattr(e, 'is_alive', None) is not False:
                     hit = e
                     break
             except Exception:
@@ -0,0 +1,322 @@
+"""Compact tile storage for game maps.
+
+`TileGrid` stores one byte per tile in a flat `bytearray` and maps each byte
+to a glyph through a small palette. It keeps the `grid[y][x]` read/write
+idiom used throughout the game (movement, FOV, AI, projectiles, rendering),
+so existing code can treat it like the old list-of-lists-of-str map.
+
+Rows are lightweight views into the shared buffer; writing through a row
+updates the grid in place. Every write that changes a tile bumps
+`TileGrid.revision`, which caches (e.g. visibility) use to detect changes.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class TileRow:
+    """Mutable view of a single row of a `TileGrid`."""
+
+    __slots__ = ("_grid", "_offset")
+
+    def __init__(self, grid: "TileGrid", y: int):
+        self._grid = grid
+        self._offset = y * grid.width
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __getitem__(self, x):
+        grid = self._grid
+        w = grid.width
+        if isinstance(x, slice):
+            start, stop, step = x.indices(w)
+            off = self._offset
+            pal = grid._palette
+            return [pal[c] for c in grid._data[off + start:off + stop:step]] if start < stop else []
+        if x < 0:
+            x += w
+        if x < 0 or x >= w:
+            raise IndexError("tile row index out of range")
+        return grid._palette[grid._data[self._offset + x]]
+
+    def __setitem__(self, x, glyph) -> None:
+        grid = self._grid
+        w = grid.width
+        if isinstance(x, slice):
+            start, stop, step = x.indices(w)
+            for i, g in zip(range(start, stop, step), glyph):
+                grid._write(self._offset + i, g)
+            return
+        if x < 0:
+            x += w
+        if x < 0 or x >= w:
+            raise IndexError("tile row assignment index out of range")
+        grid._write(self._offset + x, glyph)
+
+    def __iter__(self) -> Iterator[str]:
+        pal = self._grid._palette
+        off = self._offset
+        for b in self._grid._data[off:off + self._grid.width]:
+            yield pal[b]
+
+    def __eq__(self, other) -> bool:
+        try:
+            return list(self) == list(other)
+        except Exception:
+            return False
+
+    def __repr__(self) -> str:
+        return "TileRow(%r)" % "".join(str(g) for g in self)
+
+
+class TileGrid:
+    """Width x height tile map backed by a `bytearray` and a glyph palette.
+
+    Up to 256 distinct glyphs can be stored; new glyphs are added to the
+    palette the first time they are written. `on_write(x, y, old, new)`,
+    when set, is called after every write that changes a tile (indexes use
+    it to stay in sync); it is not pickled.
+    """
+
+    __slots__ = ("width", "height", "revision", "on_write", "_data", "_palette", "_codes", "_rows")
+
+    def __init__(self, width: int, height: int, fill: str = "#"):
+        self.width = max(0, int(width))
+        self.height = max(0, int(height))
+        self.revision = 0
+        self.on_write = None
+        self._palette: List[str] = []
+        self._codes = {}
+        code = self.code_for(fill)
+        self._data = bytearray([code]) * (self.width * self.height)
+        self._rows = [TileRow(self, y) for y in range(self.height)]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[str]], fill: str = "#") -> "TileGrid":
+        """Build a grid from a list-of-lists map (short rows are padded with `fill`)."""
+        height = len(rows)
+        width = max((len(r) for r in rows), default=0)
+        grid = cls(width, height, fill)
+        for y, row in enumerate(rows):
+            grid.paste_row(0, y, row)
+        return grid
+
+    def code_for(self, glyph) -> int:
+        """Return the palette byte for `glyph`, registering it if needed."""
+        try:
+            return self._codes[glyph]
+        except KeyError:
+            pass
+        if len(self._palette) >= 256:
+            raise ValueError("TileGrid palette is full (256 glyphs)")
+        code = len(self._palette)
+        self._palette.append(glyph)
+        self._codes[glyph] = code
+        return code
+
+    def _write(self, index: int, glyph) -> None:
+        code = self.code_for(glyph)
+        old = self._data[index]
+        if old != code:
+            self._data[index] = code
+            self.revision += 1
+            if self.on_write is not None:
+                self.on_write(index % self.width, index // self.width, self._palette[old], glyph)
+
+    @property
+    def palette(self) -> List[str]:
+        return self._palette
+
+    @property
+    def data(self) -> bytearray:
+        """Raw row-major tile codes (index = y * width + x)."""
+        return self._data
+
+    def get(self, x: int, y: int, default: Optional[str] = None) -> Optional[str]:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._palette[self._data[y * self.width + x]]
+        return default
+
+    def set(self, x: int, y: int, glyph: str) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("tile index out of range")
+        self._write(y * self.width + x, glyph)
+
+    def paste_row(self, x: int, y: int, glyphs: Iterable[str]) -> None:
+        """Write consecutive glyphs into row `y` starting at column `x` (clipped)."""
+        if not (0 <= y < self.height):
+            return
+        base = y * self.width
+        for i, g in enumerate(glyphs):
+            xx = x + i
+            if xx >= self.width:
+                break
+            if xx >= 0:
+                self._write(base + xx, g)
+
+    def positions_of(self, glyph) -> Iterator[Tuple[int, int]]:
+        """Yield every (x, y) holding `glyph` in row-major order."""
+        code = self._codes.get(glyph)
+        if code is None:
+            return
+        w = self.width
+        i = self._data.find(code)
+        while i != -1:
+            yield (i % w, i // w)
+            i = self._data.find(code, i + 1)
+
+    def to_rows(self) -> List[List[str]]:
+        """Return a plain list-of-lists copy of the map."""
+        return [list(row) for row in self._rows]
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __bool__(self) -> bool:
+        return self.height > 0
+
+    def __getitem__(self, y):
+        return self._rows[y]
+
+    def __iter__(self) -> Iterator[TileRow]:
+        return iter(self._rows)
+
+    def __getstate__(self):
+        return (self.width, self.height, bytes(self._data), list(self._palette), self.revision)
+
+    def __setstate__(self, state) -> None:
+        width, height, data, palette, revision = state
+        self.width = width
+        self.height = height
+        self.revision = revision
+        self.on_write = None
+        self._data = bytearray(data)
+        self._palette = list(palette)
+        self._codes = {g: i for i, g in enumerate(self._palette)}
+        self._rows = [TileRow(self, y) for y in range(height)]
+
+    def __repr__(self) -> str:
+        return "TileGrid(%dx%d, %d glyphs)" % (self.width, self.height, len(self._palette))
+
+
+# byte value -> the 8 column flags it packs (bit i is column 8k + i)
+_UNPACK = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+
+class TileMask:
+    """Bit-per-tile boolean mask (e.g. explored tiles) for a map.
+
+    Behaves like a set of (x, y) tuples for membership, `add` and `|=`, but
+    costs one bit per tile regardless of how much has been marked, and
+    exposes `row_slice` so renderers can read a whole viewport row of flags
+    at once. Rows are allocated on first mark, so untouched parts of a huge
+    map cost nothing, and a running count keeps `len()` and truth tests
+    O(1). Coordinates outside the mask are ignored.
+    """
+
+    __slots__ = ("width", "height", "_rows", "_count")
+
+    def __init__(self, width: int, height: int):
+        self.width = max(0, int(width))
+        self.height = max(0, int(height))
+        self._rows: List[Optional[bytearray]] = [None] * self.height
+        self._count = 0
+
+    @classmethod
+    def for_map(cls, game_map, points: Iterable = ()) -> "TileMask":
+        """Create an empty mask sized to `game_map`, optionally pre-marking `points`."""
+        mh = len(game_map) if game_map else 0
+        mw = len(game_map[0]) if mh else 0
+        mask = cls(mw, mh)
+        mask.update(points or ())
+        return mask
+
+    def matches(self, game_map) -> bool:
+        """True when this mask has the same dimensions as `game_map`."""
+        try:
+            mh = len(game_map)
+            mw = len(game_map[0]) if mh else 0
+        except Exception:
+            return False
+        return mw == self.width and mh == self.height
+
+    def add(self, point) -> None:
+        self.update((point,))
+
+    def update(self, points: Iterable) -> List[Tuple[int, int]]:
+        """Mark `points`; return the ones that were not marked before."""
+        w, h, rows = self.width, self.height, self._rows
+        added = []
+        for x, y in points:
+            if 0 <= x < w and 0 <= y < h:
+                row = rows[y]
+                if row is None:
+                    row = rows[y] = bytearray((w + 7) >> 3)
+                bit = 1 << (x & 7)
+                if not row[x >> 3] & bit:
+                    row[x >> 3] |= bit
+                    added.append((x, y))
+        self._count += len(added)
+        return added
+
+    def clear(self) -> None:
+        self._rows = [None] * self.height
+        self._count = 0
+
+    def row_slice(self, y: int, x0: int, x1: int) -> bytes:
+        """Return one 0/1 flag byte per column x0..x1-1 of row `y` (0 outside the mask)."""
+        n = max(0, x1 - x0)
+        row = self._rows[y] if 0 <= y < self.height else None
+        if row is None or n == 0:
+            return bytes(n)
+        lo = max(0, x0)
+        hi = min(self.width, x1)
+        if lo >= hi:
+            return bytes(n)
+        flags = b"".join([_UNPACK[b] for b in row[lo >> 3:(hi + 7) >> 3]])
+        skip = lo & 7
+        return bytes(lo - x0) + flags[skip:skip + hi - lo] + bytes(x1 - hi)
+
+    def __contains__(self, point) -> bool:
+        try:
+            x, y = point
+        except Exception:
+            return False
+        if 0 <= x < self.width and 0 <= y < self.height:
+            row = self._rows[y]
+            return row is not None and bool(row[x >> 3] & (1 << (x & 7)))
+        return False
+
+    def __ior__(self, points: Iterable) -> "TileMask":
+        self.update(points)
+        return self
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for y, row in enumerate(self._rows):
+            if row is None:
+                continue
+            for i, b in enumerate(row):
+                if b:
+                    for bit in range(8):
+                        if b >> bit & 1:
+                            yield ((i << 3) + bit, y)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __repr__(self) -> str:
+        return "TileMask(%dx%d, %d set)" % (self.width, self.height, len(self))
+
+
+def as_tile_grid(game_map, fill: str = "#") -> TileGrid:
+    """Return `game_map` as a TileGrid, converting list-of-lists maps."""
+    if isinstance(game_map, TileGrid):
+        return game_map
+    return TileGrid.from_rows(game_map or [], fill)
+
+
+__all__ = ["TileGrid", "TileRow", "TileMask", "as_tile_grid"]
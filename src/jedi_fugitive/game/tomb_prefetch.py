@@ -0,0 +1,119 @@
+"""Speculative background generation of tomb dungeons.
+
+Building a tomb (3-5 dungeon levels with enemies and items) used to happen
+synchronously the moment the player stepped onto an entrance. The
+`TombPrefetcher` starts building the tomb for every entrance within
+`radius` tiles of the player in a worker process, so `enter_tomb` can
+usually swap in levels that are already finished.
+
+Tombs are deterministic for a world seed, entrance position and player
+level (see `map_features.build_tomb_levels`), so a prefetched tomb is
+identical to one built on demand. Work runs in a separate process rather
+than a thread because generation reseeds the global `random` module.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+from typing import Dict, Optional, Tuple
+
+TombKey = Tuple[int, int, int, int]   # (seed, x, y, player level)
+
+
+def _build_job(seed, x, y, player_level):
+    from jedi_fugitive.game.map_features import build_tomb_levels
+    return build_tomb_levels(seed, x, y, player_level)
+
+
+class TombPrefetcher:
+    """Builds tombs near the player ahead of time in a worker process."""
+
+    def __init__(self, radius: int = 30, max_workers: int = 1):
+        self.radius = max(0, int(radius))
+        self.max_workers = max(1, int(max_workers))
+        self.enabled = True
+        self._executor: Optional[concurrent.futures.Executor] = None
+        self._pending: Dict[Tuple[int, int], Tuple[TombKey, concurrent.futures.Future]] = {}
+
+    def _ensure_executor(self) -> Optional[concurrent.futures.Executor]:
+        if self._executor is None and self.enabled:
+            try:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+            except Exception:
+                # no process support here (sandbox, missing semaphores): build on demand
+                self.enabled = False
+        return self._executor
+
+    @staticmethod
+    def _key(game, x, y) -> TombKey:
+        from jedi_fugitive.game.world_seed import resolve_world_seed
+        level = int(getattr(getattr(game, 'player', None), 'level', 1) or 1)
+        return (resolve_world_seed(game), x, y, level)
+
+    def update(self, game) -> int:
+        """Queue tombs within `radius` of the player; return how many were submitted."""
+        if not self.enabled or getattr(game, 'in_tomb', False):
+            return 0
+        try:
+            px, py = int(game.player.x), int(game.player.y)
+        except Exception:
+            return 0
+        submitted = 0
+        for (tx, ty) in getattr(game, 'tomb_entrances', None) or ():
+            if max(abs(tx - px), abs(ty - py)) > self.radius:
+                continue
+            key = self._key(game, tx, ty)
+            pending = self._pending.get((tx, ty))
+            if pending is not None and pending[0] == key:
+                continue
+            executor = self._ensure_executor()
+            if executor is None:
+                return submitted
+            if pending is not None:
+                pending[1].cancel()
+            try:
+                self._pending[(tx, ty)] = (key, executor.submit(_build_job, *key))
+                submitted += 1
+            except Exception:
+                self.enabled = False
+                return submitted
+        return submitted
+
+    def take(self, game, x, y, timeout: Optional[float] = None):
+        """Return the prefetched tomb for (x, y), or None if there is no usable one.
+
+        Waits for a build that is still running (it started earlier than an
+        on-demand build would). Stale builds (different seed or player level)
+        and failed builds return None.
+        """
+        pending = self._pending.pop((x, y), None)
+        if pending is None:
+            return None
+        key, future = pending
+        if key != self._key(game, x, y):
+            future.cancel()
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+    def clear(self) -> None:
+        """Drop every pending build (e.g. after a new world is generated)."""
+        for _key, future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def shutdown(self) -> None:
+        self.clear()
+        if self._executor is not None:
+            try:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+            self._executor = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+__all__ = ["TombPrefetcher"]
@@ -0,0 +1,125 @@
+"""Time-ordered turn queue for enemies.
+
+Enemies used to act in list order, exactly once per player turn, and
+anything that should not act (stunned, idle far away) still had to be
+visited to find that out. A `TurnScheduler` keeps every active actor in a
+heap keyed by the game time of its next action. Each player turn advances
+the clock by one and pops the actors that are due, in time order:
+
+- an actor with `speed` 1.0 acts once per player turn, 1.5 three times
+  every two turns, 0.5 every other turn;
+- `delay(actor, turns)` pushes an actor's next action back (stuns) and
+  `park(actor)` takes it out of the queue until `ensure(actor, wake=True)`
+  brings it back (idle actors), so neither costs anything while waiting.
+
+Time is counted in integer ticks (`TICKS_PER_TURN` per player turn) so
+speeds like 1.5 don't drift; an advance runs the actions due in
+[now, now + one turn). Heap entries are invalidated lazily: rescheduling
+just pushes a new entry and stale ones are skipped when they surface.
+"""
+import heapq
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+TICKS_PER_TURN = 60
+MIN_SPEED = 0.1
+
+
+def actor_speed(actor) -> float:
+    """Actions per player turn (the actor's `speed`, default 1.0)."""
+    try:
+        return max(MIN_SPEED, float(getattr(actor, 'speed', 1.0) or 1.0))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class TurnScheduler:
+    """Actors ordered by the game time of their next action."""
+
+    def __init__(self, speed_of: Callable[[Any], float] = actor_speed):
+        self.speed_of = speed_of
+        self.now = 0                                      # ticks
+        self._seq = 0
+        self._heap: List[Tuple[int, int, Any]] = []
+        self._next: Dict[int, Tuple[int, int]] = {}       # id(actor) -> live (tick, seq)
+        self._parked: Dict[int, Any] = {}
+
+    def interval(self, actor) -> int:
+        """Ticks between two actions of `actor`."""
+        return max(1, int(round(TICKS_PER_TURN / max(MIN_SPEED, self.speed_of(actor)))))
+
+    def schedule(self, actor, at: int) -> None:
+        self._seq += 1
+        self._next[id(actor)] = (at, self._seq)
+        self._parked.pop(id(actor), None)
+        heapq.heappush(self._heap, (at, self._seq, actor))
+
+    def ensure(self, actor, wake: bool = False) -> None:
+        """Queue `actor` to act this turn unless it is already queued (or parked, unless `wake`)."""
+        key = id(actor)
+        if key in self._next:
+            return
+        if not wake and self._parked.get(key) is actor:
+            return
+        self.schedule(actor, self.now)
+
+    def delay(self, actor, turns: float) -> None:
+        """Push the actor's next action `turns` player turns later than planned."""
+        at = self.next_time(actor)
+        at = self.now if at is None else max(at, self.now)
+        self.schedule(actor, at + int(round(max(0.0, float(turns)) * TICKS_PER_TURN)))
+
+    def park(self, actor) -> None:
+        """Take an idle actor out of the queue; `ensure(actor, wake=True)` brings it back."""
+        self._next.pop(id(actor), None)
+        self._parked[id(actor)] = actor
+
+    def discard(self, actor) -> None:
+        self._next.pop(id(actor), None)
+        self._parked.pop(id(actor), None)
+
+    def next_time(self, actor) -> Optional[int]:
+        entry = self._next.get(id(actor))
+        return entry[0] if entry else None
+
+    def advance(self, turns: float = 1.0) -> Iterator[Any]:
+        """Yield each actor whose action falls in the next `turns` turns, in time order.
+
+        An actor is rescheduled one action later before it is yielded, so
+        fast actors come up again within the same advance and the caller
+        may still `delay`, `park` or `discard` it.
+        """
+        end = self.now + int(round(turns * TICKS_PER_TURN))
+        self.now = end
+        heap = self._heap
+        while heap and heap[0][0] < end:
+            at, seq, actor = heapq.heappop(heap)
+            if self._next.get(id(actor)) != (at, seq):
+                continue                   # stale entry (rescheduled, parked or discarded)
+            self.schedule(actor, at + self.interval(actor))
+            yield actor
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._next.clear()
+        self._parked.clear()
+
+    def __len__(self) -> int:
+        return len(self._next)
+
+    def __contains__(self, actor) -> bool:
+        return id(actor) in self._next
+
+
+def turn_scheduler(game) -> TurnScheduler:
+    """Return the turn scheduler kept on `game` (created on first use)."""
+    scheduler = getattr(game, 'turn_scheduler', None)
+    if scheduler is None:
+        scheduler = TurnScheduler()
+        try:
+            game.turn_scheduler = scheduler
+        except Exception:
+            pass
+    return scheduler
+
+
+__all__ = ["TICKS_PER_TURN", "TurnScheduler", "turn_scheduler", "actor_speed"]
@@ -1,6 +1,11 @@
 import curses
 import math
 from jedi_fugitive.game.level import Display
+from jedi_fugitive.game.minimap import BLOCKED, OPEN, UNKNOWN, minimap_markers, minimap_summary
+from jedi_fugitive.game.occupancy import ActorList, occupants
+from jedi_fugitive.game.world_chunks import items_at
+from jedi_fugitive.ui.animation_queue import animation_queue
+from jedi_fugitive.ui.back_buffer import panel_buffer
 
 def _bresenham_line(x0, y0, x1, y1):
     """Yield points on a line from (x0,y0) to (x1,y1) (inclusive) using Bresenham."""
@@ -22,16 +27,45 @@ def _bresenham_line(x0, y0, x1, y1):
             err += dx
             y += sy
 
-def draw(game):
-    # delegate to panel drawers
-    draw_map_panel(game)
-    draw_stats_panel(game)
-    draw_abilities_panel(game)
-    draw_commands_panel(game)
+def _draw_messages_panel(game):
     try:
         game.ui.message_panel_draw()
     except Exception:
         pass
+
+
+def _restage_panel(game, name):
+    """Re-queue an unchanged panel so anything drawn over it since the last frame is repainted."""
+    try:
+        panel = getattr(game.ui, "panels", {}).get(name)
+        if panel is not None:
+            panel.touchwin()
+            panel.noutrefresh()
+    except Exception:
+        pass
+
+
+def draw(game, panels=None):
+    """Draw the panels named in `panels` (all when None); the others are only re-staged.
+
+    Each drawer stages its window with noutrefresh() and the whole frame goes
+    to the terminal in a single doupdate().
+    """
+    if not getattr(game, "show_minimap", False) and getattr(game.ui, "minimap_win", None) is not None:
+        _close_minimap(game)
+    for name, drawer in (("map", draw_map_panel), ("stats", draw_stats_panel),
+                         ("abilities", draw_abilities_panel), ("commands", draw_commands_panel),
+                         ("messages", _draw_messages_panel)):
+        if panels is None or name in panels:
+            drawer(game)
+        else:
+            _restage_panel(game, name)
+    if getattr(game, "show_minimap", False):
+        draw_minimap_overlay(game)
+    try:
+        curses.doupdate()
+    except curses.error:
+        pass
     
     # Draw Sith Codex overlay if toggled
     try:
@@ -40,21 +74,218 @@ def draw(game):
     except Exception:
         pass
 
+_MINIMAP_MARKERS = {'player': ('@', 1), 'ship': ('S', 6), 'comms': ('C', 6), 'tomb': ('D', 7), 'landmark': ('?', 3)}
+
+
+def draw_minimap_overlay(game):
+    """Draw the minimap ('M') centred over the panels from the explored-terrain summary.
+
+    Reads only the low-resolution summary kept up to date by
+    compute_visibility, cropped around the player when it does not fit.
+    """
+    try:
+        summary = minimap_summary(game)
+        if summary is None:
+            return
+        th, tw = game.stdscr.getmaxyx()
+        inner_w = max(1, min(summary.cols, tw - 4))
+        inner_h = max(1, min(summary.rows, th - 4))
+        win = getattr(game.ui, "minimap_win", None)
+        if win is None or win.getmaxyx() != (inner_h + 2, inner_w + 2):
+            win = curses.newwin(inner_h + 2, inner_w + 2, max(0, (th - inner_h - 2) // 2), max(0, (tw - inner_w - 2) // 2))
+            game.ui.minimap_win = win
+        buf = panel_buffer(game.ui, "minimap")
+        if buf.begin(win):
+            win.erase()
+            win.border()
+            try:
+                win.addstr(0, 2, " MINIMAP "[: inner_w], curses.color_pair(14) | curses.A_BOLD)
+                legend = " @ you  S ship  D tomb  ? POI "
+                if len(legend) <= inner_w:
+                    win.addstr(inner_h + 1, max(1, inner_w + 1 - len(legend)), legend, curses.A_DIM)
+            except curses.error:
+                pass
+        # crop around the player when the summary is larger than the window
+        pcx, pcy = summary.cell_of(getattr(game.player, "x", 0), getattr(game.player, "y", 0))
+        x0 = max(0, min(pcx - inner_w // 2, summary.cols - inner_w))
+        y0 = max(0, min(pcy - inner_h // 2, summary.rows - inner_h))
+        styles = {UNKNOWN: (' ', 0), OPEN: ('.', curses.color_pair(4) | curses.A_DIM),
+                  BLOCKED: ('#', curses.color_pair(5))}
+        frame = [[styles[summary.kind(cx, cy)] for cx in range(x0, x0 + inner_w)] for cy in range(y0, y0 + inner_h)]
+        for (cx, cy), kind in minimap_markers(game, summary).items():
+            if x0 <= cx < x0 + inner_w and y0 <= cy < y0 + inner_h:
+                glyph, pair = _MINIMAP_MARKERS[kind]
+                frame[cy - y0][cx - x0] = (glyph, curses.color_pair(pair) | curses.A_BOLD)
+        buf.put_rows(frame)
+        win.touchwin()
+        win.noutrefresh()
+    except curses.error:
+        pass
+    except Exception:
+        pass
+
+
+def _close_minimap(game):
+    """Forget the minimap window and re-stage the screen underneath it."""
+    game.ui.minimap_win = None
+    panel_buffer(game.ui, "minimap").invalidate()
+    try:
+        game.stdscr.touchwin()
+        game.stdscr.noutrefresh()
+    except Exception:
+        pass
+
+
+# Visibility states of a map cell for the style table
+VIS_HIDDEN, VIS_VISIBLE, VIS_EXPLORED, VIS_UNFOGGED = 0, 1, 2, 3
+
+
+def _tile_style(ch, biome, state):
+    """(glyph, attr) for a map tile given its biome (floors only) and visibility state."""
+    if state == VIS_HIDDEN:
+        return (' ', curses.color_pair(4))
+    visible = state == VIS_VISIBLE
+    # Glyph choice: use lowercase for alphabetic tokens when not currently visible (smaller visual)
+    glyph = ch
+    if isinstance(ch, str) and ch.isalpha() and state == VIS_EXPLORED:
+        glyph = ch.lower()
+
+    # Color choices (with biome-aware floor variants)
+    try:
+        if ch == Display.WALL:
+            color = curses.color_pair(5)
+        elif ch in (getattr(Display, "GOLD", "G"), getattr(Display, "ARTIFACT", None), getattr(Display, "POTION", None)):
+            color = curses.color_pair(3)
+        elif ch == getattr(Display, "WRECKAGE", None):
+            color = curses.color_pair(7)
+        elif ch == getattr(Display, "TREE", "T"):
+            color = curses.color_pair(8)
+        elif ch == getattr(Display, "ROCK", "r"):
+            # rocks / boulders render with a rocky glyph and distinct color
+            color = curses.color_pair(15)
+            glyph = '^'
+        elif ch == getattr(Display, "FLOOR", '.'):
+            # biome floors keep full brightness even when only remembered
+            if biome == 'forest':
+                return (',', curses.color_pair(10))   # grassy floor
+            if biome == 'desert':
+                return ('~', curses.color_pair(14))
+            if biome == 'rocky':
+                return ('^', curses.color_pair(15))
+            # plains / fallback
+            color = curses.color_pair(4)
+        elif ch == getattr(Display, "SITH_TOMB", "X") or ch == getattr(Display, "SITH_ENTRANCE", "E"):
+            color = curses.color_pair(6)
+        else:
+            color = curses.color_pair(4)
+    except Exception:
+        color = curses.color_pair(4)
+    # If tile is not currently visible but has been explored, render it dimmer
+    if not visible:
+        color = color | curses.A_DIM
+    return (glyph, color)
+
+
+def _tile_styles(ui):
+    """Style table kept on the UI object; colour attributes exist only once curses is set up."""
+    styles = getattr(ui, 'tile_styles', None)
+    if styles is None:
+        styles = {}
+        try:
+            ui.tile_styles = styles
+        except Exception:
+            pass
+    return styles
+
+
+def _viewport_actors(game, px, py, start_x, start_y, view_w, view_h, local_visible):
+    """Map viewport (vx, vy) -> (glyph, attr) for the player, visible live enemies and projectiles.
+
+    Built once per frame; later entries win, so projectiles draw over
+    enemies and enemies over the player, as before.
+    """
+    actors = {}
+    player_vx = px - start_x
+    player_vy = py - start_y
+    if 0 <= player_vx < view_w and 0 <= player_vy < view_h:
+        # Player color changes based on dark corruption from artifacts
+        try:
+            corruption = getattr(game.player, 'dark_corruption', 0)
+            if corruption >= 75:
+                # Deep corruption - red/dark
+                player_color = curses.color_pair(2) | curses.A_BOLD  # Red like enemies
+            elif corruption >= 50:
+                # Moderate corruption - orange/yellow
+                player_color = curses.color_pair(3) | curses.A_BOLD  # Yellow
+            elif corruption >= 25:
+                # Light corruption - dim
+                player_color = curses.color_pair(1) | curses.A_DIM  # Dimmed cyan
+            else:
+                # Pure - bright cyan
+                player_color = curses.color_pair(1) | curses.A_BOLD  # Normal cyan
+        except Exception:
+            player_color = curses.color_pair(1) | curses.A_BOLD
+        actors[(player_vx, player_vy)] = ('@', player_color)
+
+    enemy_attr = curses.color_pair(2) | curses.A_BOLD
+    enemies = getattr(game, "enemies", None) or []
+    if isinstance(enemies, ActorList):
+        # only the occupancy regions under the viewport
+        enemies = enemies.index.in_rect(start_x, start_y, start_x + view_w, start_y + view_h)
+    for e in enemies:
+        try:
+            ex, ey = getattr(e, "x", -1), getattr(e, "y", -1)
+            if not (start_x <= ex < start_x + view_w and start_y <= ey < start_y + view_h):
+                continue
+            if (ex, ey) not in local_visible:
+                continue
+            if not getattr(e, "is_alive", lambda: False)(): continue
+            actors[(ex - start_x, ey - start_y)] = (getattr(e, "symbol", "E"), enemy_attr)
+        except Exception:
+            continue
+
+    try:
+        for p in list(getattr(game, "projectiles", []) or []):
+            try:
+                pxp, pyp = int(getattr(p, "x", -999)), int(getattr(p, "y", -999))
+                if start_x <= pxp < start_x + view_w and start_y <= pyp < start_y + view_h:
+                    sym = str(getattr(p, "symbol", "*"))
+                    # choose color based on owner (player vs enemy) when possible
+                    try:
+                        owner = getattr(p, 'owner', None)
+                        if owner is getattr(game, 'player', None):
+                            col = curses.color_pair(11) | curses.A_BOLD
+                        else:
+                            col = curses.color_pair(12) | curses.A_BOLD
+                    except Exception:
+                        col = curses.color_pair(9) | curses.A_BOLD
+                    actors[(pxp - start_x, pyp - start_y)] = (sym, col)
+            except Exception:
+                continue
+    except Exception:
+        pass
+    return actors
+
+
 def draw_map_panel(game):
     panel = game.ui.panels.get('map') if getattr(game.ui, "panels", None) else None
     if not panel:
         panel = game.stdscr
     try:
-        panel.clear()
-        try: 
-            panel.border()
-            # Add decorative map title
-            try:
-                title = " ◈ MAP ◈ "
-                panel.addstr(0, 2, title, curses.A_BOLD | curses.color_pair(2))
-            except:
-                pass
-        except Exception: pass
+        # the map interior is diffed against the previous frame; border and
+        # title are only redrawn when the back buffer starts over
+        buf = panel_buffer(game.ui, 'map')
+        if buf.begin(panel):
+            panel.erase()
+            try: 
+                panel.border()
+                # Add decorative map title
+                try:
+                    title = " ◈ MAP ◈ "
+                    panel.addstr(0, 2, title, curses.A_BOLD | curses.color_pair(2))
+                except:
+                    pass
+            except Exception: pass
         ph, pw = panel.getmaxyx()
         view_h = max(1, ph - 2)
         view_w = max(1, pw - 2)
@@ -117,161 +348,77 @@ def draw_map_panel(game):
         except Exception:
             local_visible = getattr(game, "visible", set())
 
-        # Render each visible row into the panel as we compute it
+        # exploration bitmap (TileMask) exposes whole-row reads; sets are probed per cell
+        explored_map = getattr(game, "explored", None)
+        if explored_map is None:
+            explored_map = set()
+        has_row_slice = hasattr(explored_map, "row_slice")
+
+        # (tile, biome, visibility state) -> (glyph, attr), filled as new keys show up
+        styles = _tile_styles(game.ui)
+        blank = (' ', curses.color_pair(4))
+        floor_ch = getattr(Display, "FLOOR", '.')
+        biomes = getattr(game, 'map_biomes', None) or None
+        try:
+            biomes_h = len(biomes) if biomes is not None else 0
+        except Exception:
+            biomes = None; biomes_h = 0
+
+        # Compose the viewport into a frame of (glyph, attr) cells
+        frame = []
+        blank_row = [blank] * view_w
         for vy in range(view_h):
             my = start_y + vy
-            # clear or empty row if outside map bounds
+            # empty row if outside map bounds
             if not (0 <= my < map_h):
-                try:
-                    panel.move(1 + vy, 1); panel.clrtoeol()
-                except Exception:
-                    pass
+                frame.append(list(blank_row))
                 continue
 
-            row = game.game_map[my]
+            # read the visible span of the map (and biome) row in one slice
+            row = game.game_map[my][start_x:start_x + view_w]
+            explored_row = explored_map.row_slice(my, start_x, start_x + view_w) if has_row_slice else None
+            biome_row = biomes[my][start_x:start_x + view_w] if biomes is not None and my < biomes_h else None
+            n_row = len(row)
+            n_biome = len(biome_row) if biome_row is not None else 0
             line_chars = []
             for vx in range(view_w):
                 mx = start_x + vx
-                if not (0 <= mx < map_w):
-                    line_chars.append((' ', curses.color_pair(4)))
+                if vx >= n_row:
+                    line_chars.append(blank)
                     continue
-                ch = row[mx]
-                visible = (mx, my) in local_visible
-                explored = (mx, my) in getattr(game, "explored", set())
-                # If fog_of_war is enabled, hide tiles that are neither visible nor explored.
-                explored_flag = explored or (not fog)
-                if not visible and not explored_flag:
-                    line_chars.append((' ', curses.color_pair(4))); continue
-
-                # Glyph choice: use lowercase for alphabetic tokens when not currently visible (smaller visual)
-                glyph = ch
-                if isinstance(ch, str) and ch.isalpha():
-                    if not visible and explored:
-                        glyph = ch.lower()
-                    else:
-                        glyph = ch
-
-                # Color choices (with biome-aware floor variants)
-                try:
-                    if ch == Display.WALL:
-                        color = curses.color_pair(5)
-                    elif ch in (getattr(Display, "GOLD", "G"), getattr(Display, "ARTIFACT", None), getattr(Display, "POTION", None)):
-                        color = curses.color_pair(3)
-                    elif ch == getattr(Display, "WRECKAGE", None):
-                        color = curses.color_pair(7)
-                    elif ch == getattr(Display, "TREE", "T"):
-                        color = curses.color_pair(8)
-                    elif ch == getattr(Display, "ROCK", "r"):
-                        # rocks / boulders render with a rocky glyph and distinct color
-                        color = curses.color_pair(15)
-                        glyph = '^'
-                    elif ch == getattr(Display, "FLOOR", '.'):
-                        # choose biome glyph/color when tile is a floor
-                        try:
-                            biome = None
-                            if getattr(game, 'map_biomes', None) and 0 <= my < len(game.map_biomes) and 0 <= mx < len(game.map_biomes[0]):
-                                biome = game.map_biomes[my][mx]
-                            if biome == 'forest':
-                                # grassy floor
-                                glyph = ',' if visible else ','
-                                color = curses.color_pair(10)
-                                line_chars.append((glyph, color)); continue
-                            elif biome == 'desert':
-                                glyph = '~' if visible else '~'
-                                color = curses.color_pair(14)
-                                line_chars.append((glyph, color)); continue
-                            elif biome == 'rocky':
-                                glyph = '^' if visible else '^'
-                                color = curses.color_pair(15)
-                                line_chars.append((glyph, color)); continue
-                            else:
-                                # plains / fallback
-                                color = curses.color_pair(4)
-                        except Exception:
-                            color = curses.color_pair(4)
-                    elif ch == getattr(Display, "SITH_TOMB", "X") or ch == getattr(Display, "SITH_ENTRANCE", "E"):
-                        color = curses.color_pair(6)
-                    else:
-                        color = curses.color_pair(4)
-                except Exception:
-                    color = curses.color_pair(4)
-                # If tile is not currently visible but has been explored, render it dimmer
-                try:
-                    attr = color
-                    if not visible:
-                        # explored but not visible -> dim the glyph
-                        attr = color | curses.A_DIM
-                    line_chars.append((glyph, attr))
-                except Exception:
-                    line_chars.append((glyph, color))
-
-            # overlays for this row: player, enemies, projectiles
-            player_vx = px - start_x
-            player_vy = py - start_y
-            if vy == player_vy and 0 <= player_vx < view_w:
-                if 0 <= player_vx < len(line_chars):
-                    # Player color changes based on dark corruption from artifacts
-                    try:
-                        corruption = getattr(game.player, 'dark_corruption', 0)
-                        if corruption >= 75:
-                            # Deep corruption - red/dark
-                            player_color = curses.color_pair(2) | curses.A_BOLD  # Red like enemies
-                        elif corruption >= 50:
-                            # Moderate corruption - orange/yellow
-                            player_color = curses.color_pair(3) | curses.A_BOLD  # Yellow
-                        elif corruption >= 25:
-                            # Light corruption - dim
-                            player_color = curses.color_pair(1) | curses.A_DIM  # Dimmed cyan
-                        else:
-                            # Pure - bright cyan
-                            player_color = curses.color_pair(1) | curses.A_BOLD  # Normal cyan
-                    except Exception:
-                        player_color = curses.color_pair(1) | curses.A_BOLD
-                    line_chars[player_vx] = ('@', player_color)
-
-            for e in getattr(game, "enemies", []):
-                try:
-                    if not getattr(e, "is_alive", lambda: False)(): continue
-                    ex, ey = getattr(e, "x", -1), getattr(e, "y", -1)
-                    if start_x <= ex < start_x + view_w and start_y <= ey < start_y + view_h:
-                        if (ex, ey) in local_visible:
-                            evx = ex - start_x; evy = ey - start_y
-                            if evy == vy and 0 <= evx < len(line_chars):
-                                line_chars[evx] = (getattr(e, "symbol", "E"), curses.color_pair(2) | curses.A_BOLD)
-                except Exception:
+                ch = row[vx]
+                if (mx, my) in local_visible:
+                    state = VIS_VISIBLE
+                elif (explored_row[vx] != 0 if explored_row is not None else (mx, my) in explored_map):
+                    state = VIS_EXPLORED
+                elif not fog:
+                    state = VIS_UNFOGGED
+                else:
+                    line_chars.append(blank)
                     continue
+                # only floor tiles take their look from the biome underneath
+                biome = None
+                if ch == floor_ch and vx < n_biome:
+                    biome = biome_row[vx]
+                key = (ch, biome, state)
+                cell = styles.get(key)
+                if cell is None:
+                    cell = styles[key] = _tile_style(ch, biome, state)
+                line_chars.append(cell)
 
-            try:
-                for p in list(getattr(game, "projectiles", []) or []):
-                    try:
-                        pxp, pyp = int(getattr(p, "x", -999)), int(getattr(p, "y", -999))
-                        if start_x <= pxp < start_x + view_w and start_y <= pyp < start_y + view_h:
-                            pvx = pxp - start_x; pvy = pyp - start_y
-                            if pvy == vy and 0 <= pvx < len(line_chars):
-                                sym = str(getattr(p, "symbol", "*"))
-                                # choose color based on owner (player vs enemy) when possible
-                                try:
-                                    owner = getattr(p, 'owner', None)
-                                    if owner is getattr(game, 'player', None):
-                                        col = curses.color_pair(11) | curses.A_BOLD
-                                    else:
-                                        col = curses.color_pair(12) | curses.A_BOLD
-                                except Exception:
-                                    col = curses.color_pair(9) | curses.A_BOLD
-                                line_chars[pvx] = (sym, col)
-                    except Exception:
-                        continue
-            except Exception:
-                pass
+            frame.append(line_chars)
 
-            # write this row to the panel
-            x = 1
-            for ch, color in line_chars:
-                try:
-                    panel.addstr(1 + vy, x, ch, color)
-                except curses.error:
-                    pass
-                x += 1
+        # overlay the player, enemies and projectiles, indexed once per frame
+        for (vx, vy), cell in _viewport_actors(game, px, py, start_x, start_y, view_w, view_h, local_visible).items():
+            if 0 <= vy < len(frame) and 0 <= vx < len(frame[vy]):
+                frame[vy][vx] = cell
+
+        # projectile animations in flight (see ui.animation_queue)
+        anims = getattr(game, "animations", None)
+        if anims:
+            for ax, ay, glyph, attr in anims.cells():
+                if start_x <= ax < start_x + view_w and start_y <= ay < start_y + view_h:
+                    frame[ay - start_y][ax - start_x] = (glyph, attr)
 
         # draw reticle if using abilities, grenades, or ranged weapons (after all rows drawn)
         is_targeting = (getattr(game, "pending_force_ability", None) is not None or 
@@ -281,8 +428,7 @@ def draw_map_panel(game):
             tx, ty = getattr(game, "target_x", 0), getattr(game, "target_y", 0)
             if start_x <= tx < start_x + view_w and start_y <= ty < start_y + view_h:
                 cvx = tx - start_x; cvy = ty - start_y
-                try: panel.addstr(1 + cvy, 1 + cvx, 'X', curses.color_pair(9) | curses.A_REVERSE | curses.A_BOLD)
-                except curses.error: pass
+                frame[cvy][cvx] = ('X', curses.color_pair(9) | curses.A_REVERSE | curses.A_BOLD)
 
         # HUD arrow: draw a subtle compass arrow at the edge of the map panel
         try:
@@ -329,20 +475,20 @@ def draw_map_panel(game):
                         ay, ax = pos
                         ay = max(1, min(view_h, ay))
                         ax = max(1, min(view_w - 1, ax))
-                        panel.addstr(ay, 1 + ax, arrow, curses.color_pair(3) | curses.A_BOLD)
+                        frame[ay - 1][ax] = (arrow, curses.color_pair(3) | curses.A_BOLD)
                     except Exception:
                         pass
         except Exception:
             pass
 
-        # draw per-map popups (positioned over tiles) and age them
-        # advance popup ages and purge expired entries
-        try:
-            game.ui.tick_popups()
-        except Exception:
-            pass
+        # draw per-map popups (positioned over tiles); they are aged per turn
+        # by GameManager.run, and only those anchored in the viewport are visited
         if getattr(game, "show_popups", False):
-            for p in list(getattr(game.ui, "popups", []) or []):
+            popups = getattr(game.ui, "popups", None)
+            in_rect = getattr(popups, "in_rect", None)
+            if in_rect is not None:
+                popups = in_rect(start_x, start_y, start_x + view_w, start_y + view_h)
+            for p in list(popups or []):
                 try:
                     pxp = int(p.get("x", -999))
                     pyp = int(p.get("y", -999))
@@ -351,24 +497,73 @@ def draw_map_panel(game):
                     # draw the popup only if within current viewport
                     if start_x <= pxp < start_x + view_w and start_y <= pyp < start_y + view_h:
                         pvx = pxp - start_x; pvy = pyp - start_y
-                        # attempt to draw the text at the tile (clamped to view width)
-                        try:
-                            panel.addstr(1 + pvy, 1 + pvx, text[: max(1, min(len(text), view_w - pvx))], curses.color_pair(col) | curses.A_BOLD)
-                        except Exception:
-                            pass
+                        # lay the text over the tiles from the popup position (clamped to view width)
+                        attr = curses.color_pair(col) | curses.A_BOLD
+                        row = frame[pvy]
+                        for i, ch in enumerate(text[: max(1, min(len(text), view_w - pvx))]):
+                            row[pvx + i] = (ch, attr)
                 except Exception:
                     # ignore malformed popup entries
                     pass
-        try: panel.refresh()
+        buf.put_rows(frame)
+        # stage the panel (touched in full so overlays closed since the last frame
+        # are painted over); draw() pushes all panels with one doupdate()
+        try:
+            panel.touchwin()
+            panel.noutrefresh()
         except curses.error: pass
     except Exception:
         pass
 
+_TOKEN_NAMES = {"v": "Vibroblade", "s": "Energy Shield", "b": "Blaster Pistol"}
+
+
+def _item_name(item):
+    try:
+        if isinstance(item, str):
+            return _TOKEN_NAMES.get(item, item)
+        if isinstance(item, dict):
+            return item.get('name', str(item))
+        return getattr(item, 'name', str(item))
+    except Exception:
+        try: return str(item)
+        except Exception: return 'Unknown'
+
+
+def _stats_content(game):
+    """(stats lines, has level line, inventory names) for the stats panel.
+
+    Formatting the player's stats and inventory is the expensive part of the
+    panel, so the result is cached on the UI and rebuilt only when
+    `Player.state_version` changes (players without one are never cached).
+    """
+    player = game.player
+    version = getattr(player, 'state_version', None)
+    key = (id(player), version) if version is not None else None
+    cached = getattr(game.ui, 'stats_cache', None)
+    if key is not None and cached is not None and cached[0] == key:
+        return cached[1]
+    stats_lines = player.get_stats_display()
+    if isinstance(stats_lines, str): stats_lines = stats_lines.splitlines()
+    elif not isinstance(stats_lines, (list, tuple)):
+        try: stats_lines = list(stats_lines)
+        except Exception: stats_lines = [str(stats_lines)]
+    lower_lines = "\n".join(stats_lines).lower()
+    has_lvl = ("level" in lower_lines) or ("xp" in lower_lines) or ("experience" in lower_lines)
+    content = (stats_lines, has_lvl, [_item_name(item) for item in player.inventory])
+    if key is not None:
+        try:
+            game.ui.stats_cache = (key, content)
+        except Exception:
+            pass
+    return content
+
+
 def draw_stats_panel(game):
     panel = getattr(game.ui, "panels", {}).get("stats")
     if not panel: return
     try:
-        panel.clear(); panel.border()
+        panel.erase(); panel.border()
         # ASCII art header with Jedi symbol
         try:
             panel.addstr(0, 2, "╣", curses.A_BOLD)
@@ -390,15 +585,9 @@ def draw_stats_panel(game):
                     except Exception: pass
         except Exception:
             pass
-        stats_lines = game.player.get_stats_display()
-        if isinstance(stats_lines, str): stats_lines = stats_lines.splitlines()
-        elif not isinstance(stats_lines, (list, tuple)):
-            try: stats_lines = list(stats_lines)
-            except Exception: stats_lines = [str(stats_lines)]
+        stats_lines, has_lvl, inv_names = _stats_content(game)
         for i, line in enumerate(stats_lines[: panel.getmaxyx()[0] - 3]):
             panel.addstr(1 + i, 2, str(line)[: panel.getmaxyx()[1] - 4])
-        lower_lines = "\n".join(stats_lines).lower()
-        has_lvl = ("level" in lower_lines) or ("xp" in lower_lines) or ("experience" in lower_lines)
         ph = panel.getmaxyx()[0]; left = 2; cur_row = 1 + len(stats_lines)
         if not has_lvl:
             try:
@@ -517,21 +706,9 @@ def draw_stats_panel(game):
             inv_start = cur_row
         panel.addstr(inv_start, 2, "-" * (panel.getmaxyx()[1] - 4))
         panel.addstr(inv_start + 1, 2, "Inventory:", curses.A_UNDERLINE)
-        token_names = {"v": "Vibroblade", "s": "Energy Shield", "b": "Blaster Pistol"}
+        token_names = _TOKEN_NAMES
         inv_lines_limit = max(0, panel.getmaxyx()[0] - inv_start - 3)
-        def _item_name(item):
-            try:
-                if isinstance(item, str):
-                    return token_names.get(item, item)
-                if isinstance(item, dict):
-                    return item.get('name', str(item))
-                return getattr(item, 'name', str(item))
-            except Exception:
-                try: return str(item)
-                except Exception: return 'Unknown'
-
-        for i, item in enumerate(game.player.inventory[: inv_lines_limit]):
-            name = _item_name(item)
+        for i, name in enumerate(inv_names[: inv_lines_limit]):
             panel.addstr(inv_start + 2 + i, 2, f"- {name}"[: panel.getmaxyx()[1] - 4])
         try:
             panel.addstr(inv_start + 2 + inv_lines_limit, 2, "-" * (panel.getmaxyx()[1] - 4))
@@ -668,9 +845,9 @@ def draw_stats_panel(game):
             ahead_desc = None
             # enemy first
             try:
-                for e in getattr(game, 'enemies', []) or []:
+                for e in occupants(game, fx, fy):
                     try:
-                        if int(getattr(e, 'x', -999)) == fx and int(getattr(e, 'y', -999)) == fy and getattr(e, 'is_alive', (lambda: True))():
+                        if getattr(e, 'is_alive', (lambda: True))():
                             ename = getattr(e, 'name', str(e))
                             lvl = getattr(e, 'level', None)
                             if lvl is not None:
@@ -686,7 +863,7 @@ def draw_stats_panel(game):
             # item on map
             if ahead_desc is None:
                 try:
-                    for it in getattr(game, 'items_on_map', []) or []:
+                    for it in items_at(game, fx, fy):
                         try:
                             if int(it.get('x', -999)) == fx and int(it.get('y', -999)) == fy:
                                 # try to resolve name from item defs or token map
@@ -758,14 +935,14 @@ def draw_stats_panel(game):
                 except Exception: pass
         except Exception:
             pass
-        panel.refresh()
+        panel.noutrefresh()
     except curses.error: pass
 
 def draw_abilities_panel(game):
     panel = getattr(game.ui, "panels", {}).get("abilities")
     if not panel: return
     try:
-        panel.clear(); panel.border()
+        panel.erase(); panel.border()
         # ASCII art header with Force symbol
         try:
             panel.addstr(0, 2, "╣", curses.A_BOLD)
@@ -795,7 +972,7 @@ def draw_abilities_panel(game):
             a_name = getattr(a, "name", str(a))
             cost = getattr(a, "base_cost", getattr(a, "cost", ""))
             panel.addstr(1 + i, 2, f"{a_name} (Cost:{cost})"[: panel.getmaxyx()[1] - 4])
-        panel.refresh()
+        panel.noutrefresh()
     except curses.error: pass
 
 def draw_commands_panel(game):
@@ -820,7 +997,7 @@ def draw_commands_panel(game):
                 panel = None
         if not panel:
             return
-        panel.clear(); panel.border()
+        panel.erase(); panel.border()
         # ASCII art header with action symbol
         try:
             panel.addstr(0, 2, "╣", curses.A_BOLD)
@@ -833,7 +1010,7 @@ def draw_commands_panel(game):
         cmds = [
             "Move: ↑↓←→ hjkl  Diag: yubn │ g:Get  e:Equip  u:Use  d:Drop  i:Inventory",
             "Combat: Walk=melee  F:Shoot(2-7 tiles)  t:Grenade │ f:Force  m:Meditate  C:Craft",
-            "Info: x:Inspect  j:Journal  K:Codex  S:Stats │ ?:Help  Q:Quit"
+            "Info: x:Inspect  j:Journal  K:Codex  M:Map  S:Stats │ ?:Help  Q:Quit"
         ]
         
         ph, pw = panel.getmaxyx()
@@ -844,64 +1021,25 @@ def draw_commands_panel(game):
                 panel.addstr(1 + i, 2, display_line)
             except Exception: 
                 pass
-        try: panel.refresh()
+        try: panel.noutrefresh()
         except Exception: pass
     except curses.error:
         pass
 
 def animate_projectile(game, sx, sy, ex, ey, symbol='*', delay=0.03, color_pair=9):
-    """Animate a projectile from (sx,sy) to (ex,ey) on the map panel (non-blocking UI restore)."""
+    """Queue a projectile animation from (sx,sy) to (ex,ey); returns immediately.
+
+    The bolt is drawn by draw_map_panel, one tile every `delay` seconds, as
+    the main loop advances the game's animation queue between input polls.
+    """
     try:
-        import time, curses
-        panel = game.ui.panels.get('map') if getattr(game.ui, "panels", None) else None
-        if not panel:
-            panel = game.stdscr
-        ph, pw = panel.getmaxyx()
-        view_h = max(1, ph - 2)
-        view_w = max(1, pw - 2)
-        # viewport like draw_map_panel (center on player)
-        map_h = len(game.game_map)
-        map_w = len(game.game_map[0]) if map_h else 0
-        px = max(0, min(getattr(game.player, "x", 0), map_w - 1 if map_w else 0))
-        py = max(0, min(getattr(game.player, "y", 0), map_h - 1 if map_h else 0))
-        half_w = view_w // 2
-        half_h = view_h // 2
-        start_x = px - half_w
-        start_y = py - half_h
-        if map_w <= view_w:
-            start_x = 0
-        else:
-            start_x = max(0, min(start_x, map_w - view_w))
-        if map_h <= view_h:
-            start_y = 0
-        else:
-            start_y = max(0, min(start_y, map_h - view_h))
-        # animate along Bresenham points
-        for x, y in _bresenham_line(sx, sy, ex, ey):
-            if start_x <= x < start_x + view_w and start_y <= y < start_y + view_h:
-                vx = x - start_x
-                vy = y - start_y
-                try:
-                    panel.addstr(1 + vy, 1 + vx, symbol, curses.color_pair(color_pair) | curses.A_BOLD)
-                except Exception:
-                    pass
-                try:
-                    panel.refresh()
-                except Exception:
-                    pass
-                # small pause to show travel; very short to avoid blocking UI too long
-                try: time.sleep(delay)
-                except Exception: pass
-        # final redraw to restore correct tiles / actors
-        try:
-            draw(game)
-        except Exception:
-            # best-effort fallback to map panel refresh
-            try: panel.refresh()
-            except Exception: pass
+        path = list(_bresenham_line(sx, sy, ex, ey))
+        if len(path) > 1:
+            path = path[1:]     # start on the tile after the shooter
+        animation_queue(game).add(path, symbol, curses.color_pair(color_pair) | curses.A_BOLD, delay)
+        sched = getattr(game, "frame_scheduler", None)
+        if sched is not None:
+            sched.mark('map')
     except Exception:
         # don't raise from animation
-        try:
-            draw(game)
-        except Exception:
-            pass
\ No newline at end of file
+        pass
@@ -0,0 +1,439 @@
+"""Chunked storage and indexing for the surface world.
+
+The surface map can be thousands of tiles across, but almost all of it is
+solid rock around a comparatively small explored area. `ChunkedTileGrid`
+splits the map into fixed-size square chunks:
+
+* chunks that were never written read as the fill glyph and cost nothing;
+* chunks can be produced lazily by a `generator` the first time they are
+  touched (used for the biome layer);
+* `stream_around` compresses chunks far from the player into a zlib cache,
+  and they are transparently restored when accessed again.
+
+`ChunkIndex` buckets the items lying on the map by chunk. The game keeps
+`items_on_map` bound to one (see `occupancy.bind_actors`), so drops,
+pickups and spawns update it as they happen and `items_at` / `in_rect`
+never walk the whole item list. Enemies are indexed the same way by the
+game's `OccupancyIndex`.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jedi_fugitive.game.tile_grid import TileGrid
+
+CHUNK_SIZE = 64
+
+Point = Tuple[int, int]
+ChunkKey = Tuple[int, int]
+
+
+class ChunkedRow:
+    """Row view of a `ChunkedTileGrid` supporting `row[x]` get/set."""
+
+    __slots__ = ("_grid", "_y", "_cy", "_ry")
+
+    def __init__(self, grid: "ChunkedTileGrid", y: int):
+        self._grid = grid
+        self._y = y
+        self._cy, self._ry = divmod(y, grid.chunk_size)
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __getitem__(self, x):
+        grid = self._grid
+        w = grid.width
+        if isinstance(x, slice):
+            start, stop, step = x.indices(w)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._span(start, stop)
+        if x < 0:
+            x += w
+        if x < 0 or x >= w:
+            raise IndexError("tile row index out of range")
+        cs = grid.chunk_size
+        cx, rx = divmod(x, cs)
+        chunk = grid._hot.get((cx, self._cy))
+        if chunk is None:
+            chunk = grid._load(cx, self._cy, False)
+            if chunk is None:
+                return grid._palette[grid._fill_code]
+        return grid._palette[chunk[self._ry * cs + rx]]
+
+    def _span(self, start: int, stop: int) -> List[str]:
+        """Glyphs of columns start..stop-1, decoded a chunk-wide slice at a time."""
+        grid = self._grid
+        cs = grid.chunk_size
+        pal = grid._palette
+        base = self._ry * cs
+        out: List[str] = []
+        x = start
+        while x < stop:
+            cx, rx = divmod(x, cs)
+            n = min(cs - rx, stop - x)
+            chunk = grid._hot.get((cx, self._cy))
+            if chunk is None:
+                chunk = grid._load(cx, self._cy, False)
+            if chunk is None:
+                out.extend([pal[grid._fill_code]] * n)
+            else:
+                out.extend([pal[c] for c in chunk[base + rx:base + rx + n]])
+            x += n
+        return out
+
+    def __setitem__(self, x, glyph) -> None:
+        w = self._grid.width
+        if isinstance(x, slice):
+            for i, g in zip(range(*x.indices(w)), glyph):
+                self[i] = g
+            return
+        if x < 0:
+            x += w
+        if x < 0 or x >= w:
+            raise IndexError("tile row assignment index out of range")
+        self._grid._write(x, self._y, glyph)
+
+    def __iter__(self) -> Iterator[str]:
+        for x in range(self._grid.width):
+            yield self[x]
+
+
+class ChunkedTileGrid:
+    """Sparse, chunked tile map with the same `grid[y][x]` idiom as TileGrid.
+
+    `generator(x0, y0, w, h)`, when given, is called the first time a chunk
+    is accessed and may return the chunk contents as rows of glyphs (a
+    TileGrid or list of lists) or None to leave the chunk as fill. The
+    generator is pickled with the grid, so saved grids need a picklable
+    generator (a module-level function or callable object, not a lambda).
+
+    `on_write(x, y, old, new)`, when set, is called after every write that
+    changes a tile; it is not pickled.
+    """
+
+    def __init__(self, width: int, height: int, fill: str = "#", chunk_size: int = CHUNK_SIZE,
+                 generator: Optional[Callable[[int, int, int, int], object]] = None, keep_radius: int = 3):
+        self.width = max(0, int(width))
+        self.height = max(0, int(height))
+        self.chunk_size = max(8, int(chunk_size))
+        self.generator = generator
+        self.keep_radius = max(1, int(keep_radius))
+        self.revision = 0
+        self.on_write: Optional[Callable[[int, int, str, str], None]] = None
+        self._palette: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._fill_code = self.code_for(fill)
+        self._hot: Dict[ChunkKey, bytearray] = {}
+        self._cold: Dict[ChunkKey, bytes] = {}
+        self._blank = set()          # chunks the generator left as plain fill
+        self._stream_center: Optional[ChunkKey] = None
+        self._rows = [ChunkedRow(self, y) for y in range(self.height)]
+
+    # -- palette / chunk plumbing -------------------------------------------------
+    def code_for(self, glyph) -> int:
+        try:
+            return self._codes[glyph]
+        except KeyError:
+            pass
+        if len(self._palette) >= 256:
+            raise ValueError("ChunkedTileGrid palette is full (256 glyphs)")
+        code = len(self._palette)
+        self._palette.append(glyph)
+        self._codes[glyph] = code
+        return code
+
+    @property
+    def palette(self) -> List[str]:
+        return self._palette
+
+    @property
+    def fill_code(self) -> int:
+        return self._fill_code
+
+    def chunk_codes(self, cx: int, cy: int) -> Optional[bytearray]:
+        """Tile codes of chunk (cx, cy), row-major and `chunk_size` wide; None when it is all fill."""
+        return self._load(cx, cy, False)
+
+    def _load(self, cx: int, cy: int, create: bool) -> Optional[bytearray]:
+        key = (cx, cy)
+        chunk = self._hot.get(key)
+        if chunk is not None:
+            return chunk
+        packed = self._cold.pop(key, None)
+        if packed is not None:
+            chunk = bytearray(zlib.decompress(packed))
+            self._hot[key] = chunk
+            return chunk
+        if self.generator is not None and key not in self._blank:
+            chunk = self._generate(cx, cy)
+            if chunk is not None:
+                self._hot[key] = chunk
+                return chunk
+            self._blank.add(key)
+        if not create:
+            return None
+        chunk = bytearray((self._fill_code,)) * (self.chunk_size * self.chunk_size)
+        self._hot[key] = chunk
+        return chunk
+
+    def _generate(self, cx: int, cy: int) -> Optional[bytearray]:
+        cs = self.chunk_size
+        x0, y0 = cx * cs, cy * cs
+        w = min(cs, self.width - x0)
+        h = min(cs, self.height - y0)
+        if w <= 0 or h <= 0:
+            return None
+        rows = self.generator(x0, y0, w, h)
+        if rows is None:
+            return None
+        chunk = bytearray((self._fill_code,)) * (cs * cs)
+        if isinstance(rows, TileGrid):
+            table = bytes(self.code_for(g) for g in rows.palette).ljust(256, b"\x00")
+            src = rows.data
+            for ry in range(h):
+                chunk[ry * cs:ry * cs + w] = src[ry * rows.width:ry * rows.width + w].translate(table)
+        else:
+            for ry in range(h):
+                row = rows[ry]
+                for rx in range(w):
+                    chunk[ry * cs + rx] = self.code_for(row[rx])
+        return chunk
+
+    def _write(self, x: int, y: int, glyph) -> None:
+        code = self.code_for(glyph)
+        cs = self.chunk_size
+        cx, rx = divmod(x, cs)
+        cy, ry = divmod(y, cs)
+        chunk = self._hot.get((cx, cy))
+        if chunk is None:
+            chunk = self._load(cx, cy, False)
+            if chunk is None:
+                if code == self._fill_code:
+                    return
+                chunk = self._load(cx, cy, True)
+        i = ry * cs + rx
+        old = chunk[i]
+        if old != code:
+            chunk[i] = code
+            self.revision += 1
+            if self.on_write is not None:
+                self.on_write(x, y, self._palette[old], glyph)
+
+    # -- list-of-lists compatibility ---------------------------------------------
+    def __len__(self) -> int:
+        return self.height
+
+    def __bool__(self) -> bool:
+        return self.height > 0
+
+    def __getitem__(self, y):
+        return self._rows[y]
+
+    def __iter__(self) -> Iterator[ChunkedRow]:
+        return iter(self._rows)
+
+    def get(self, x: int, y: int, default: Optional[str] = None) -> Optional[str]:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self._rows[y][x]
+        return default
+
+    def set(self, x: int, y: int, glyph: str) -> None:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("tile index out of range")
+        self._write(x, y, glyph)
+
+    def paste_row(self, x: int, y: int, glyphs: Iterable[str]) -> None:
+        if not (0 <= y < self.height):
+            return
+        for i, g in enumerate(glyphs):
+            xx = x + i
+            if xx >= self.width:
+                break
+            if xx >= 0:
+                self._write(xx, y, g)
+
+    def positions_of(self, glyph) -> Iterator[Point]:
+        """Yield every (x, y) holding `glyph` in row-major order.
+
+        Only stored chunks are scanned, so this is proportional to the
+        touched part of the world rather than its full area. Asking for the
+        fill glyph of a sparse grid is not supported (it would be every
+        untouched tile) and yields nothing from untouched chunks.
+        """
+        code = self._codes.get(glyph)
+        if code is None:
+            return
+        cs = self.chunk_size
+        by_row: Dict[int, List[int]] = {}
+        for (cx, cy) in list(self._hot) + list(self._cold):
+            by_row.setdefault(cy, []).append(cx)
+        for cy in sorted(by_row):
+            cxs = sorted(by_row[cy])
+            chunks = [(cx, self._load(cx, cy, False)) for cx in cxs]
+            for ry in range(min(cs, self.height - cy * cs)):
+                y = cy * cs + ry
+                for cx, chunk in chunks:
+                    if chunk is None:
+                        continue
+                    w = min(cs, self.width - cx * cs)
+                    lo = ry * cs
+                    i = chunk.find(code, lo, lo + w)
+                    while i != -1:
+                        yield (cx * cs + i - lo, y)
+                        i = chunk.find(code, i + 1, lo + w)
+
+    # -- streaming -----------------------------------------------------------------
+    def stream_around(self, x: int, y: int) -> int:
+        """Compress chunks outside `keep_radius` chunks of (x, y); return how many.
+
+        Only does work when the player changes chunk or when stray reads have
+        left too many chunks decompressed.
+        """
+        cs = self.chunk_size
+        center = (int(x) // cs, int(y) // cs)
+        r = self.keep_radius
+        if center == self._stream_center and len(self._hot) <= (2 * r + 3) ** 2:
+            return 0
+        self._stream_center = center
+        evicted = 0
+        for key in list(self._hot):
+            if max(abs(key[0] - center[0]), abs(key[1] - center[1])) > r:
+                self._cold[key] = zlib.compress(bytes(self._hot.pop(key)), 1)
+                evicted += 1
+        return evicted
+
+    def memory_stats(self) -> Dict[str, int]:
+        """Return counts and byte totals for hot and compressed chunks."""
+        cs2 = self.chunk_size * self.chunk_size
+        return {
+            "hot_chunks": len(self._hot),
+            "cold_chunks": len(self._cold),
+            "hot_bytes": len(self._hot) * cs2,
+            "cold_bytes": sum(len(v) for v in self._cold.values()),
+        }
+
+    def to_rows(self) -> List[List[str]]:
+        return [list(row) for row in self._rows]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop("_rows", None)
+        state["on_write"] = None
+        cold = dict(self._cold)
+        for key, chunk in self._hot.items():
+            cold[key] = zlib.compress(bytes(chunk), 1)
+        state["_cold"] = cold
+        state["_hot"] = {}
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._rows = [ChunkedRow(self, y) for y in range(self.height)]
+
+    def __repr__(self) -> str:
+        return "ChunkedTileGrid(%dx%d, %d hot / %d cold chunks)" % (
+            self.width, self.height, len(self._hot), len(self._cold))
+
+
+def _entry_pos(entry) -> Optional[Point]:
+    try:
+        if isinstance(entry, dict):
+            return (int(entry['x']), int(entry['y']))
+        return (int(entry.x), int(entry.y))
+    except Exception:
+        return None
+
+
+class ChunkIndex:
+    """Map entries (item dicts or objects with x/y) bucketed by chunk.
+
+    Has the add/discard/rebuild interface of `OccupancyIndex`, so an
+    `ActorList` can keep it in step with a list of entries. Entries are
+    expected to stay where they were put; ones without a position are
+    ignored.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = max(1, int(chunk_size))
+        self._buckets: Dict[ChunkKey, Dict[int, object]] = {}
+        self._where: Dict[int, Point] = {}
+
+    def add(self, entry) -> None:
+        key = id(entry)
+        if key in self._where:
+            return
+        pos = _entry_pos(entry)
+        if pos is None:
+            return
+        self._where[key] = pos
+        cs = self.chunk_size
+        self._buckets.setdefault((pos[0] // cs, pos[1] // cs), {})[key] = entry
+
+    def discard(self, entry) -> None:
+        pos = self._where.pop(id(entry), None)
+        if pos is None:
+            return
+        cs = self.chunk_size
+        chunk = (pos[0] // cs, pos[1] // cs)
+        bucket = self._buckets.get(chunk)
+        if bucket is not None:
+            bucket.pop(id(entry), None)
+            if not bucket:
+                del self._buckets[chunk]
+
+    def rebuild(self, entries: Iterable) -> None:
+        self._buckets.clear()
+        self._where.clear()
+        for entry in entries:
+            if entry is not None:
+                self.add(entry)
+
+    def at(self, x: int, y: int) -> List[object]:
+        """Entries on (x, y), in the order they were added."""
+        cs = self.chunk_size
+        bucket = self._buckets.get((x // cs, y // cs)) or {}
+        return [e for key, e in bucket.items() if self._where[key] == (x, y)]
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[object]:
+        """Entries in columns x0..x1-1 and rows y0..y1-1, visiting only the chunks that overlap."""
+        if x1 <= x0 or y1 <= y0:
+            return []
+        cs = self.chunk_size
+        found = []
+        for cy in range(y0 // cs, (y1 - 1) // cs + 1):
+            for cx in range(x0 // cs, (x1 - 1) // cs + 1):
+                for key, entry in (self._buckets.get((cx, cy)) or {}).items():
+                    x, y = self._where[key]
+                    if x0 <= x < x1 and y0 <= y < y1:
+                        found.append(entry)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+
+def items_at(game, x: int, y: int) -> List[object]:
+    """Items lying on (x, y): a chunk lookup, or a scan of `game.items_on_map`."""
+    items = getattr(game, 'items_on_map', None)
+    index = getattr(items, 'index', None)
+    if isinstance(index, ChunkIndex):
+        return index.at(x, y)
+    return [it for it in items or () if it is not None and _entry_pos(it) == (x, y)]
+
+
+def tile_positions(game_map, glyph) -> Iterator[Point]:
+    """Yield (x, y) of every `glyph` tile in row-major order for any map type."""
+    finder = getattr(game_map, 'positions_of', None)
+    if finder is not None:
+        yield from finder(glyph)
+        return
+    for y, row in enumerate(game_map or []):
+        for x, ch in enumerate(row):
+            if ch == glyph:
+                yield (x, y)
+
+
+__all__ = ["CHUNK_SIZE", "ChunkedTileGrid", "ChunkedRow", "ChunkIndex", "items_at", "tile_positions"]
@@ -0,0 +1,177 @@
+"""World seeds, per-stage random streams and the on-disk world cache.
+
+A world is fully described by its seed plus the generation parameters on
+the game object (`crash_inflate`, `outer_map_scale`, densities...). Each
+generation stage draws from its own stream derived from the seed, so
+tuning one stage (say, tree density) does not reshuffle every later stage.
+
+Generated worlds can be written to a cache directory keyed by seed and
+parameters; regenerating the same configuration then just loads the file.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from jedi_fugitive.utils.file_utils import load_from_file, save_to_file
+
+log = logging.getLogger(__name__)
+
+# bump when the generator or the cached state layout changes
+WORLD_FORMAT_VERSION = 2
+
+# generation knobs read from the game object; all of them key the cache
+WORLD_PARAMS = (
+    'crash_inflate', 'outer_map_scale', 'randomize_map_size', 'walkable_expansion',
+    'walkable_expansion_base_chance', 'max_trees', 'tree_density_floor_forest',
+    'tree_density_floor', 'rock_density_floor', 'desert_rock_density', 'player_clear_radius',
+    'guard_patrol_chance', 'crash_guard_patrol_chance', 'poi_hint_radius', 'lightsaber_weight',
+)
+
+# game attributes produced by map_features.generate_world
+WORLD_STATE_ATTRS = (
+    'game_map', 'map_biomes', 'tomb_entrances', 'map_landmarks', 'map_lore', 'enemies',
+    'items_on_map', 'ship_pos', 'comms_pos',
+)
+
+
+def derive_seed(seed, *parts) -> int:
+    """Stable 63-bit seed for a named sub-stream of `seed`."""
+    text = "/".join(str(p) for p in (seed,) + parts)
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big") >> 1
+
+
+def stage_rng(seed, *parts) -> random.Random:
+    """Dedicated Random instance for one generation stage."""
+    return random.Random(derive_seed(seed, *parts))
+
+
+def reseed_stage(seed, *parts) -> None:
+    """Point the global `random` module at the stream for a generation stage.
+
+    Generation code (and the enemy factories it calls) uses the module-level
+    functions, so stages switch streams by reseeding it; callers restore the
+    previous state with `seeded_global_random`.
+    """
+    random.seed(derive_seed(seed, *parts))
+
+
+@contextmanager
+def seeded_global_random(seed, *parts):
+    """Run a block on a seeded global RNG stream, restoring the prior state after."""
+    state = random.getstate()
+    reseed_stage(seed, *parts)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def resolve_world_seed(game) -> int:
+    """Return the game's world seed, choosing and recording one if unset.
+
+    Order: `game.world_seed`, the JEDI_FUGITIVE_SEED environment variable,
+    config.WORLD_SEED, then a fresh random seed.
+    """
+    seed = getattr(game, 'world_seed', None)
+    if seed is None:
+        seed = os.environ.get('JEDI_FUGITIVE_SEED') or None
+    if seed is None:
+        try:
+            from jedi_fugitive.config import WORLD_SEED
+            seed = WORLD_SEED
+        except Exception:
+            seed = None
+    try:
+        seed = int(seed) if seed is not None else random.SystemRandom().randrange(1 << 31)
+    except (TypeError, ValueError):
+        seed = derive_seed(seed)
+    try:
+        game.world_seed = seed
+    except Exception:
+        pass
+    return seed
+
+
+def world_params(game) -> Dict[str, object]:
+    """Generation parameters that identify a world (besides its seed)."""
+    params = {name: getattr(game, name, None) for name in WORLD_PARAMS}
+    params['player_level'] = getattr(getattr(game, 'player', None), 'level', 1)
+    params['format'] = WORLD_FORMAT_VERSION
+    return params
+
+
+class WorldCache:
+    """Directory of pickled worlds keyed by seed and generation parameters."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @classmethod
+    def for_game(cls, game) -> Optional["WorldCache"]:
+        """Cache configured for `game`, or None when caching is disabled.
+
+        Order: `game.world_cache_dir`, JEDI_FUGITIVE_WORLD_CACHE, config.WORLD_CACHE_DIR.
+        """
+        directory = getattr(game, 'world_cache_dir', None) or os.environ.get('JEDI_FUGITIVE_WORLD_CACHE')
+        if not directory:
+            try:
+                from jedi_fugitive.config import WORLD_CACHE_DIR
+                directory = WORLD_CACHE_DIR
+            except Exception:
+                directory = None
+        return cls(directory) if directory else None
+
+    def path_for(self, seed, params: Dict[str, object]) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"world-{seed}-{digest}.pkl")
+
+    def load_into(self, game, seed) -> bool:
+        """Restore a cached world onto `game`; return False on a miss."""
+        path = self.path_for(seed, world_params(game))
+        if not os.path.exists(path):
+            return False
+        try:
+            snapshot = load_from_file(path)
+        except Exception:
+            return False
+        if not isinstance(snapshot, dict) or snapshot.get('seed') != seed:
+            return False
+        for name, value in snapshot.get('state', {}).items():
+            setattr(game, name, value)
+        try:
+            game.player.x, game.player.y = snapshot['player_pos']
+        except Exception:
+            pass
+        return True
+
+    def store(self, game, seed) -> Optional[str]:
+        """Write the generated world for `game`; return the path or None on failure (logged)."""
+        path = self.path_for(seed, world_params(game))
+        snapshot = {
+            'seed': seed,
+            'state': {name: getattr(game, name) for name in WORLD_STATE_ATTRS if hasattr(game, name)},
+            'player_pos': (getattr(game.player, 'x', 0), getattr(game.player, 'y', 0)),
+        }
+        tmp = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            save_to_file(snapshot, tmp)
+            os.replace(tmp, path)
+            return path
+        except Exception as exc:
+            log.warning("world cache: could not store seed %s in %s: %s", seed, path, exc)
+            try:
+                os.remove(tmp)
+            except Exception:
+                pass
+            return None
+
+
+__all__ = ["WORLD_FORMAT_VERSION", "WORLD_PARAMS", "WORLD_STATE_ATTRS", "derive_seed", "stage_rng",
+           "reseed_stage", "seeded_global_random", "resolve_world_seed", "world_params", "WorldCache"]
@@ -0,0 +1,103 @@
+"""Timed map animations advanced by the main loop.
+
+Projectile animations used to draw a bolt tile by tile with a `time.sleep`
+between steps, blocking input for the whole flight of every shot. An
+`AnimationQueue` instead records each animation with its start time; the
+renderer overlays whatever is in flight on the next frame, and the main
+loop polls input with a timeout (`wait_ms()`) so it wakes up in time for
+the next step. Any number of bolts animate at once and game turns never
+wait for them.
+"""
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+Point = Tuple[int, int]
+Cell = Tuple[int, int, str, int]   # (map x, map y, glyph, attr)
+
+
+class Animation:
+    """A glyph moving along `path`, one tile every `delay` seconds."""
+
+    __slots__ = ("path", "symbol", "attr", "delay", "start")
+
+    def __init__(self, path: Sequence[Point], symbol: str, attr: int, delay: float, start: float):
+        self.path = list(path)
+        self.symbol = symbol
+        self.attr = attr
+        self.delay = max(0.001, float(delay))
+        self.start = start
+
+    def step(self, now: float) -> int:
+        return int((now - self.start) / self.delay)
+
+    def done(self, now: float) -> bool:
+        return self.step(now) >= len(self.path)
+
+    def next_step_at(self, now: float) -> float:
+        return self.start + (self.step(now) + 1) * self.delay
+
+
+class AnimationQueue:
+    """Animations in flight on the map, keyed to a monotonic clock."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._active: List[Animation] = []
+        self._shown: Tuple[Cell, ...] = ()
+
+    def add(self, path: Sequence[Point], symbol: str = '*', attr: int = 0, delay: float = 0.03) -> Optional[Animation]:
+        """Start animating `symbol` along `path` now; returns None for an empty path."""
+        if not path:
+            return None
+        anim = Animation(path, symbol, attr, delay, self.clock())
+        self._active.append(anim)
+        return anim
+
+    def cells(self, now: Optional[float] = None) -> List[Cell]:
+        """Glyphs to overlay on the map at time `now`, oldest animation first."""
+        now = self.clock() if now is None else now
+        out = []
+        for anim in self._active:
+            i = anim.step(now)
+            if 0 <= i < len(anim.path):
+                x, y = anim.path[i]
+                out.append((x, y, anim.symbol, anim.attr))
+        return out
+
+    def advance(self, now: Optional[float] = None) -> bool:
+        """Drop finished animations; True when the overlay changed since the last call."""
+        now = self.clock() if now is None else now
+        self._active = [a for a in self._active if not a.done(now)]
+        shown = tuple(self.cells(now))
+        changed = shown != self._shown
+        self._shown = shown
+        return changed
+
+    def wait_ms(self, now: Optional[float] = None) -> Optional[int]:
+        """Milliseconds until some animation moves, or None when nothing is animating."""
+        if not self._active:
+            return None
+        now = self.clock() if now is None else now
+        nxt = min(a.next_step_at(now) for a in self._active)
+        return max(0, int((nxt - now) * 1000 + 0.999))
+
+    def clear(self) -> None:
+        self._active = []
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+
+def animation_queue(game) -> AnimationQueue:
+    """Return the animation queue kept on `game` (created on first use)."""
+    queue = getattr(game, "animations", None)
+    if queue is None:
+        queue = AnimationQueue()
+        try:
+            game.animations = queue
+        except Exception:
+            pass
+    return queue
+
+
+__all__ = ["Animation", "AnimationQueue", "animation_queue"]
@@ -0,0 +1,112 @@
+"""Back buffers for curses panels.
+
+A `PanelBuffer` remembers the (glyph, attr) cells it wrote to a panel on the
+previous frame and, given the next frame, only writes the cells that
+changed. Unchanged rows cost a single list comparison and no curses calls,
+and the panel is never `clear()`ed, so curses does not have to repaint the
+whole terminal (the expensive part over SSH).
+
+Changed cells are written in runs of equal attribute, so a full repaint
+costs one call per colour change rather than one per cell.
+
+The buffer assumes nothing else writes into its cell area between frames;
+code that draws directly into the panel must call `invalidate()` so the
+next frame repaints everything.
+"""
+import curses
+from typing import List, Optional, Sequence, Tuple
+
+Cell = Tuple[str, int]
+
+
+class PanelBuffer:
+    """Previous frame of a panel's cell grid; writes only what changed."""
+
+    def __init__(self):
+        self.window = None
+        self.size: Optional[Tuple[int, int]] = None
+        self.cells: List[Sequence[Cell]] = []
+        self.writes = 0          # addstr calls made by the last put_rows()
+
+    def invalidate(self) -> None:
+        """Forget the previous frame so the next one is drawn in full."""
+        self.window = None
+        self.cells = []
+
+    def begin(self, window) -> bool:
+        """Bind to `window` for a new frame.
+
+        Returns True when the panel has to be repainted from scratch (first
+        frame, another window, a resize or an `invalidate()`); the caller
+        should then erase the panel and redraw its static decorations.
+        """
+        try:
+            size = window.getmaxyx()
+        except Exception:
+            size = None
+        if window is self.window and size == self.size:
+            return False
+        self.window = window
+        self.size = size
+        self.cells = []
+        return True
+
+    def put_rows(self, rows: Sequence[Sequence[Cell]], y0: int = 1, x0: int = 1) -> int:
+        """Write the cells of `rows` that differ from the previous frame.
+
+        `rows[vy][vx]` lands at panel position (y0 + vy, x0 + vx). Changed
+        cells are emitted as runs: a run starts at a changed cell and takes
+        in following cells with the same attribute (unchanged ones included
+        when more changes follow), so a fully repainted row costs one
+        addstr per colour change. Returns the number of addstr calls made.
+        """
+        window = self.window
+        prev = self.cells
+        writes = 0
+        for vy, row in enumerate(rows):
+            old = prev[vy] if vy < len(prev) else None
+            if old == row:
+                continue
+            n_old = len(old) if old is not None else 0
+            n = len(row)
+            y = y0 + vy
+            vx = 0
+            while vx < n:
+                cell = row[vx]
+                if vx < n_old and old[vx] == cell:
+                    vx += 1
+                    continue
+                attr = cell[1]
+                end = vx + 1          # one past the last changed cell of the run
+                j = vx + 1
+                while j < n and row[j][1] == attr:
+                    if j >= n_old or old[j] != row[j]:
+                        end = j + 1
+                    j += 1
+                try:
+                    window.addstr(y, x0 + vx, "".join(c[0] for c in row[vx:end]), attr)
+                except curses.error:
+                    pass
+                writes += 1
+                vx = end
+        self.cells = list(rows)
+        self.writes = writes
+        return writes
+
+
+def panel_buffer(ui, name: str) -> PanelBuffer:
+    """Return the back buffer called `name` kept on `ui` (created on first use)."""
+    buffers = getattr(ui, "back_buffers", None)
+    if buffers is None:
+        buffers = {}
+        try:
+            ui.back_buffers = buffers
+        except Exception:
+            pass
+    buf = buffers.get(name)
+    if buf is None:
+        buf = buffers[name] = PanelBuffer()
+    return buf
+
+
+__all__ = ["PanelBuffer", "panel_buffer"]
@@ -1,6 +1,8 @@
-from time import strftime
+from collections import deque
+from itertools import islice
+from time import localtime, strftime, time
 import curses
-from typing import List, Dict, Any
+from typing import Any, Deque, Dict, List
 
 class DialogueSystem:
     def __init__(self):
@@ -15,14 +17,54 @@ class DialogueSystem:
         return random.choice(lines)
 
 class UIMessageBuffer:
-    def __init__(self, max_messages: int = 200):
-        self.messages: List[Dict[str, Any]] = []
+    """Ring buffer of UI messages.
+
+    Messages are dicts with the raw epoch `time`, `text`, `color` and a
+    repeat `count`; the "HH:MM:SS" prefix is only formatted when a message
+    is drawn (`line()`), and the formatted line is cached on the message.
+    With `coalesce` on, a message identical to the previous one bumps its
+    count ("Stormtrooper fires! x3") instead of adding a line; with it off
+    the repeat is dropped, as before. `version` changes on every add so
+    the renderer can tell when the panel needs redrawing.
+    """
+
+    def __init__(self, max_messages: int = 200, coalesce: bool = True):
+        self.messages: Deque[Dict[str, Any]] = deque(maxlen=max_messages)
         self.max_messages = max_messages
+        self.coalesce = coalesce
+        self.version = 0
 
     def add(self, text: str, color: int = 0):
-        # Deduplicate: don't add if the last message is identical (fixes Windows display issue)
+        # Repeats of the last message are coalesced or dropped (fixes Windows display issue)
         if self.messages and self.messages[-1].get("text") == text:
-            return
-        self.messages.append({"timestamp": strftime("%H:%M:%S"), "text": text, "color": color})
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
\ No newline at end of file
+            if not self.coalesce:
+                return
+            last = self.messages[-1]
+            last["count"] = last.get("count", 1) + 1
+            last["time"] = time()
+        else:
+            self.messages.append({"time": time(), "text": text, "color": color, "count": 1})
+        self.version += 1
+
+    def recent(self, n: int) -> List[Dict[str, Any]]:
+        """The last `n` messages, oldest first."""
+        if n <= 0:
+            return []
+        msgs = self.messages
+        return list(islice(msgs, max(0, len(msgs) - n), None))
+
+    @staticmethod
+    def line(message: Dict[str, Any]) -> str:
+        """Display line for `message`: timestamp, text and an " xN" repeat count."""
+        count = message.get("count", 1)
+        cached = message.get("line")
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        stamp = message.get("timestamp")
+        if stamp is None and message.get("time") is not None:
+            stamp = strftime("%H:%M:%S", localtime(message["time"]))
+        text = f"{stamp or ''} {message.get('text', '')}".strip()
+        if count > 1:
+            text = f"{text} x{count}"
+        message["line"] = (count, text)
+        return text
@@ -0,0 +1,92 @@
+"""Dirty-panel tracking and frame pacing for the main loop.
+
+The main loop used to redraw every panel on every iteration. A
+`FrameScheduler` keeps a dirty flag per panel instead: game code marks the
+panels whose state it changed (`mark('map', 'stats')`), and panels can also
+be watched through a cheap signature function whose value changing marks
+them dirty (e.g. the message count). `begin_frame()` hands the renderer the
+set of panels to redraw; clean panels are only re-staged so that overlays
+closed since the last frame get painted over.
+
+An optional `max_fps` cap spaces frames at least `1 / max_fps` seconds
+apart; `wait_ms()` tells the input loop how long it may block before the
+next pending frame is allowed.
+"""
+import time
+from typing import Callable, Dict, Optional, Set
+
+PANELS = ("map", "stats", "abilities", "commands", "messages")
+
+_UNSET = object()
+
+
+class FrameScheduler:
+    """Per-panel dirty flags plus an optional frame-rate cap."""
+
+    def __init__(self, max_fps: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_fps = max_fps
+        self.clock = clock
+        self.frames = 0
+        self._dirty: Set[str] = set(PANELS)
+        self._watches: Dict[str, Callable[[], object]] = {}
+        self._signatures: Dict[str, object] = {}
+        self._last_frame: Optional[float] = None
+
+    @property
+    def min_interval(self) -> float:
+        try:
+            return 1.0 / float(self.max_fps) if self.max_fps else 0.0
+        except (TypeError, ValueError, ZeroDivisionError):
+            return 0.0
+
+    def mark(self, *panels: str) -> None:
+        """Flag `panels` (all panels when none are given) for redraw."""
+        self._dirty.update(panels or PANELS)
+
+    def mark_all(self) -> None:
+        self._dirty.update(PANELS)
+
+    def watch(self, panel: str, signature: Callable[[], object]) -> None:
+        """Redraw `panel` whenever `signature()` returns a different value."""
+        self._watches[panel] = signature
+        self._signatures.pop(panel, None)
+
+    def _poll(self) -> None:
+        for panel, signature in self._watches.items():
+            try:
+                value = signature()
+            except Exception:
+                continue            # a failing watcher counts as unchanged
+            if self._signatures.get(panel, _UNSET) != value:
+                self._dirty.add(panel)
+            self._signatures[panel] = value
+
+    def dirty(self) -> Set[str]:
+        """Panels that need redrawing now (checks the watched signatures)."""
+        self._poll()
+        return set(self._dirty)
+
+    def wait_ms(self) -> Optional[int]:
+        """Milliseconds until the next frame may be drawn, or None when nothing is pending."""
+        if not self.dirty():
+            return None
+        if self._last_frame is None:
+            return 0
+        remaining = self._last_frame + self.min_interval - self.clock()
+        return max(0, int(remaining * 1000 + 0.999))
+
+    def frame_due(self) -> bool:
+        """True when some panel is dirty and the frame-rate cap allows drawing."""
+        return self.wait_ms() == 0
+
+    def begin_frame(self) -> Set[str]:
+        """Start a frame: return the dirty panels and reset their flags."""
+        self._poll()
+        panels = self._dirty
+        self._dirty = set()
+        self._last_frame = self.clock()
+        self.frames += 1
+        return panels
+
+
+__all__ = ["PANELS", "FrameScheduler"]
@@ -0,0 +1,99 @@
+"""Map popups (damage numbers, "BOOM!") with turn-based expiry.
+
+Popups used to live in a plain list that was rebuilt every frame to age
+them and scanned in full by the map renderer. A `PopupStore` files each
+popup under the turn it expires on (a timer wheel keyed by turn), so
+`tick()` only touches the popups that expire, and under the coarse map
+region of its anchor tile, so the renderer only visits popups inside the
+viewport.
+
+Popups stay plain dicts ({"x", "y", "text", "color", "ttl", ...}) and the
+store iterates like the old list, oldest first.
+"""
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+Popup = Dict[str, Any]
+
+
+class PopupStore:
+    """Live popups indexed by expiry turn and by map region."""
+
+    def __init__(self, region_size: int = 16):
+        self.region_size = max(1, int(region_size))
+        self.turn = 0
+        self._seq = 0
+        self._live: Dict[int, Popup] = {}                        # seq -> popup, insertion ordered
+        self._expiry: Dict[int, List[int]] = {}                  # turn -> seqs expiring then
+        self._regions: Dict[Tuple[int, int], Set[int]] = {}      # region -> seqs anchored there
+
+    def _region(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.region_size, y // self.region_size)
+
+    def add(self, x: int, y: int, text: str, color: int = 9, ttl: int = 6) -> Popup:
+        """Show `text` at map tile (x, y) for the next `ttl` turns."""
+        ttl = max(1, int(ttl))
+        seq = self._seq
+        self._seq += 1
+        popup = {"x": x, "y": y, "text": text, "color": color, "ttl": ttl,
+                 "expires": self.turn + ttl, "seq": seq}
+        self._live[seq] = popup
+        self._expiry.setdefault(self.turn + ttl, []).append(seq)
+        try:
+            self._regions.setdefault(self._region(int(x), int(y)), set()).add(seq)
+        except (TypeError, ValueError):
+            pass
+        return popup
+
+    def _remove(self, seq: int) -> None:
+        popup = self._live.pop(seq, None)
+        if popup is None:
+            return
+        try:
+            key = self._region(int(popup["x"]), int(popup["y"]))
+        except (TypeError, ValueError):
+            return
+        bucket = self._regions.get(key)
+        if bucket is not None:
+            bucket.discard(seq)
+            if not bucket:
+                del self._regions[key]
+
+    def tick(self) -> int:
+        """Advance one turn and drop the popups that expire; return how many went."""
+        self.turn += 1
+        expired = self._expiry.pop(self.turn, ())
+        for seq in expired:
+            self._remove(seq)
+        return len(expired)
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[Popup]:
+        """Popups anchored in columns x0..x1-1 and rows y0..y1-1, oldest first."""
+        if x1 <= x0 or y1 <= y0 or not self._live:
+            return []
+        rs = self.region_size
+        found = []
+        for ry in range(y0 // rs, (y1 - 1) // rs + 1):
+            for rx in range((x0) // rs, (x1 - 1) // rs + 1):
+                for seq in self._regions.get((rx, ry), ()):
+                    p = self._live[seq]
+                    if x0 <= p["x"] < x1 and y0 <= p["y"] < y1:
+                        found.append(p)
+        found.sort(key=lambda p: p["seq"])
+        return found
+
+    def clear(self) -> None:
+        self._live.clear()
+        self._expiry.clear()
+        self._regions.clear()
+
+    def __iter__(self) -> Iterator[Popup]:
+        return iter(list(self._live.values()))
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __bool__(self) -> bool:
+        return bool(self._live)
+
+
+__all__ = ["PopupStore"]
@@ -1,6 +1,7 @@
 import curses
 from typing import Tuple, Optional, List, Dict, Any
 from jedi_fugitive.ui.dialog import UIMessageBuffer
+from jedi_fugitive.ui.popups import PopupStore
 
 class SILQUI:
     def __init__(self, stdscr):
@@ -9,7 +10,7 @@ class SILQUI:
         self.messages = UIMessageBuffer()
         self.term_h, self.term_w = stdscr.getmaxyx()
         self.colors_inited = False
-        self.popups: List[Dict[str, Any]] = []
+        self.popups = PopupStore()
 
     def init_colors(self):
         if self.colors_inited:
@@ -234,22 +235,22 @@ class SILQUI:
     def message_panel_draw(self):
         panel = self.panels.get('messages')
         if not panel: return
-        panel.clear()
+        panel.erase()
         try:
             panel.border()
             panel.addstr(0,2," MESSAGES ", curses.color_pair(14) | curses.A_BOLD)
         except curses.error:
             pass
         h,w = panel.getmaxyx()
-        lines = self.messages.messages[-(h-2):]
+        lines = self.messages.recent(h-2)
         for i, m in enumerate(lines):
-            text = f"{m.get('timestamp','')} {m.get('text','')}".strip()
+            text = self.messages.line(m)
             try:
                 panel.addstr(1+i, 2, text[:w-4], curses.color_pair(3))
             except curses.error:
                 pass
         try:
-            panel.refresh()
+            panel.noutrefresh()
         except curses.error:
             pass
 
@@ -285,8 +286,8 @@ class SILQUI:
     # --- popup support for damage/taunts ---
     def add_popup(self, x: int, y: int, text: str, color_pair: int = 9, ttl: int = 6,
                   echo: bool = True, echo_text: Optional[str] = None):
-        # store popups in map coordinates; age=0 means freshly created
-        self.popups.append({"x": x, "y": y, "text": text, "color": color_pair, "ttl": ttl, "age": 0})
+        # store popups in map coordinates; they last `ttl` turns
+        self.popups.add(x, y, text, color_pair, ttl)
         # optionally echo to the messages buffer (lower part)
         if echo:
             if echo_text:
@@ -295,13 +296,8 @@ class SILQUI:
                 self.messages.add(text, color_pair)
 
     def tick_popups(self):
-        # increment age and purge expired
-        new = []
-        for p in self.popups:
-            p["age"] += 1
-            if p["age"] < p["ttl"]:
-                new.append(p)
-        self.popups = new
+        # one turn passed: drop the popups that expire now
+        self.popups.tick()
 
     def draw_popups(self, panel=None):
         """Draw simple popup lines into the provided panel (or messages panel). Defensive and no complex annotations."""
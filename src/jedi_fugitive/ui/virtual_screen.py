@@ -0,0 +1,430 @@
+"""In-memory curses-compatible screen for headless runs, tests and benchmarks.
+
+`VirtualScreen` stands in for `stdscr`: it keeps the character/attribute
+grid of every window, follows curses' staging model (`noutrefresh` copies a
+window into the virtual screen, `doupdate` copies that to the "physical"
+terminal) and counts what the game asks of it -- calls per method, bytes
+passed to `addstr`, and the cells that actually changed on the terminal at
+each `doupdate`, which is what a real terminal would have to be sent.
+
+Module-level curses functions the renderer calls (`newwin`, `doupdate`,
+`color_pair`, `init_pair`...) need an initialised terminal, so route them to
+the virtual screen with `patch_curses()` while drawing::
+
+    screen = VirtualScreen(40, 120)
+    with screen.patch_curses():
+        gm = GameManager(screen)
+        ...
+        ui_renderer.draw(gm)
+    print(screen.text())
+"""
+import curses
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+_ERROR = curses.error
+
+
+class ScreenStats:
+    """Counters accumulated by a VirtualScreen and its windows."""
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.bytes_written = 0      # utf-8 bytes passed to addstr/addnstr/addch
+        self.cells_flushed = 0      # terminal cells changed by doupdate()
+        self.updates = 0            # doupdate() calls (including those from refresh())
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.bytes_written = 0
+        self.cells_flushed = 0
+        self.updates = 0
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+class _Buffer:
+    """Character and attribute grid owned by a top-level window."""
+
+    __slots__ = ("chars", "attrs")
+
+    def __init__(self, h: int, w: int):
+        self.chars = [[" "] * w for _ in range(h)]
+        self.attrs = [[0] * w for _ in range(h)]
+
+
+class VirtualWindow:
+    """A curses window backed by an in-memory grid.
+
+    Windows made with `subwin`/`derwin` share their parent's grid, as in
+    curses, so writes through either are visible in both.
+    """
+
+    def __init__(self, screen: "VirtualScreen", h: int, w: int, y: int, x: int,
+                 buf: Optional[_Buffer] = None, offset: Tuple[int, int] = (0, 0)):
+        if h <= 0 or w <= 0:
+            raise _ERROR("window size must be positive")
+        self.screen = screen
+        self.h, self.w = h, w
+        self.y, self.x = y, x
+        self._owns_buf = buf is None
+        self._buf = buf if buf is not None else _Buffer(h, w)
+        self._oy, self._ox = offset
+        self._cy = self._cx = 0
+        self._bg = (" ", 0)
+        self._attr = 0
+        self._delay = -1
+
+    def _count(self, name: str) -> None:
+        self.screen.stats.calls[name] += 1
+
+    # --- geometry -------------------------------------------------------
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        self._count("getmaxyx")
+        return (self.h, self.w)
+
+    def getbegyx(self) -> Tuple[int, int]:
+        return (self.y, self.x)
+
+    def getyx(self) -> Tuple[int, int]:
+        return (self._cy, self._cx)
+
+    def move(self, y: int, x: int) -> None:
+        self._count("move")
+        if not (0 <= y < self.h and 0 <= x < self.w):
+            raise _ERROR("move() returned ERR")
+        self._cy, self._cx = y, x
+
+    def subwin(self, *args) -> "VirtualWindow":
+        """subwin([h, w,] y, x) with screen-relative coordinates, sharing this window's grid."""
+        self._count("subwin")
+        h, w, y, x = args if len(args) == 4 else (0, 0) + tuple(args)
+        h = h or (self.y + self.h - y)
+        w = w or (self.x + self.w - x)
+        if y < self.y or x < self.x or y + h > self.y + self.h or x + w > self.x + self.w:
+            raise _ERROR("subwin() returned NULL")
+        return VirtualWindow(self.screen, h, w, y, x, self._buf,
+                             (self._oy + y - self.y, self._ox + x - self.x))
+
+    def derwin(self, *args) -> "VirtualWindow":
+        """derwin([h, w,] y, x) with coordinates relative to this window."""
+        h, w, y, x = args if len(args) == 4 else (0, 0) + tuple(args)
+        return self.subwin(h, w, self.y + y, self.x + x)
+
+    def resize(self, h: int, w: int) -> None:
+        self._count("resize")
+        if h <= 0 or w <= 0:
+            raise _ERROR("resize() returned ERR")
+        if not self._owns_buf:
+            # a subwindow can only shrink within its parent's grid
+            self.h = min(h, len(self._buf.chars) - self._oy)
+            self.w = min(w, len(self._buf.chars[0]) - self._ox)
+            return
+        old = self._buf
+        self._buf = _Buffer(h, w)
+        for y in range(min(h, len(old.chars))):
+            n = min(w, len(old.chars[y]))
+            self._buf.chars[y][:n] = old.chars[y][:n]
+            self._buf.attrs[y][:n] = old.attrs[y][:n]
+        self.h, self.w = h, w
+
+    def mvwin(self, y: int, x: int) -> None:
+        self._count("mvwin")
+        self.y, self.x = y, x
+
+    # --- writing --------------------------------------------------------
+
+    def _put_text(self, y: int, x: int, text: str, attr: int) -> None:
+        if not (0 <= y < self.h and 0 <= x < self.w):
+            raise _ERROR("addwstr() returned ERR")
+        self.screen.stats.bytes_written += len(text.encode("utf-8", "replace"))
+        chars, attrs = self._buf.chars, self._buf.attrs
+        oy, ox, w = self._oy, self._ox, self.w
+        attr |= self._attr
+        for ch in text:
+            if ch == "\n":
+                self._clear_span(y, x, w)
+                x, y = 0, y + 1
+            else:
+                chars[oy + y][ox + x] = ch
+                attrs[oy + y][ox + x] = attr
+                x += 1
+                if x == w:
+                    x, y = 0, y + 1
+            if y == self.h:
+                # like curses: writing past the last cell fails after filling it
+                self._cy, self._cx = self.h - 1, w - 1
+                raise _ERROR("addwstr() returned ERR")
+        self._cy, self._cx = y, x
+
+    def addstr(self, *args) -> None:
+        """addstr([y, x,] text[, attr])"""
+        self._count("addstr")
+        if len(args) >= 3 and not isinstance(args[0], str):
+            y, x, text = args[0], args[1], args[2]
+            attr = args[3] if len(args) > 3 else 0
+        else:
+            y, x = self._cy, self._cx
+            text = args[0]
+            attr = args[1] if len(args) > 1 else 0
+        self._put_text(y, x, str(text), attr)
+
+    def addnstr(self, *args) -> None:
+        """addnstr([y, x,] text, n[, attr])"""
+        self._count("addnstr")
+        if len(args) >= 4 and not isinstance(args[0], str):
+            y, x, text, n = args[:4]
+            attr = args[4] if len(args) > 4 else 0
+        else:
+            y, x = self._cy, self._cx
+            text, n = args[:2]
+            attr = args[2] if len(args) > 2 else 0
+        self._put_text(y, x, str(text)[:max(0, n)], attr)
+
+    def addch(self, *args) -> None:
+        """addch([y, x,] ch[, attr])"""
+        self._count("addch")
+        if len(args) >= 3:
+            y, x, ch = args[:3]
+            attr = args[3] if len(args) > 3 else 0
+        else:
+            y, x = self._cy, self._cx
+            ch = args[0]
+            attr = args[1] if len(args) > 1 else 0
+        if isinstance(ch, int):
+            attr |= ch & ~0xFF
+            ch = chr(ch & 0xFF)
+        self._put_text(y, x, ch, attr)
+
+    def _clear_span(self, y: int, x0: int, x1: int) -> None:
+        ch, attr = self._bg
+        row_c = self._buf.chars[self._oy + y]
+        row_a = self._buf.attrs[self._oy + y]
+        for x in range(x0, x1):
+            row_c[self._ox + x] = ch
+            row_a[self._ox + x] = attr
+
+    def erase(self) -> None:
+        self._count("erase")
+        for y in range(self.h):
+            self._clear_span(y, 0, self.w)
+        self._cy = self._cx = 0
+
+    def clear(self) -> None:
+        # curses also repaints the whole terminal on the next refresh; the grid result is the same
+        self._count("clear")
+        for y in range(self.h):
+            self._clear_span(y, 0, self.w)
+        self._cy = self._cx = 0
+
+    def clrtoeol(self) -> None:
+        self._count("clrtoeol")
+        self._clear_span(self._cy, self._cx, self.w)
+
+    def clrtobot(self) -> None:
+        self._count("clrtobot")
+        self._clear_span(self._cy, self._cx, self.w)
+        for y in range(self._cy + 1, self.h):
+            self._clear_span(y, 0, self.w)
+
+    def border(self, *chars) -> None:
+        self._count("border")
+        ls, rs, ts, bs, tl, tr, bl, br = (tuple(chars) + (None,) * 8)[:8]
+        ls, rs = ls or "|", rs or "|"
+        ts, bs = ts or "-", bs or "-"
+        tl, tr, bl, br = tl or "+", tr or "+", bl or "+", br or "+"
+        c, oy, ox, h, w = self._buf.chars, self._oy, self._ox, self.h, self.w
+        for x in range(1, w - 1):
+            c[oy][ox + x] = ts
+            c[oy + h - 1][ox + x] = bs
+        for y in range(1, h - 1):
+            c[oy + y][ox] = ls
+            c[oy + y][ox + w - 1] = rs
+        c[oy][ox], c[oy][ox + w - 1] = tl, tr
+        c[oy + h - 1][ox], c[oy + h - 1][ox + w - 1] = bl, br
+
+    def box(self, vertch=None, horch=None) -> None:
+        self.border(vertch, vertch, horch, horch)
+
+    def bkgd(self, ch=" ", attr: int = 0) -> None:
+        self._count("bkgd")
+        self._bg = (ch if isinstance(ch, str) else chr(ch), attr)
+
+    def attron(self, attr: int) -> None:
+        self._attr |= attr
+
+    def attroff(self, attr: int) -> None:
+        self._attr &= ~attr
+
+    def attrset(self, attr: int) -> None:
+        self._attr = attr
+
+    # --- reading back ---------------------------------------------------
+
+    def inch(self, y: int, x: int) -> int:
+        ch = self._buf.chars[self._oy + y][self._ox + x]
+        return (ord(ch) & 0xFF) | self._buf.attrs[self._oy + y][self._ox + x]
+
+    def instr(self, y: int, x: int, n: Optional[int] = None) -> bytes:
+        row = self._buf.chars[self._oy + y][self._ox + x:self._ox + self.w]
+        return "".join(row[:n] if n is not None else row).encode("utf-8")
+
+    # --- output ---------------------------------------------------------
+
+    def noutrefresh(self) -> None:
+        self._count("noutrefresh")
+        self.screen._stage(self)
+
+    def refresh(self) -> None:
+        self._count("refresh")
+        self.screen._stage(self)
+        self.screen.doupdate()
+
+    def touchwin(self) -> None:
+        self._count("touchwin")
+
+    def redrawwin(self) -> None:
+        self._count("redrawwin")
+
+    # --- input ----------------------------------------------------------
+
+    def getch(self, *yx) -> int:
+        self._count("getch")
+        return self.screen._next_key()
+
+    def get_wch(self, *yx):
+        key = self.getch()
+        if key == -1:
+            raise _ERROR("no input")
+        return key
+
+    def timeout(self, delay: int) -> None:
+        self._delay = delay
+
+    def nodelay(self, flag: bool) -> None:
+        self._delay = 0 if flag else -1
+
+    def keypad(self, flag: bool) -> None:
+        pass
+
+    def leaveok(self, flag: bool) -> None:
+        pass
+
+    def scrollok(self, flag: bool) -> None:
+        pass
+
+
+class VirtualScreen(VirtualWindow):
+    """Root window (`stdscr`) of an in-memory terminal."""
+
+    def __init__(self, h: int = 24, w: int = 80, inputs: Iterable = ()):
+        self.stats = ScreenStats()
+        super().__init__(self, h, w, 0, 0)
+        self._staged = _Buffer(h, w)     # curses' "virtual screen"
+        self._phys = _Buffer(h, w)       # what the terminal shows
+        self.inputs = [ord(k) if isinstance(k, str) else k for k in inputs]
+
+    def newwin(self, *args) -> VirtualWindow:
+        """newwin([h, w,] y, x); a size of 0 extends to the screen edge."""
+        self.stats.calls["newwin"] += 1
+        h, w, y, x = args if len(args) == 4 else (0, 0) + tuple(args)
+        h = h or (self.h - y)
+        w = w or (self.w - x)
+        return VirtualWindow(self, h, w, y, x)
+
+    def resize(self, h: int, w: int) -> None:
+        super().resize(h, w)
+        self._staged = _Buffer(h, w)
+        self._phys = _Buffer(h, w)
+
+    def _stage(self, win: VirtualWindow) -> None:
+        src_c, src_a = win._buf.chars, win._buf.attrs
+        dst_c, dst_a = self._staged.chars, self._staged.attrs
+        for y in range(win.h):
+            sy, ty = win._oy + y, win.y + y
+            if not 0 <= ty < self.h:
+                continue
+            x0 = max(0, win.x)
+            x1 = min(self.w, win.x + win.w)
+            if x0 >= x1:
+                continue
+            s0 = win._ox + x0 - win.x
+            dst_c[ty][x0:x1] = src_c[sy][s0:s0 + x1 - x0]
+            dst_a[ty][x0:x1] = src_a[sy][s0:s0 + x1 - x0]
+
+    def doupdate(self) -> None:
+        """Copy the staged screen to the terminal, counting the cells that changed."""
+        self.stats.calls["doupdate"] += 1
+        self.stats.updates += 1
+        changed = 0
+        for y in range(self.h):
+            sc, sa = self._staged.chars[y], self._staged.attrs[y]
+            pc, pa = self._phys.chars[y], self._phys.attrs[y]
+            if sc == pc and sa == pa:
+                continue
+            for x in range(self.w):
+                if sc[x] != pc[x] or sa[x] != pa[x]:
+                    changed += 1
+            pc[:] = sc
+            pa[:] = sa
+        self.stats.cells_flushed += changed
+
+    def _next_key(self) -> int:
+        return self.inputs.pop(0) if self.inputs else -1
+
+    # --- inspection -----------------------------------------------------
+
+    def text(self) -> List[str]:
+        """Rows of the terminal as last flushed by doupdate()."""
+        return ["".join(row) for row in self._phys.chars]
+
+    def attr_at(self, y: int, x: int) -> int:
+        return self._phys.attrs[y][x]
+
+    def find(self, needle: str) -> Optional[Tuple[int, int]]:
+        """(y, x) of the first occurrence of `needle` on the terminal, or None."""
+        for y, row in enumerate(self.text()):
+            x = row.find(needle)
+            if x >= 0:
+                return (y, x)
+        return None
+
+    @contextmanager
+    def patch_curses(self):
+        """Route curses' module-level functions to this screen for the block."""
+        replacements = {
+            "newwin": self.newwin,
+            "doupdate": self.doupdate,
+            "color_pair": lambda n: (int(n) & 0xFF) << 8,
+            "pair_number": lambda attr: (int(attr) >> 8) & 0xFF,
+            "start_color": lambda: None,
+            "use_default_colors": lambda: None,
+            "init_pair": lambda *a: None,
+            "has_colors": lambda: True,
+            "curs_set": lambda v: 1,
+            "resizeterm": self.resize,
+            "napms": lambda ms: 0,
+            "beep": lambda: None,
+            "flash": lambda: None,
+        }
+        saved = {name: getattr(curses, name, None) for name in replacements}
+        for name, fn in replacements.items():
+            setattr(curses, name, fn)
+        try:
+            yield self
+        finally:
+            for name, fn in saved.items():
+                if fn is None:
+                    try:
+                        delattr(curses, name)
+                    except AttributeError:
+                        pass
+                else:
+                    setattr(curses, name, fn)
+
+
+__all__ = ["ScreenStats", "VirtualWindow", "VirtualScreen"]
@@ -0,0 +1,158 @@
+from jedi_fugitive.game.level import Display
+from jedi_fugitive.game.tile_grid import TileGrid
+
+
+def test_occupancy_index_follows_moves_spawns_and_deaths():
+    import pickle
+    from types import SimpleNamespace
+    from jedi_fugitive.game.enemy import Enemy
+    from jedi_fugitive.game.occupancy import ActorList, OccupancyIndex, bind_actors, occupants
+    a, b = Enemy("A", 5, 1, 0, 0, None, 1, 2, 2), Enemy("B", 5, 1, 0, 0, None, 1, 4, 4)
+    index = OccupancyIndex()
+    game = SimpleNamespace(enemies=bind_actors([a, b], index))
+    assert occupants(game, 2, 2) == [a] and len(index) == 2
+    a.x, a.y = 3, 3
+    assert occupants(game, 2, 2) == [] and occupants(game, 3, 3) == [a]
+    c = Enemy("C", 5, 1, 0, 0, None, 1, 4, 4)
+    game.enemies.append(c)
+    assert occupants(game, 4, 4) == [b, c]
+    game.enemies.remove(b)
+    assert occupants(game, 4, 4) == [c]
+    b.x = 9                     # no longer indexed: moving it leaves the index alone
+    assert occupants(game, 9, 4) == []
+    restored = pickle.loads(pickle.dumps(game.enemies))
+    assert type(restored) is list and not hasattr(restored[0], '_occupancy')
+    game.enemies = bind_actors([b], index)    # level switch
+    assert occupants(game, 3, 3) == [] and occupants(game, 9, 4) == [b]
+    assert occupants(SimpleNamespace(enemies=[a]), 3, 3) == [a]   # plain lists are scanned
+    assert isinstance(game.enemies, ActorList)
+
+
+def test_flow_field_routes_enemies_around_walls():
+    from types import SimpleNamespace
+    from jedi_fugitive.game.enemy import Enemy, ai_find_retreat_direction, ai_step_toward_player
+    from jedi_fugitive.game.flow_field import FlowField, flow_field
+    rows = ["..........",
+            "....#.....",
+            "....#.....",
+            "....#.....",
+            ".........."]
+    grid = TileGrid.from_rows([list(r) for r in rows])
+    field = FlowField(grid, (6, 2), radius=10)
+    assert field.distance(6, 2) == 0 and field.distance(4, 2) is None
+    assert field.distance(3, 2) == 4          # around the end of the wall, not through it
+    assert field.step_toward(3, 2) in ((0, 1), (0, -1))
+    assert field.step_away(7, 2)[0] == 1
+    assert FlowField(grid, (6, 2), radius=2).step_toward(0, 0) is None
+    e = Enemy("E", 5, 1, 0, 0, None, 1, 3, 2)
+    game = SimpleNamespace(game_map=grid, player=SimpleNamespace(x=6, y=2), enemies=[e])
+    assert flow_field(game) is flow_field(game)
+    assert ai_step_toward_player(e, game) in ((0, 1), (0, -1))   # greedy (1, 0) walks into the wall
+    game.player.x = 7
+    assert flow_field(game).origin == (7, 2)
+    e.x, e.y = 8, 2
+    assert ai_find_retreat_direction(e, game)[0] == 1
+
+
+def test_ai_lod_tiers_by_distance_and_fast_forwards_sleepers():
+    from types import SimpleNamespace
+    from jedi_fugitive.game.ai_lod import AILevelOfDetail, fast_forward_patrol
+    from jedi_fugitive.game.enemy import Enemy
+    from jedi_fugitive.game.occupancy import OccupancyIndex, bind_actors
+    near, mid, far = (Enemy(n, 5, 1, 0, 0, None, 1, x, 0) for n, x in (("near", 3), ("mid", 20), ("far", 90)))
+    far.patrol_points = [(90, 0), (94, 0), (94, 4)]
+    game = SimpleNamespace(player=SimpleNamespace(x=0, y=0), enemies=bind_actors([near, mid, far], OccupancyIndex()))
+    lod = AILevelOfDetail(full_range=10, patrol_range=40)
+    assert lod.tiers(game) == ([near], [mid])
+    game.player.x = 60                        # far wakes up, near and mid fall asleep
+    for _ in range(6):
+        full, patrol = lod.tiers(game)
+    assert full == [] and set(patrol) == {mid, far} and (far.x, far.y) == (90, 0)
+    game.player.x = 0
+    for _ in range(10):
+        lod.tiers(game)
+    game.player.x = 60                        # far slept 10 turns: two 4-tile legs, then heads back
+    lod.tiers(game)
+    assert (far.x, far.y, far._patrol_index) == (94, 4, 0)
+    assert not fast_forward_patrol(far, 50, lambda x, y: False)
+
+
+def test_turn_scheduler_orders_actors_by_speed_and_skips_sleepers():
+    from types import SimpleNamespace
+    from jedi_fugitive.game.turn_scheduler import TICKS_PER_TURN, TurnScheduler
+    trooper, assassin, sloth = (SimpleNamespace(name=n, speed=s) for n, s in (("t", 1.0), ("a", 1.5), ("s", 0.5)))
+    sched = TurnScheduler()
+    for actor in (trooper, assassin, sloth):
+        sched.ensure(actor)
+    turns = [[a.name for a in sched.advance()] for _ in range(4)]
+    assert turns == [["t", "a", "s", "a"], ["t", "a"], ["s", "t", "a", "a"], ["t", "a"]]
+    sched.delay(trooper, 2)                  # stunned: nothing to visit for two turns
+    sched.park(sloth)
+    turns = [[a.name for a in sched.advance()] for _ in range(3)]
+    assert turns == [["a", "a"], ["a"], ["t", "a", "a"]]
+    sched.ensure(sloth)                      # parked actors stay out until woken
+    assert "s" not in [a.name for a in sched.advance()]
+    sched.ensure(sloth, wake=True)
+    assert "s" in [a.name for a in sched.advance()]
+    # the fallback loop's speeds follow enemy_update_fraction as it changes
+    from jedi_fugitive.game.game_manager import GameManager
+    game = SimpleNamespace(enemy_update_fraction=0.5)
+    fallback = TurnScheduler(lambda a: GameManager._fallback_enemy_speed(game, a))
+    assert fallback.interval(trooper) == 2 * TICKS_PER_TURN
+    game.enemy_update_fraction = 0.25
+    assert fallback.interval(trooper) == 4 * TICKS_PER_TURN
+
+
+def test_stunned_enemy_skips_its_turns():
+    from types import SimpleNamespace
+    from jedi_fugitive.game.enemy import Enemy, process_enemies
+    grid = TileGrid(12, 12, Display.FLOOR)
+    e = Enemy("E", 5, 1, 0, 0, None, 1, 8, 8)
+    game = SimpleNamespace(game_map=grid, player=SimpleNamespace(x=1, y=1, evasion=0, defense=0, hp=50, add_stress=lambda *a, **k: 0),
+                           enemies=[e], ui=SimpleNamespace(messages=None), _has_spotted=True)
+    e.add_debuff('stun', 2)
+    process_enemies(game)
+    process_enemies(game)
+    assert (e.x, e.y) == (8, 8)
+    process_enemies(game)
+    assert (e.x, e.y) != (8, 8)
+
+
+def test_frightened_enemy_flees_until_fear_wears_off():
+    from types import SimpleNamespace
+    from jedi_fugitive.game.enemy import Enemy, process_enemies
+    grid = TileGrid(16, 16, Display.FLOOR)
+    e = Enemy("E", 5, 1, 0, 0, None, 1, 6, 6)
+    game = SimpleNamespace(game_map=grid, player=SimpleNamespace(x=4, y=4, evasion=0, defense=0, hp=50, add_stress=lambda *a, **k: 0),
+                           enemies=[e], ui=SimpleNamespace(messages=None), _has_spotted=True)
+    e.add_debuff('fear', 3)
+    dists = []
+    for _ in range(3):
+        process_enemies(game)
+        dists.append(abs(e.x - 4) + abs(e.y - 4))
+    assert 4 < dists[0] < dists[1] < dists[2] and game.player.hp == 50
+    assert 'fear' not in e.debuffs
+    process_enemies(game)
+    assert abs(e.x - 4) + abs(e.y - 4) < dists[-1]       # back on the attack
+
+
+def test_ai_blackboard_matches_full_scans():
+    import random
+    from types import SimpleNamespace
+    from jedi_fugitive.game.ai_blackboard import AIBlackboard
+    from jedi_fugitive.game.enemy import Enemy, ai_count_nearby_allies, ai_count_nearby_enemies
+    rng = random.Random(5)
+    enemies = [Enemy("E", 5, 1, 0, 0, None, 1, rng.randrange(40), rng.randrange(40)) for _ in range(60)]
+    game = SimpleNamespace(player=SimpleNamespace(x=20, y=20), enemies=enemies)
+    board = AIBlackboard(game.player, enemies)
+    for r in (0, 3, 8, 30):
+        assert board.count_near_player(r) == ai_count_nearby_enemies(game, r)
+    for e in enemies[:20]:
+        for r in (3, 5):
+            assert board.allies_near(e, r) == ai_count_nearby_allies(e, game, r)
+    assert sum(len(board.in_ring(d)) for d in range(80)) == 60
+    game.ai_blackboard = board
+    e = enemies[0]
+    expected = board.allies_near(e, 5)
+    e.x += 1                                  # the blackboard answers from turn-start positions
+    assert ai_count_nearby_allies(e, game, 5) == expected
@@ -0,0 +1,91 @@
+from jedi_fugitive.game.fov import compute_fov
+from jedi_fugitive.game.game_manager import GameManager
+from jedi_fugitive.game.tile_grid import TileGrid
+from jedi_fugitive.ui.virtual_screen import VirtualScreen
+
+
+def test_shadowcast_blocking_tile_visible_but_hides_tiles_behind():
+    grid = TileGrid(11, 11, '.')
+    grid[5][7] = '#'
+    vis = compute_fov(grid, 5, 5, 5)
+    assert (5, 5) in vis
+    assert (6, 5) in vis
+    assert (7, 5) in vis        # the wall itself is visible
+    assert (8, 5) not in vis    # but nothing directly behind it
+    assert (5, 0) in vis and (5, 1) in vis
+    assert (9, 9) not in vis    # outside the circular radius
+    # symmetric: anything the origin sees can see the origin back
+    for (x, y) in vis:
+        if grid[y][x] == '.':
+            assert (5, 5) in compute_fov(grid, x, y, 5)
+
+
+def test_compute_visibility_cache_invalidated_by_tile_writes():
+    gm = GameManager(VirtualScreen(40, 160))
+    gm.game_map = TileGrid(20, 20, '.')
+    gm.game_map[10][12] = '#'
+    gm.player.x, gm.player.y = 10, 10
+    first = gm.compute_visibility()
+    assert (13, 10) not in first
+    # unchanged position and map: the cached set is reused
+    assert gm.compute_visibility() is first
+    # clearing the wall bumps the map revision and forces a recompute
+    gm.game_map[10][12] = '.'
+    assert (13, 10) in gm.compute_visibility()
+
+
+def test_explored_bitmap_tracks_visibility_per_map():
+    gm = GameManager(VirtualScreen(40, 160))
+    gm.game_map = TileGrid(20, 20, '.')
+    gm.player.x, gm.player.y = 2, 2
+    gm.compute_visibility()
+    assert (2, 2) in gm.explored and (3, 2) in gm.explored
+    assert gm.explored.row_slice(2, 0, 4) == b'\x01\x01\x01\x01'
+    assert (19, 19) not in gm.explored
+    # a different map gets its own (empty) exploration bitmap
+    gm.game_map = TileGrid(30, 10, '.')
+    gm.player.x, gm.player.y = 25, 5
+    gm.compute_visibility()
+    assert (2, 2) not in gm.explored and (25, 5) in gm.explored
+
+
+def test_invalidate_visibility_refills_a_swapped_explored_bitmap():
+    from jedi_fugitive.game.tile_grid import TileMask
+    gm = GameManager(VirtualScreen(40, 160))
+    gm.game_map = TileGrid(20, 20, '.')
+    gm.player.x, gm.player.y = 5, 5
+    gm.compute_visibility()
+    # another level's bitmap comes back for the same map and viewpoint
+    gm.explored = TileMask.for_map(gm.game_map)
+    gm.invalidate_visibility()
+    gm.compute_visibility()
+    assert (5, 5) in gm.explored and (6, 5) in gm.explored
+
+
+def test_chunked_grid_fov_matches_tile_grid():
+    import random
+    from jedi_fugitive.game.world_chunks import ChunkedTileGrid
+    rng = random.Random(4)
+    chunked = ChunkedTileGrid(90, 70, '#', chunk_size=16)
+    flat = TileGrid(90, 70, '#')
+    for _ in range(4000):
+        x, y, g = rng.randrange(90), rng.randrange(70), rng.choice('.....T')
+        chunked[y][x] = flat[y][x] = g
+    for _ in range(20):
+        x, y = rng.randrange(90), rng.randrange(70)
+        assert compute_fov(chunked, x, y, 10) == compute_fov(flat, x, y, 10)
+
+
+def test_tile_mask_packs_bits_and_matches_a_set():
+    import random
+    from jedi_fugitive.game.tile_grid import TileMask
+    rng = random.Random(6)
+    mask, marked = TileMask(53, 9), set()
+    assert not mask
+    for _ in range(150):
+        p = (rng.randrange(-2, 55), rng.randrange(9))
+        mask.add(p)
+        if 0 <= p[0] < 53:
+            marked.add(p)
+    assert set(mask) == marked and len(mask) == len(marked) and mask
+    assert mask.row_slice(4, -3, 57) == bytes(int((x, 4) in marked) for x in range(-3, 57))
@@ -0,0 +1,276 @@
+import curses
+
+from jedi_fugitive.ui.back_buffer import PanelBuffer
+
+
+class RecordingWindow:
+    """Minimal curses window stand-in that records addstr calls."""
+
+    def __init__(self, h=12, w=30):
+        self.h, self.w = h, w
+        self.calls = []
+
+    def getmaxyx(self): return (self.h, self.w)
+    def addstr(self, y, x, text, attr=0): self.calls.append((y, x, text, attr))
+    def __getattr__(self, name): return lambda *a, **k: None
+
+
+def test_panel_buffer_writes_only_changed_cells():
+    win = RecordingWindow()
+    buf = PanelBuffer()
+    rows = [[('.', 0)] * 5 for _ in range(3)]
+    assert buf.begin(win) is True
+    assert buf.put_rows(rows) == 3          # one run per row
+    assert win.calls[0] == (1, 1, '.....', 0)
+    assert buf.begin(win) is False
+    nxt = [list(r) for r in rows]
+    nxt[1][2] = ('@', 7)
+    win.calls.clear()
+    assert buf.put_rows(nxt) == 1
+    assert win.calls == [(2, 3, '@', 7)]
+    buf.invalidate()
+    assert buf.begin(win) is True
+    win.calls.clear()
+    assert buf.put_rows(nxt) == 5           # '.' run, '.' run, then '@' splits row 2
+    assert win.calls[1:4] == [(2, 1, '..', 0), (2, 3, '@', 7), (2, 4, '..', 0)]
+    # changes separated by unchanged same-attribute cells share one run
+    again = [list(r) for r in nxt]
+    again[0][0] = again[0][3] = ('#', 0)
+    win.calls.clear()
+    assert buf.put_rows(again) == 1 and win.calls == [(1, 1, '#..#', 0)]
+
+
+def test_map_panel_repaints_only_what_moved(monkeypatch):
+    from types import SimpleNamespace
+    from jedi_fugitive.game import ui_renderer
+    from jedi_fugitive.game.tile_grid import TileGrid
+    monkeypatch.setattr(curses, "color_pair", lambda n: n << 8)
+    panel = RecordingWindow(12, 30)
+    game = SimpleNamespace(
+        ui=SimpleNamespace(panels={'map': panel}, popups=[], tick_popups=lambda: None),
+        stdscr=panel, game_map=TileGrid(40, 40, '.'), player=SimpleNamespace(x=20, y=20),
+        visible={(x, y) for x in range(40) for y in range(40)}, explored=set(), fog_of_war=False, enemies=[], projectiles=[])
+    ui_renderer.draw_map_panel(game)
+    first = len(panel.calls)
+    assert 0 < first <= 3 * 10    # a few runs per row, not one call per cell
+    panel.calls.clear()
+    ui_renderer.draw_map_panel(game)
+    assert panel.calls == []
+    game.game_map[19][20] = '#'
+    ui_renderer.draw_map_panel(game)
+    assert len(panel.calls) == 1 and panel.calls[0][2] == '#'
+
+
+def test_viewport_actors_layers_player_enemies_and_projectiles(monkeypatch):
+    from types import SimpleNamespace
+    from jedi_fugitive.game.ui_renderer import _viewport_actors
+    monkeypatch.setattr(curses, "color_pair", lambda n: n << 8)
+    player = SimpleNamespace(x=5, y=5, dark_corruption=0)
+    alive = SimpleNamespace(x=6, y=5, symbol='T', is_alive=lambda: True)
+    dead = SimpleNamespace(x=7, y=5, symbol='A', is_alive=lambda: False)
+    hidden = SimpleNamespace(x=8, y=5, symbol='W', is_alive=lambda: True)
+    bolt = SimpleNamespace(x=6, y=5, symbol='-', owner=player)
+    game = SimpleNamespace(player=player, enemies=[alive, dead, hidden], projectiles=[bolt])
+    actors = _viewport_actors(game, 5, 5, 2, 2, 10, 10, {(6, 5), (7, 5)})
+    assert actors[(3, 3)][0] == '@'
+    assert actors[(4, 3)][0] == '-'          # projectile drawn over the enemy
+    assert (5, 3) not in actors and (6, 3) not in actors
+
+
+def test_frame_scheduler_tracks_dirty_panels_and_fps_cap():
+    from jedi_fugitive.ui.frame_scheduler import FrameScheduler, PANELS
+    now = [0.0]
+    log = []
+    sched = FrameScheduler(max_fps=10, clock=lambda: now[0])
+    sched.watch('messages', lambda: len(log))
+    assert sched.frame_due() and sched.begin_frame() == set(PANELS)
+    assert sched.wait_ms() is None            # nothing changed: block on input
+    sched.mark('map')
+    assert sched.wait_ms() == 100 and not sched.frame_due()
+    now[0] = 0.1
+    assert sched.begin_frame() == {'map'}
+    log.append('hit')
+    now[0] = 0.25
+    assert sched.begin_frame() == {'messages'}
+    assert sched.dirty() == set()
+    # a watcher that raises counts as unchanged instead of keeping its panel dirty
+    sched.watch('stats', lambda: 1 // 0)
+    assert sched.wait_ms() is None and sched.begin_frame() == set()
+
+
+def test_draw_redraws_only_requested_panels(monkeypatch):
+    from types import SimpleNamespace
+    from jedi_fugitive.game import ui_renderer
+    drawn = []
+    for name in ('draw_map_panel', 'draw_stats_panel', 'draw_abilities_panel', 'draw_commands_panel'):
+        monkeypatch.setattr(ui_renderer, name, lambda game, n=name: drawn.append(n))
+    monkeypatch.setattr(curses, "doupdate", lambda: None)
+    staged = []
+
+    class Panel(RecordingWindow):
+        def noutrefresh(self): staged.append(self)
+
+    panels = {n: Panel() for n in ('map', 'stats', 'abilities', 'commands', 'messages')}
+    game = SimpleNamespace(ui=SimpleNamespace(panels=panels, message_panel_draw=lambda: drawn.append('messages')))
+    ui_renderer.draw(game, {'map', 'stats'})
+    assert drawn == ['draw_map_panel', 'draw_stats_panel']
+    assert staged == [panels['abilities'], panels['commands'], panels['messages']]
+
+
+def test_animation_queue_runs_bolts_concurrently_without_blocking():
+    from jedi_fugitive.ui.animation_queue import AnimationQueue
+    now = [0.0]
+    q = AnimationQueue(clock=lambda: now[0])
+    assert q.wait_ms() is None and not q.advance()
+    q.add([(1, 0), (2, 0), (3, 0)], '*', 5, delay=0.05)
+    now[0] = 0.02
+    q.add([(0, 1), (0, 2)], '*', 5, delay=0.05)
+    assert q.advance() and q.cells() == [(1, 0, '*', 5), (0, 1, '*', 5)]
+    assert q.wait_ms() == 30
+    assert not q.advance()
+    now[0] = 0.11
+    assert q.advance() and q.cells() == [(3, 0, '*', 5), (0, 2, '*', 5)]
+    now[0] = 0.2
+    assert q.advance() and len(q) == 0 and q.wait_ms() is None
+
+
+def test_animate_projectile_queues_instead_of_sleeping(monkeypatch):
+    from types import SimpleNamespace
+    from jedi_fugitive.game import ui_renderer
+    from jedi_fugitive.game.tile_grid import TileGrid
+    monkeypatch.setattr(curses, "color_pair", lambda n: n << 8)
+    monkeypatch.setattr(curses, "A_BOLD", 1, raising=False)
+    panel = RecordingWindow(12, 30)
+    game = SimpleNamespace(
+        ui=SimpleNamespace(panels={'map': panel}, popups=[], tick_popups=lambda: None),
+        stdscr=panel, game_map=TileGrid(40, 40, '.'), player=SimpleNamespace(x=20, y=20),
+        visible={(x, y) for x in range(40) for y in range(40)}, explored=set(), fog_of_war=False, enemies=[], projectiles=[])
+    ui_renderer.animate_projectile(game, 16, 20, 19, 20, delay=10)
+    assert panel.calls == [] and len(game.animations) == 1
+    ui_renderer.draw_map_panel(game)
+    assert any(text == '*' or '*' in text for (_y, _x, text, _a) in panel.calls)
+
+
+def test_stats_content_is_cached_until_player_state_changes():
+    from types import SimpleNamespace
+    from jedi_fugitive.game import ui_renderer
+    from jedi_fugitive.game.player import Player
+    player = Player(0, 0)
+    calls = []
+    real = player.get_stats_display
+    player.get_stats_display = lambda: calls.append(1) or real()
+    game = SimpleNamespace(ui=SimpleNamespace(), player=player)
+    first = ui_renderer._stats_content(game)
+    assert ui_renderer._stats_content(game) is first and len(calls) == 1
+    player.x += 1                      # position is not shown in the stats lines
+    assert ui_renderer._stats_content(game) is first
+    player.inventory.append({'name': 'Medkit'})
+    lines, has_lvl, names = ui_renderer._stats_content(game)
+    assert names == ['Medkit'] and has_lvl and len(calls) == 2
+    player.hp -= 1
+    ui_renderer._stats_content(game)
+    assert len(calls) == 3
+
+
+def test_message_buffer_coalesces_repeats_and_formats_lazily():
+    from jedi_fugitive.ui.dialog import UIMessageBuffer
+    buf = UIMessageBuffer(max_messages=3)
+    for _ in range(3):
+        buf.add("Stormtrooper fires a blaster bolt!")
+    buf.add("You dodge.")
+    assert len(buf.messages) == 2 and buf.version == 4
+    first = buf.messages[0]
+    assert 'timestamp' not in first and buf.line(first).endswith("Stormtrooper fires a blaster bolt! x3")
+    assert buf.line(first) is buf.line(first)           # cached until the count changes
+    for text in ("a", "b", "c"):
+        buf.add(text)
+    assert [m['text'] for m in buf.recent(5)] == ["a", "b", "c"]
+    assert [m['text'] for m in buf.recent(1)] == ["c"]
+    quiet = UIMessageBuffer(coalesce=False)
+    quiet.add("x"); quiet.add("x")
+    assert len(quiet.messages) == 1 and quiet.line(quiet.messages[0]).endswith(" x")
+
+
+def test_virtual_screen_tracks_grid_staging_and_counts():
+    import pytest
+    from jedi_fugitive.ui.virtual_screen import VirtualScreen
+    scr = VirtualScreen(6, 20)
+    sub = scr.subwin(3, 10, 2, 5)
+    sub.addstr(1, 1, "hi", 7 << 8)
+    assert scr.inch(3, 6) == ord('h') | (7 << 8)      # subwindows share the parent grid
+    with pytest.raises(curses.error):
+        sub.addstr(2, 8, "abc")                        # runs past the last cell
+    assert scr.text()[3] == " " * 20                  # nothing on the terminal before an update
+    sub.noutrefresh()
+    scr.doupdate()
+    assert scr.find("hi") == (3, 6) and scr.stats.cells_flushed == 4
+    win = scr.newwin(2, 4, 0, 0)
+    win.border()
+    win.refresh()
+    assert scr.text()[:2] == ["+--+" + " " * 16, "+--+" + " " * 16]
+    assert scr.stats.calls["addstr"] == 2 and scr.stats.bytes_written == 5 and scr.stats.updates == 2
+
+
+def test_game_frame_renders_on_virtual_screen():
+    import contextlib, io
+    from jedi_fugitive.game.game_manager import GameManager
+    from jedi_fugitive.ui.virtual_screen import VirtualScreen
+    scr = VirtualScreen(40, 120)
+    real_newwin = curses.newwin
+    with scr.patch_curses(), contextlib.redirect_stdout(io.StringIO()):
+        gm = GameManager(scr)
+        gm.world_seed = 3
+        gm.initialize()
+        gm.crash_inflate = 2
+        gm.generate_world()
+        gm.draw()
+        assert scr.find("MAP") and scr.find("STATS") and scr.find("MESSAGES")
+        gm.draw()                                      # settles overlapping panels
+        scr.stats.reset()
+        gm.draw()                                      # nothing changed: no panel is redrawn
+        assert scr.stats.calls["addstr"] == 0 and scr.stats.cells_flushed == 0
+    assert curses.newwin is real_newwin
+
+
+def test_minimap_summary_follows_exploration_and_renders():
+    import contextlib, io
+    from jedi_fugitive.game.game_manager import GameManager
+    from jedi_fugitive.game import input_handler
+    from jedi_fugitive.game.minimap import MinimapSummary, OPEN, UNKNOWN
+    from jedi_fugitive.ui.virtual_screen import VirtualScreen
+    scr = VirtualScreen(40, 120)
+    with scr.patch_curses(), contextlib.redirect_stdout(io.StringIO()):
+        gm = GameManager(scr)
+        gm.world_seed = 3
+        gm.initialize()
+        gm.crash_inflate = 2
+        gm.generate_world()
+        for dx in (1, 1, 1, 0, -1, -1):
+            gm._try_move_player(dx, 1 - abs(dx))
+            gm.compute_visibility()
+        summary = gm.minimap
+        rebuilt = MinimapSummary.for_map(gm.game_map, gm.explored)
+        assert summary.kinds() == rebuilt.kinds()
+        cx, cy = summary.cell_of(gm.player.x, gm.player.y)
+        assert summary.kind(cx, cy) == OPEN and summary.kind(0, 0) == UNKNOWN
+        input_handler.handle_input(gm, ord('M'))
+        gm.draw()
+        assert scr.find("MINIMAP") and gm.ui.minimap_win is not None
+        input_handler.handle_input(gm, ord('M'))
+        gm.draw()
+        assert scr.find("MINIMAP") is None and gm.ui.minimap_win is None
+
+
+def test_popup_store_expires_by_turn_and_queries_viewport():
+    from jedi_fugitive.ui.popups import PopupStore
+    store = PopupStore(region_size=8)
+    store.add(5, 5, "3", ttl=1)
+    boom = store.add(40, 40, "BOOM!", ttl=3)
+    store.add(41, 40, "7", ttl=3)
+    assert [p["text"] for p in store.in_rect(0, 0, 20, 20)] == ["3"]
+    assert [p["text"] for p in store.in_rect(30, 30, 50, 50)] == ["BOOM!", "7"]
+    assert store.in_rect(42, 30, 50, 50) == []
+    assert store.tick() == 1 and len(store) == 2
+    assert store.tick() == 0
+    assert store.tick() == 2 and not store and store.in_rect(0, 0, 100, 100) == []
+    assert boom["expires"] == 3